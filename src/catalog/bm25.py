@@ -0,0 +1,637 @@
+"""
+BM25 keyword index over the documents stored in the ChromaDB collection.
+"""
+
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+FORMAT_VERSION = 2
+META_FILE = "meta.json"
+ARRAYS = (
+    "vocab",
+    "doc_ids",
+    "indptr",
+    "postings",
+    "tf",
+    "doc_len",
+    "idf",
+    "payload",
+    "payload_offsets",
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase whitespace-separated tokens."""
+    return text.lower().split()
+
+
+def _ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Concatenate ``arange(start, start + length)`` for each pair, vectorized."""
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(lengths.sum())
+
+
+def _encode_metadata(metadata: dict | None) -> bytes:
+    return json.dumps(metadata).encode("utf-8") if metadata is not None else b""
+
+
+def _idf(df: np.ndarray, corpus_size: int, epsilon: float) -> np.ndarray:
+    """BM25Okapi idf, with negative values floored to epsilon * mean idf."""
+    idf = np.log(corpus_size - df + 0.5) - np.log(df + 0.5)
+    if len(idf):
+        idf[idf < 0] = epsilon * idf.mean()
+    return idf
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index held in flat NumPy arrays.
+
+    Terms are stored sorted in ``vocab``; the postings of term ``t`` are
+    ``postings[indptr[t]:indptr[t + 1]]`` (document positions) with their
+    term frequencies in ``tf``. Scores match ``rank_bm25.BM25Okapi`` with the
+    same ``k1``, ``b`` and ``epsilon``, including its floor for negative idf.
+
+    The index is saved as ``.npy`` files plus a small ``meta.json`` and
+    loaded memory-mapped, so opening it does not read the whole index.
+    Each document's metadata can be stored with it as JSON in ``payload``
+    (sliced by ``payload_offsets``), so search hits can be turned into
+    documents without another trip to the vector store.
+
+    Documents can be added, updated and deleted in place: replaced and
+    deleted positions are masked out, new text goes into an in-memory delta
+    of postings, and the corpus statistics (document count, average length
+    and idf) are recomputed lazily before the next query. ``compact`` merges
+    the delta back into the arrays, and ``save`` compacts first.
+    """
+
+    def __init__(
+        self,
+        vocab: np.ndarray,
+        doc_ids: np.ndarray,
+        indptr: np.ndarray,
+        postings: np.ndarray,
+        tf: np.ndarray,
+        doc_len: np.ndarray,
+        idf: np.ndarray,
+        avgdl: float,
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+        meta: dict | None = None,
+        payload: np.ndarray | None = None,
+        payload_offsets: np.ndarray | None = None,
+    ):
+        self.vocab = vocab
+        self.doc_ids = doc_ids
+        self.indptr = indptr
+        self.postings = postings
+        self.tf = tf
+        self.doc_len = doc_len
+        self.idf = idf
+        self.avgdl = avgdl
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        self.meta = meta or {}
+        if payload is None:
+            payload = np.zeros(0, dtype=np.uint8)
+            payload_offsets = np.zeros(len(doc_ids) + 1, dtype=np.int64)
+        self.payload = payload
+        self.payload_offsets = payload_offsets
+
+        self._deleted = np.zeros(len(doc_ids), dtype=bool)
+        self._delta: dict[str, tuple[list[int], list[int]]] = {}
+        self._delta_idf: dict[str, float] = {}
+        self._delta_payload: list[bytes] = []
+        self._positions: dict[str, int] | None = None
+        self._stale = False
+
+    @classmethod
+    def build(
+        cls,
+        doc_ids: list[str],
+        texts: list[str],
+        metadatas: list[dict] | None = None,
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+    ) -> "BM25Index":
+        """
+        Build the index from document ids and their texts.
+
+        :param doc_ids: Document ids, in the order their positions are assigned.
+        :param texts: Document texts, tokenized with ``tokenize``.
+        :param metadatas: Optional metadata stored with each document.
+        :return: The built index.
+        """
+
+        term_postings: dict[str, list[tuple[int, int]]] = {}
+        doc_len = np.zeros(len(texts), dtype=np.int32)
+        for position, text in enumerate(texts):
+            tokens = tokenize(text or "")
+            doc_len[position] = len(tokens)
+            for term, freq in Counter(tokens).items():
+                term_postings.setdefault(term, []).append((position, freq))
+
+        terms = sorted(term_postings)
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(term_postings[t]) for t in terms])
+        postings = np.empty(indptr[-1], dtype=np.int32)
+        tf = np.empty(indptr[-1], dtype=np.int32)
+        for col, term in enumerate(terms):
+            entries = np.asarray(term_postings[term], dtype=np.int32)
+            postings[indptr[col] : indptr[col + 1]] = entries[:, 0]
+            tf[indptr[col] : indptr[col + 1]] = entries[:, 1]
+
+        corpus_size = len(texts)
+        idf = _idf(np.diff(indptr).astype(np.float64), corpus_size, epsilon)
+
+        encoded = [_encode_metadata(m) for m in metadatas or [None] * corpus_size]
+        payload_offsets = np.zeros(corpus_size + 1, dtype=np.int64)
+        payload_offsets[1:] = np.cumsum([len(raw) for raw in encoded])
+        payload = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        return cls(
+            vocab=np.asarray(terms, dtype=str),
+            doc_ids=np.asarray(doc_ids, dtype=str),
+            indptr=indptr,
+            postings=postings,
+            tf=tf,
+            doc_len=doc_len,
+            idf=idf,
+            avgdl=float(doc_len.sum() / corpus_size) if corpus_size else 0.0,
+            k1=k1,
+            b=b,
+            epsilon=epsilon,
+            payload=payload,
+            payload_offsets=payload_offsets,
+        )
+
+    def __len__(self) -> int:
+        return len(self.doc_ids) - int(np.count_nonzero(self._deleted))
+
+    def term_index(self, term: str) -> int | None:
+        """Return the vocabulary position of a term, or None if unknown."""
+        col = int(np.searchsorted(self.vocab, term))
+        if col < len(self.vocab) and self.vocab[col] == term:
+            return col
+        return None
+
+    def _term_of_postings(self) -> np.ndarray:
+        """Return the vocabulary position of every entry in ``postings``."""
+        return np.repeat(np.arange(len(self.vocab)), np.diff(self.indptr))
+
+    def metadata_at(self, position: int) -> dict | None:
+        """Return the metadata stored for a document position, if any."""
+        base_count = len(self.payload_offsets) - 1
+        if position < base_count:
+            start, end = self.payload_offsets[position : position + 2]
+            raw = self.payload[start:end].tobytes()
+        else:
+            raw = self._delta_payload[position - base_count]
+        return json.loads(raw) if raw else None
+
+    def upsert(
+        self,
+        doc_ids: list[str],
+        texts: list[str],
+        metadatas: list[dict] | None = None,
+    ) -> None:
+        """
+        Add documents, replacing any already indexed under the same id.
+
+        :param doc_ids: Document ids.
+        :param texts: Document texts, tokenized with ``tokenize``.
+        :param metadatas: Optional metadata stored with each document.
+        """
+
+        docs = dict(zip(doc_ids, zip(texts, metadatas or [None] * len(texts))))
+        if not docs:
+            return
+
+        positions = self._position_map()
+        self.delete([doc_id for doc_id in docs if doc_id in positions])
+
+        start = len(self.doc_ids)
+        doc_len = np.zeros(len(docs), dtype=self.doc_len.dtype)
+        for offset, (doc_id, (text, metadata)) in enumerate(docs.items()):
+            self._delta_payload.append(_encode_metadata(metadata))
+            tokens = tokenize(text or "")
+            doc_len[offset] = len(tokens)
+            positions[doc_id] = start + offset
+            for term, freq in Counter(tokens).items():
+                delta_docs, delta_tf = self._delta.setdefault(term, ([], []))
+                delta_docs.append(start + offset)
+                delta_tf.append(freq)
+
+        self.doc_ids = np.concatenate([self.doc_ids, np.asarray(list(docs), dtype=str)])
+        self.doc_len = np.concatenate([self.doc_len, doc_len])
+        self._deleted = np.concatenate([self._deleted, np.zeros(len(docs), dtype=bool)])
+        self._stale = True
+
+    def delete(self, doc_ids: list[str]) -> None:
+        """Remove documents from the index; unknown ids are ignored."""
+        positions = self._position_map()
+        for doc_id in doc_ids:
+            position = positions.pop(doc_id, None)
+            if position is not None:
+                self._deleted[position] = True
+                self._stale = True
+
+    def _position_map(self) -> dict[str, int]:
+        """Return (building on first use) the position of every live document."""
+        if self._positions is None:
+            deleted = self._deleted.tolist()
+            self._positions = {
+                doc_id: position
+                for position, doc_id in enumerate(self.doc_ids.tolist())
+                if not deleted[position]
+            }
+        return self._positions
+
+    def _refresh_stats(self) -> None:
+        """Recompute document count, average length and idf after changes."""
+        if not self._stale:
+            return
+
+        live = ~self._deleted
+        corpus_size = int(np.count_nonzero(live))
+        self.avgdl = (
+            float(self.doc_len[live].sum() / corpus_size) if corpus_size else 0.0
+        )
+
+        df = np.diff(self.indptr).astype(np.float64)
+        dead = np.flatnonzero(self._deleted[self.postings])
+        if len(dead):
+            dead_cols = np.searchsorted(self.indptr, dead, side="right") - 1
+            df -= np.bincount(dead_cols, minlength=len(self.vocab))
+        terms = np.asarray(list(self._delta), dtype=str)
+        counts = np.asarray(
+            [np.count_nonzero(live[docs]) for docs, _tf in self._delta.values()],
+            dtype=np.float64,
+        )
+        cols = np.minimum(
+            np.searchsorted(self.vocab, terms), max(len(self.vocab) - 1, 0)
+        )
+        in_vocab = (
+            self.vocab[cols] == terms if len(self.vocab) else np.zeros(len(terms), bool)
+        )
+        np.add.at(df, cols[in_vocab], counts[in_vocab])
+        new_terms = ~in_vocab & (counts > 0)
+        delta_terms, delta_df = terms[new_terms], counts[new_terms]
+
+        # idf (and its mean, for the negative floor) covers live terms only
+        present = df > 0
+        idf = _idf(
+            np.concatenate([df[present], delta_df]),
+            corpus_size,
+            self.epsilon,
+        )
+        self.idf = np.zeros(len(self.vocab), dtype=np.float64)
+        self.idf[present] = idf[: np.count_nonzero(present)]
+        self._delta_idf = dict(
+            zip(delta_terms.tolist(), idf[np.count_nonzero(present) :].tolist())
+        )
+        self._stale = False
+
+    def compact(self) -> None:
+        """Merge the delta into the arrays and drop deleted documents."""
+        if not self._delta and not self._deleted.any():
+            return
+
+        live = ~self._deleted
+        new_position = np.cumsum(live) - 1
+        keep = live[self.postings]
+        base_cols = self._term_of_postings()[keep]
+
+        delta_terms, delta_docs, delta_tf = [], [], []
+        for term, (docs, tf) in self._delta.items():
+            docs = np.asarray(docs, dtype=np.int64)
+            alive = live[docs]
+            if alive.any():
+                delta_terms.extend([term] * int(alive.sum()))
+                delta_docs.append(docs[alive])
+                delta_tf.append(np.asarray(tf, dtype=self.tf.dtype)[alive])
+
+        delta_terms = np.asarray(delta_terms, dtype=str)
+        vocab = np.union1d(self.vocab[np.unique(base_cols)], delta_terms)
+        cols = np.concatenate(
+            [
+                np.searchsorted(vocab, self.vocab)[base_cols],
+                np.searchsorted(vocab, delta_terms),
+            ]
+        )
+        positions = np.concatenate(
+            [new_position[self.postings[keep]]]
+            + [new_position[docs] for docs in delta_docs]
+        )
+        tf = np.concatenate([self.tf[keep]] + delta_tf)
+
+        base_count = len(self.payload_offsets) - 1
+        base_live = live[:base_count]
+        starts = self.payload_offsets[:-1][base_live]
+        lengths = np.diff(self.payload_offsets)[base_live]
+        delta_payload = [
+            raw for raw, alive in zip(self._delta_payload, live[base_count:]) if alive
+        ]
+        payload = np.concatenate(
+            [
+                self.payload[_ranges(starts, lengths)],
+                np.frombuffer(b"".join(delta_payload), dtype=np.uint8),
+            ]
+        )
+        payload_lengths = np.concatenate(
+            [lengths, [len(raw) for raw in delta_payload]]
+        ).astype(np.int64)
+
+        # Base postings are already ordered by (term, position) and delta
+        # positions all come after them, so a stable sort on term suffices
+        order = np.argsort(cols, kind="stable")
+        self.vocab = vocab
+        self.indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum(np.bincount(cols, minlength=len(vocab)))
+        self.postings = positions[order].astype(np.int32)
+        self.tf = tf[order]
+        self.doc_ids = self.doc_ids[live]
+        self.doc_len = self.doc_len[live]
+        self.payload = payload
+        self.payload_offsets = np.zeros(len(self.doc_ids) + 1, dtype=np.int64)
+        self.payload_offsets[1:] = np.cumsum(payload_lengths)
+
+        self._deleted = np.zeros(len(self.doc_ids), dtype=bool)
+        self._delta = {}
+        self._delta_payload = []
+        self._positions = None
+        self._stale = True
+        self._refresh_stats()
+
+    def _postings_weights(self, query_tokens: list[str]):
+        """Yield (document positions, BM25 weights) for each known query token."""
+        self._refresh_stats()
+        if not self.avgdl:
+            return
+
+        has_deleted = self._deleted.any()
+        for term in query_tokens:
+            col = self.term_index(term)
+            if col is not None:
+                start, end = self.indptr[col], self.indptr[col + 1]
+                docs = self.postings[start:end]
+                tf = self.tf[start:end]
+                if has_deleted:
+                    alive = ~self._deleted[docs]
+                    docs, tf = docs[alive], tf[alive]
+                yield docs, self._weights(self.idf[col], docs, tf)
+
+            if term in self._delta:
+                docs, tf = (np.asarray(values) for values in self._delta[term])
+                alive = ~self._deleted[docs]
+                docs, tf = docs[alive], tf[alive]
+                idf = (
+                    self.idf[col] if col is not None else self._delta_idf.get(term, 0.0)
+                )
+                yield docs, self._weights(idf, docs, tf)
+
+    def _weights(self, idf: float, docs: np.ndarray, tf: np.ndarray) -> np.ndarray:
+        norm = self.k1 * (1 - self.b + self.b * self.doc_len[docs] / self.avgdl)
+        return idf * (tf * (self.k1 + 1) / (tf + norm))
+
+    def get_scores(self, query_tokens: list[str]) -> np.ndarray:
+        """Return the BM25 score of every document position for the query tokens."""
+        scores = np.zeros(len(self.doc_ids), dtype=np.float64)
+        for docs, weights in self._postings_weights(query_tokens):
+            scores[docs] += weights
+        return scores
+
+    def _hit(self, position: int, score: float, with_metadata: bool) -> tuple:
+        hit = (str(self.doc_ids[position]), float(score))
+        return (*hit, self.metadata_at(position)) if with_metadata else hit
+
+    def search(self, query: str, k: int, with_metadata: bool = False) -> list[tuple]:
+        """
+        Return the top-k (doc_id, score) pairs for a query string.
+
+        With ``with_metadata`` each hit is a (doc_id, score, metadata) triple.
+
+        Only documents in the postings of the query terms are scored, and
+        the top k are picked with ``argpartition``, so the cost grows with
+        the number of postings touched rather than the size of the catalog.
+        Documents containing none of the query terms are not returned.
+        Ties are broken by document position.
+        """
+
+        parts = list(self._postings_weights(tokenize(query)))
+        if not parts or k <= 0:
+            return []
+
+        docs, inverse = np.unique(
+            np.concatenate([docs for docs, _ in parts]), return_inverse=True
+        )
+        scores = np.bincount(
+            inverse, weights=np.concatenate([weights for _, weights in parts])
+        )
+
+        if k < len(docs):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(docs))
+        # docs is sorted, so ordering on (-score, index) breaks ties by position
+        top = top[np.lexsort((top, -scores[top]))]
+        return [self._hit(docs[i], scores[i], with_metadata) for i in top]
+
+    def search_batch(
+        self, queries: list[str], k: int, with_metadata: bool = False
+    ) -> list[list[tuple]]:
+        """Return the top-k (doc_id, score) pairs for each query string."""
+        return [self.search(query, k, with_metadata) for query in queries]
+
+    def save(self, directory: str | Path, **meta) -> None:
+        """
+        Write the index to a directory.
+
+        ``meta.json`` is removed first and written last, so a crash part way
+        through leaves an index that ``load`` refuses rather than a mix of
+        old and new arrays. Array files are replaced, not rewritten in place,
+        so indexes already memory-mapped by other readers stay valid. Pending
+        changes are compacted into the arrays before writing. Extra
+        keyword arguments are stored in the meta file and returned by
+        ``load`` as ``index.meta``.
+        """
+
+        self.compact()
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        meta_path = directory / META_FILE
+        meta_path.unlink(missing_ok=True)
+
+        for name in ARRAYS:
+            # Replace rather than overwrite: live memory maps keep the old file
+            path = directory / f"{name}.npy"
+            tmp_path = directory / f"{name}.tmp.npy"
+            np.save(tmp_path, getattr(self, name))
+            os.replace(tmp_path, path)
+
+        self.meta = {
+            **meta,
+            "format": FORMAT_VERSION,
+            "avgdl": self.avgdl,
+            "k1": self.k1,
+            "b": self.b,
+            "epsilon": self.epsilon,
+        }
+        tmp_path = meta_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, meta_path)
+
+    @classmethod
+    def load(cls, directory: str | Path) -> "BM25Index | None":
+        """
+        Memory-map an index written by ``save``.
+
+        :return: The index, or None if none was saved or its format is unknown.
+        """
+
+        directory = Path(directory)
+        meta_path = directory / META_FILE
+        if not meta_path.exists():
+            return None
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format") != FORMAT_VERSION:
+            return None
+
+        try:
+            arrays = {
+                name: np.load(directory / f"{name}.npy", mmap_mode="r")
+                for name in ARRAYS
+            }
+        except (OSError, ValueError):
+            return None
+
+        return cls(
+            **arrays,
+            avgdl=meta["avgdl"],
+            k1=meta["k1"],
+            b=meta["b"],
+            epsilon=meta["epsilon"],
+            meta=meta,
+        )
+
+
+class BM25Matrix:
+    """
+    Term-by-document matrix of precomputed BM25 weights over a ``BM25Index``.
+
+    The weight of every posting is computed once, giving a CSR matrix with
+    one row per term (sharing the index's ``indptr`` and ``postings``). A
+    batch of queries is a sparse query-by-term count matrix, so scoring is
+    the sparse product of the two, done with vectorized gathers and a
+    ``bincount`` rather than Python loops over documents.
+
+    Scores are the same as ``BM25Index.get_scores``, and ``search`` returns
+    the same results as ``BM25Index.search``. The index is compacted when
+    the matrix is built; later changes to it are not reflected.
+    """
+
+    def __init__(self, index: BM25Index, max_batch_cells: int = 4_000_000):
+        index.compact()
+        index._refresh_stats()
+        self.index = index
+        self.max_batch_cells = max_batch_cells
+
+        counts = np.diff(index.indptr)
+        tf = np.asarray(index.tf, dtype=np.float64)
+        if index.avgdl:
+            norm = index.k1 * (
+                1 - index.b + index.b * index.doc_len[index.postings] / index.avgdl
+            )
+            idf = np.repeat(np.asarray(index.idf), counts)
+            self.weights = idf * (tf * (index.k1 + 1) / (tf + norm))
+        else:
+            self.weights = np.zeros_like(tf)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _query_matrix(self, queries: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Return (query row, term index) pairs, one per known query token."""
+        rows, terms = [], []
+        for row, query in enumerate(queries):
+            tokens = tokenize(query)
+            rows.extend([row] * len(tokens))
+            terms.extend(tokens)
+        if not terms or not len(self.index.vocab):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        vocab = self.index.vocab
+        cols = np.searchsorted(vocab, np.asarray(terms, dtype=vocab.dtype))
+        cols = np.minimum(cols, len(vocab) - 1)
+        known = vocab[cols] == np.asarray(terms, dtype=vocab.dtype)
+        return np.asarray(rows, dtype=np.int64)[known], cols[known]
+
+    def _score_rows(self, queries: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Return dense (scores, touched) matrices of shape (queries, documents)."""
+        n_docs = len(self.index.doc_ids)
+        shape = (len(queries), n_docs)
+        rows, cols = self._query_matrix(queries)
+        if not len(cols):
+            return np.zeros(shape), np.zeros(shape, dtype=bool)
+
+        # Expand each (query, term) pair into that term's postings
+        starts = self.index.indptr[cols]
+        lengths = self.index.indptr[cols + 1] - starts
+        positions = _ranges(starts, lengths)
+
+        cells = np.repeat(rows, lengths) * n_docs + self.index.postings[positions]
+        size = shape[0] * n_docs
+        scores = np.bincount(cells, weights=self.weights[positions], minlength=size)
+        touched = np.bincount(cells, minlength=size) > 0
+        return scores.reshape(shape), touched.reshape(shape)
+
+    def score_batch(self, queries: list[str]) -> np.ndarray:
+        """Return a (queries, documents) matrix of BM25 scores."""
+        return self._score_rows(queries)[0]
+
+    def search(self, query: str, k: int, with_metadata: bool = False) -> list[tuple]:
+        """Return the top-k (doc_id, score) pairs for a query string."""
+        return self.search_batch([query], k, with_metadata)[0]
+
+    def search_batch(
+        self, queries: list[str], k: int, with_metadata: bool = False
+    ) -> list[list[tuple]]:
+        """
+        Return the top-k (doc_id, score) pairs for each query string.
+
+        Queries are scored together, in chunks of at most ``max_batch_cells``
+        query-document cells to bound the size of the dense score matrix.
+        """
+
+        if k <= 0:
+            return [[] for _ in queries]
+
+        chunk = max(1, self.max_batch_cells // max(len(self.index.doc_ids), 1))
+        results = []
+        for i in range(0, len(queries), chunk):
+            scores, touched = self._score_rows(queries[i : i + chunk])
+            for row_scores, row_touched in zip(scores, touched):
+                docs = np.flatnonzero(row_touched)
+                row_scores = row_scores[docs]
+                if k < len(docs):
+                    top = np.argpartition(-row_scores, k - 1)[:k]
+                else:
+                    top = np.arange(len(docs))
+                top = top[np.lexsort((top, -row_scores[top]))]
+                results.append(
+                    [
+                        self.index._hit(docs[j], row_scores[j], with_metadata)
+                        for j in top
+                    ]
+                )
+        return results
@@ -1,8 +1,18 @@
-from ollama import Client
-from langchain_litellm import ChatLiteLLM
+import asyncio
+import logging
+import re
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Self
+from ollama import AsyncClient
+from catalog import clients
+from catalog.cache import LLMCache, default_llm_cache
 from catalog.config import Settings
 from catalog.tools import TOOLS, execute_tool
 
+logger = logging.getLogger("catalog")
+
 MESSAGE_CONTENT = (
     "You are a professional data librarian specializing in dataset discovery. "
     "Your role is to help researchers find relevant datasets in the catalog. "
@@ -21,7 +31,7 @@ MESSAGE_CONTENT = (
 
 
 class OllamaBot:
-    def __init__(self):
+    def __init__(self, cache: LLMCache | None = None):
         """Initializes the OllamaBot with API credentials from environment variables."""
         settings = Settings()
         self.OLLAMA_API_KEY = settings.ollama_api_key
@@ -35,10 +45,51 @@ class OllamaBot:
         if not self.OLLAMA_MODEL:
             raise ValueError("OLLAMA_MODEL environment variable is not set.")
 
-        self.client = Client(
-            host=self.OLLAMA_BASE_URL,
-            headers={"Authorization": "Bearer " + self.OLLAMA_API_KEY},
+        self.client = clients.ollama_client(self.OLLAMA_BASE_URL, self.OLLAMA_API_KEY)
+        self._async_client = None
+        self.cache = cache if cache is not None else default_llm_cache()
+
+    @property
+    def async_client(self) -> AsyncClient:
+        """The shared ``AsyncClient`` for the running event loop."""
+        if self._async_client is not None:
+            return self._async_client
+        return clients.ollama_async_client(self.OLLAMA_BASE_URL, self.OLLAMA_API_KEY)
+
+    @async_client.setter
+    def async_client(self, client: AsyncClient) -> None:
+        self._async_client = client
+
+    def _cache_key(self, messages: list[dict]) -> str | None:
+        if self.cache is None:
+            return None
+        return self.cache.request_key(self.OLLAMA_MODEL, messages)
+
+    def _complete(self, messages: list[dict]) -> str:
+        """Send messages to the model, answering repeated requests from the cache."""
+        key = self._cache_key(messages)
+        if key is not None and (cached := self.cache.get(key)) is not None:
+            return cached
+
+        resp = self.client.chat(self.OLLAMA_MODEL, messages=messages, stream=False)
+        content = resp["message"]["content"]
+        if key is not None:
+            self.cache.put(key, content)
+        return content
+
+    async def _acomplete(self, messages: list[dict]) -> str:
+        """Async version of ``_complete``."""
+        key = self._cache_key(messages)
+        if key is not None and (cached := self.cache.get(key)) is not None:
+            return cached
+
+        resp = await self.async_client.chat(
+            self.OLLAMA_MODEL, messages=messages, stream=False
         )
+        content = resp["message"]["content"]
+        if key is not None:
+            self.cache.put(key, content)
+        return content
 
     def chat(self, question: str, context: str) -> str:
         """
@@ -49,7 +100,71 @@ class OllamaBot:
         :return: The model's response.
         """
 
-        messages = [
+        return self._complete(self._chat_messages(question, context))
+
+    def chat_stream(self, question: str, context: str) -> Iterator[str]:
+        """
+        Streaming version of ``chat``: yields the response text as it arrives.
+
+        :param question: The user's question.
+        :param context: The context to provide to the model.
+        :return: Iterator over chunks of the model's response.
+        """
+
+        messages = self._chat_messages(question, context)
+        key = self._cache_key(messages)
+        if key is not None and (cached := self.cache.get(key)) is not None:
+            yield cached
+            return
+
+        parts = []
+        stream = self.client.chat(self.OLLAMA_MODEL, messages=messages, stream=True)
+        for chunk in stream:
+            content = chunk["message"]["content"]
+            if content:
+                parts.append(content)
+                yield content
+        if key is not None:
+            self.cache.put(key, "".join(parts))
+
+    async def achat(self, question: str, context: str) -> str:
+        """Async version of ``chat`` using the ollama ``AsyncClient``."""
+
+        return await self._acomplete(self._chat_messages(question, context))
+
+    def expand_query(self, query: str) -> str:
+        """
+        Expands a user's query using the Ollama model.
+
+        :param query: The original user query.
+        :return: The expanded query.
+        """
+        return self._complete(self._expand_messages(query))
+
+    async def aexpand_query(self, query: str) -> str:
+        """Async version of ``expand_query`` using the ollama ``AsyncClient``."""
+        return await self._acomplete(self._expand_messages(query))
+
+    def expand_queries(self, query: str, n: int = 3) -> list[str]:
+        """
+        Asks the Ollama model for alternative phrasings of a user's query.
+
+        :param query: The original user query.
+        :param n: Number of alternative phrasings to ask for.
+        :return: Up to ``n`` alternative queries, not including the original.
+        """
+        return self._parse_alternatives(
+            self._complete(self._alternatives_messages(query, n)), query, n
+        )
+
+    async def aexpand_queries(self, query: str, n: int = 3) -> list[str]:
+        """Async version of ``expand_queries`` using the ollama ``AsyncClient``."""
+        content = await self._acomplete(self._alternatives_messages(query, n))
+        return self._parse_alternatives(content, query, n)
+
+    @staticmethod
+    def _chat_messages(question: str, context: str) -> list[dict]:
+        return [
             {
                 "role": "system",
                 "content": MESSAGE_CONTENT,
@@ -60,17 +175,9 @@ class OllamaBot:
             },
         ]
 
-        resp = self.client.chat(self.OLLAMA_MODEL, messages=messages, stream=False)
-        return resp["message"]["content"]
-
-    def expand_query(self, query: str) -> str:
-        """
-        Expands a user's query using the Ollama model.
-
-        :param query: The original user query.
-        :return: The expanded query.
-        """
-        messages = [
+    @staticmethod
+    def _expand_messages(query: str) -> list[dict]:
+        return [
             {
                 "role": "system",
                 "content": "You are a helpful assistant that expands user queries to include relevant keywords and synonyms for better dataset discovery.  Do not provide instruction on how to use, just the epanded query",
@@ -81,8 +188,31 @@ class OllamaBot:
             },
         ]
 
-        resp = self.client.chat(self.OLLAMA_MODEL, messages=messages, stream=False)
-        return resp["message"]["content"]
+    @staticmethod
+    def _alternatives_messages(query: str, n: int) -> list[dict]:
+        return [
+            {
+                "role": "system",
+                "content": "You are a helpful assistant that rewrites user queries for dataset discovery. Reply with one search query per line and nothing else.",
+            },
+            {
+                "role": "user",
+                "content": f"Write {n} different search queries for the following request, using other keywords and synonyms:\n\n{query}",
+            },
+        ]
+
+    @staticmethod
+    def _parse_alternatives(content: str, query: str, n: int) -> list[str]:
+        """Split a model reply into distinct queries, dropping list markers."""
+        alternatives = []
+        seen = {query.strip().lower()}
+        for line in content.splitlines():
+            line = re.sub(r"^\s*(?:[-*•]|\d+[.)])\s*", "", line).strip().strip("\"'")
+            if line and line.lower() not in seen:
+                seen.add(line.lower())
+                alternatives.append(line)
+        return alternatives[:n]
+
 
 AGENT_SYSTEM_PROMPT = (
     "You are an intelligent data librarian for the USFS Geodata Clearinghouse. "
@@ -96,37 +226,172 @@ AGENT_SYSTEM_PROMPT = (
 )
 
 
+def _message_dict(message) -> dict:
+    """Plain-dict form of a chat message, so it can be cached as JSON."""
+    if hasattr(message, "model_dump"):
+        return message.model_dump(exclude_none=True)
+    return message
+
+
 class AgentBot:
     MAX_ITERATIONS = 5
+    # Tool calls from one model turn run concurrently on a bounded pool; a
+    # call still running TOOL_TIMEOUT seconds after dispatch is reported to
+    # the model as timed out
+    MAX_TOOL_WORKERS = 4
+    TOOL_TIMEOUT = 30.0
 
-    def __init__(self):
+    def __init__(self, cache: LLMCache | None = None):
         from catalog.core import ChromaVectorDB
         from catalog.search import HybridSearch
 
         settings = Settings()
-        self.client = Client(
-            host=settings.ollama_api_url,
-            headers={"Authorization": "Bearer " + settings.ollama_api_key},
-        )
+        self.api_url = settings.ollama_api_url
+        self.api_key = settings.ollama_api_key
+        self.client = clients.ollama_client(self.api_url, self.api_key)
+        self._async_client = None
         self.model = settings.ollama_model
+        self.cache = cache if cache is not None else default_llm_cache()
         self.db = ChromaVectorDB()
         self.hs = HybridSearch(vector_db=self.db)
+        self._tool_executor = ThreadPoolExecutor(
+            max_workers=self.MAX_TOOL_WORKERS, thread_name_prefix="agent-tool"
+        )
 
-    def run(self, question: str) -> str:
-        """Run the agentic reasoning loop. Returns the final answer string."""
-        messages = [
+    def close(self) -> None:
+        """
+        Shut down the tool and search pools. Queued tool calls are dropped;
+        running ones finish in the background.
+        """
+        self._tool_executor.shutdown(wait=False, cancel_futures=True)
+        self.hs.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def async_client(self) -> AsyncClient:
+        """The shared ``AsyncClient`` for the running event loop."""
+        if self._async_client is not None:
+            return self._async_client
+        return clients.ollama_async_client(self.api_url, self.api_key)
+
+    @async_client.setter
+    def async_client(self, client: AsyncClient) -> None:
+        self._async_client = client
+
+    def _cache_key(self, messages: list) -> str | None:
+        if self.cache is None:
+            return None
+        return self.cache.request_key(self.model, messages, TOOLS)
+
+    def _chat(self, messages: list) -> dict:
+        """Send one agent turn to the model, replaying repeated turns from the cache."""
+        key = self._cache_key(messages)
+        if key is not None and (cached := self.cache.get(key)) is not None:
+            return cached
+
+        response = self.client.chat(
+            model=self.model,
+            messages=messages,
+            tools=TOOLS,
+        )
+        msg = _message_dict(response["message"])
+        if key is not None:
+            self.cache.put(key, msg)
+        return msg
+
+    async def _achat(self, messages: list) -> dict:
+        """Async version of ``_chat``."""
+        key = self._cache_key(messages)
+        if key is not None and (cached := self.cache.get(key)) is not None:
+            return cached
+
+        response = await self.async_client.chat(
+            model=self.model,
+            messages=messages,
+            tools=TOOLS,
+        )
+        msg = _message_dict(response["message"])
+        if key is not None:
+            self.cache.put(key, msg)
+        return msg
+
+    def _run_tools(self, tool_calls: list) -> list[str]:
+        """Execute a turn's tool calls concurrently; results keep the call order."""
+        started = time.monotonic()
+        futures = [
+            self._tool_executor.submit(
+                execute_tool,
+                tc["function"]["name"],
+                tc["function"]["arguments"],
+                self.db,
+                self.hs,
+            )
+            for tc in tool_calls
+        ]
+
+        results = []
+        for tc, future in zip(tool_calls, futures):
+            remaining = max(0.0, started + self.TOOL_TIMEOUT - time.monotonic())
+            try:
+                results.append(future.result(timeout=remaining))
+            except TimeoutError:
+                # Drops the call if it is still queued; a running call is
+                # left to finish but its result is no longer waited for
+                future.cancel()
+                results.append(self._tool_timed_out(tc["function"]["name"]))
+        return results
+
+    async def _arun_tools(self, tool_calls: list) -> list[str]:
+        """Async version of ``_run_tools``."""
+        loop = asyncio.get_running_loop()
+
+        async def call(tc) -> str:
+            fn_name = tc["function"]["name"]
+            future = loop.run_in_executor(
+                self._tool_executor,
+                execute_tool,
+                fn_name,
+                tc["function"]["arguments"],
+                self.db,
+                self.hs,
+            )
+            try:
+                return await asyncio.wait_for(future, timeout=self.TOOL_TIMEOUT)
+            except TimeoutError:
+                return self._tool_timed_out(fn_name)
+
+        return list(await asyncio.gather(*(call(tc) for tc in tool_calls)))
+
+    def _tool_timed_out(self, fn_name: str) -> str:
+        logger.warning(f"Agent tool {fn_name} timed out")
+        return f"Error: {fn_name} timed out after {self.TOOL_TIMEOUT:g} seconds."
+
+    @staticmethod
+    def _start_messages(question: str) -> list:
+        return [
             {"role": "system", "content": AGENT_SYSTEM_PROMPT},
             {"role": "user", "content": question},
         ]
 
+    @staticmethod
+    def _final_answer(last_content: str) -> str:
+        """Answer to give when the loop ends without a final model message."""
+        if last_content:
+            return last_content
+        return "Maximum search iterations reached. Please refine your query."
+
+    def run(self, question: str) -> str:
+        """Run the agentic reasoning loop. Returns the final answer string."""
+        messages = self._start_messages(question)
+
         last_content = ""
         for _ in range(self.MAX_ITERATIONS):
-            response = self.client.chat(
-                model=self.model,
-                messages=messages,
-                tools=TOOLS,
-            )
-            msg = response["message"]
+            msg = self._chat(messages)
             messages.append(msg)
 
             tool_calls = msg.get("tool_calls")
@@ -134,17 +399,39 @@ class AgentBot:
                 return msg.get("content", "")
 
             last_content = msg.get("content", "")
-            for tc in tool_calls:
-                fn_name = tc["function"]["name"]
-                fn_args = tc["function"]["arguments"]
-                result = execute_tool(fn_name, fn_args, self.db, self.hs)
+            for result in self._run_tools(tool_calls):
                 messages.append({"role": "tool", "content": result})
 
-        return last_content or "Maximum search iterations reached. Please refine your query."
+        return self._final_answer(last_content)
+
+    async def arun(self, question: str) -> str:
+        """
+        Async version of ``run``.
+
+        LLM calls go through the ollama ``AsyncClient`` and tool calls, which
+        embed and search, run on the tool pool so the event loop stays free
+        for other requests.
+        """
+        messages = self._start_messages(question)
+
+        last_content = ""
+        for _ in range(self.MAX_ITERATIONS):
+            msg = await self._achat(messages)
+            messages.append(msg)
+
+            tool_calls = msg.get("tool_calls")
+            if not tool_calls:
+                return msg.get("content", "")
+
+            last_content = msg.get("content", "")
+            for result in await self._arun_tools(tool_calls):
+                messages.append({"role": "tool", "content": result})
+
+        return self._final_answer(last_content)
 
 
 class VerdeBot:
-    def __init__(self):
+    def __init__(self, cache: LLMCache | None = None):
         """Initializes the VerdeBot with API credentials from environment variables."""
         settings = Settings()
         self.VERDE_API_KEY = settings.verde_api_key
@@ -158,12 +445,61 @@ class VerdeBot:
         if not self.VERDE_MODEL:
             raise ValueError("VERDE_MODEL environment variable is not set.")
 
-    def chat(self, question: str, context: str) -> str:
-        llm = ChatLiteLLM(
-            model=f"litellm_proxy/{self.VERDE_MODEL}",
-            api_key=self.VERDE_API_KEY,
-            api_base=self.VERDE_URL,
+        self.cache = cache if cache is not None else default_llm_cache()
+
+    def _llm(self, streaming: bool = False):
+        return clients.litellm_chat(
+            f"litellm_proxy/{self.VERDE_MODEL}",
+            self.VERDE_API_KEY,
+            self.VERDE_URL,
+            streaming=streaming,
         )
 
-        response = llm.invoke(question)
+    @staticmethod
+    def _messages(question: str, context: str) -> list[dict]:
+        """The request sent to the model; the Verde proxy gets the question only."""
+        return [{"role": "user", "content": question}]
+
+    def _cache_key(self, messages: list[dict]) -> str | None:
+        if self.cache is None:
+            return None
+        return self.cache.request_key(f"litellm_proxy/{self.VERDE_MODEL}", messages)
+
+    def chat(self, question: str, context: str) -> str:
+        messages = self._messages(question, context)
+        key = self._cache_key(messages)
+        if key is not None and (cached := self.cache.get(key)) is not None:
+            return cached
+
+        response = self._llm().invoke(messages)
+        if key is not None:
+            self.cache.put(key, response.content)
+        return response.content
+
+    def chat_stream(self, question: str, context: str) -> Iterator[str]:
+        """Streaming version of ``chat``: yields the response text as it arrives."""
+        messages = self._messages(question, context)
+        key = self._cache_key(messages)
+        if key is not None and (cached := self.cache.get(key)) is not None:
+            yield cached
+            return
+
+        parts = []
+        for chunk in self._llm(streaming=True).stream(messages):
+            if chunk.content:
+                parts.append(chunk.content)
+                yield chunk.content
+        if key is not None:
+            self.cache.put(key, "".join(parts))
+
+    async def achat(self, question: str, context: str) -> str:
+        """Async version of ``chat``."""
+        messages = self._messages(question, context)
+        key = self._cache_key(messages)
+        if key is not None and (cached := self.cache.get(key)) is not None:
+            return cached
+
+        response = await self._llm().ainvoke(messages)
+        if key is not None:
+            self.cache.put(key, response.content)
         return response.content
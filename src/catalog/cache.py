@@ -0,0 +1,227 @@
+"""
+Result caches for the search layer.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from catalog.config import Settings
+from catalog.lib import hash_string
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase a query and collapse its whitespace."""
+    return " ".join(query.lower().split())
+
+
+class QueryCache:
+    """
+    LRU cache of search results with a time-to-live.
+
+    Entries are keyed on the normalized query, the number of results, the
+    search mode, any filters and the collection version, so results cached
+    before the collection changed are never served after it. Values must be
+    JSON-serializable. With a ``path`` the entries are also written through
+    to an SQLite file and survive restarts; the in-memory LRU sits in front
+    of it. ``hits`` and ``misses`` count lookups for monitoring.
+    """
+
+    TABLE = "query_cache"
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float | None = 3600,
+        path: str | Path | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[str, tuple[float | None, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.TABLE} ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        query: str,
+        nresults: int,
+        mode: str,
+        version: str | None,
+        filters: dict | None = None,
+    ) -> str:
+        """Build the cache key for a search."""
+        return hash_string(
+            json.dumps(
+                [normalize_query(query), nresults, mode, filters or {}, version],
+                sort_keys=True,
+            )
+        )
+
+    def get(self, key: str):
+        """Return the cached value for a key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    f"SELECT expires_at, value FROM {self.TABLE} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = (row[0], row[1])
+                    self._remember(key, entry)
+
+            if entry is not None and entry[0] is not None and entry[0] <= now:
+                self._forget(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            if self._conn is not None:
+                self._conn.execute(
+                    f"UPDATE {self.TABLE} SET last_used = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+            self.hits += 1
+            return json.loads(entry[1])
+
+    def put(self, key: str, value) -> None:
+        """Store a JSON-serializable value under a key."""
+        now = time.time()
+        entry = (now + self.ttl if self.ttl else None, json.dumps(value))
+        with self._lock:
+            self._remember(key, entry)
+            if self._conn is not None:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.TABLE}"
+                    " (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                    (key, entry[1], entry[0], now),
+                )
+                (count,) = self._conn.execute(
+                    f"SELECT COUNT(*) FROM {self.TABLE}"
+                ).fetchone()
+                if count > self.max_entries:
+                    self._conn.execute(
+                        f"DELETE FROM {self.TABLE} WHERE key IN ("
+                        f" SELECT key FROM {self.TABLE} ORDER BY last_used LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+                self._conn.commit()
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute(f"DELETE FROM {self.TABLE}")
+                self._conn.commit()
+
+    @property
+    def stats(self) -> dict:
+        """Hit and miss counts, hit rate and number of in-memory entries."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, entry: tuple[float | None, str]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _forget(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self._conn is not None:
+            self._conn.execute(f"DELETE FROM {self.TABLE} WHERE key = ?", (key,))
+            self._conn.commit()
+
+
+class LLMCache(QueryCache):
+    """
+    Content-addressed cache of LLM responses.
+
+    Entries are keyed on a hash of the model, the messages (system prompt
+    included) and the tool schema, so identical requests are answered from
+    the cache. It shares ``QueryCache``'s LRU, TTL and SQLite persistence
+    and is bounded by ``max_entries``.
+    """
+
+    TABLE = "llm_cache"
+
+    @staticmethod
+    def request_key(model: str, messages: list, tools: list | None = None) -> str:
+        """Build the cache key for an LLM request."""
+        return hash_string(
+            json.dumps(
+                [model, messages, tools or []], sort_keys=True, default=_jsonable
+            )
+        )
+
+
+def _jsonable(value):
+    # ollama returns pydantic messages, which are appended to the history
+    if hasattr(value, "model_dump"):
+        return value.model_dump(exclude_none=True)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def default_query_cache() -> QueryCache | None:
+    """
+    Build the query cache used by ``ChromaVectorDB`` when none is given.
+
+    Configured from ``Settings``; a ``max_entries`` of 0 disables caching.
+    """
+
+    settings = Settings()
+    if settings.query_cache_max_entries <= 0:
+        return None
+    return QueryCache(
+        max_entries=settings.query_cache_max_entries,
+        ttl=settings.query_cache_ttl or None,
+        path=settings.query_cache_path or None,
+    )
+
+
+def default_llm_cache() -> LLMCache | None:
+    """
+    Build the LLM response cache used by the bots when none is given.
+
+    Configured from ``Settings``; a ``max_entries`` of 0 disables caching.
+    """
+
+    settings = Settings()
+    if settings.llm_cache_max_entries <= 0:
+        return None
+    return LLMCache(
+        max_entries=settings.llm_cache_max_entries,
+        ttl=settings.llm_cache_ttl or None,
+        path=settings.llm_cache_path or None,
+    )
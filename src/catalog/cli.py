@@ -1,11 +1,15 @@
+import json
+import os
+
 import click
-from rich.console import Console
-from rich.markdown import Markdown
-from rich.panel import Panel
-from catalog.usfs import USFS
-from catalog.core import ChromaVectorDB
-from catalog.bots import OllamaBot, VerdeBot, AgentBot
-from catalog.search import HybridSearch
+
+from catalog.config import Settings
+
+# Command dependencies (chromadb, rich, ollama, langchain, ...) are imported
+# inside the commands that use them so that `catalog --help` and quick
+# commands start fast; tests/test_startup.py guards the import budget.
+
+BM25_BACKENDS = ("postings", "matrix")
 
 
 @click.group()
@@ -21,32 +25,75 @@ def health() -> None:
 
 
 @cli.command()
-def download_fs_metadata() -> None:
+@click.option(
+    "--workers",
+    "-w",
+    default=8,
+    type=click.IntRange(min=1),
+    help="Number of concurrent download workers.",
+)
+def download_fs_metadata(workers: int = 8) -> None:
     """Download USFS metadata"""
 
+    from catalog.usfs import USFS
+
     click.echo("Downloading USFS metadata files...")
     usfs = USFS()
-    usfs.download_metadata()
+    usfs.download_metadata(workers=workers)
 
 
 @cli.command()
-def build_fs_catalog() -> None:
+@click.option(
+    "--workers",
+    "-w",
+    default=lambda: os.cpu_count() or 1,
+    type=click.IntRange(min=1),
+    help="Number of processes used to parse the XML metadata.  [default: CPU count]",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Only re-parse source files and records changed since the last build.",
+)
+def build_fs_catalog(workers: int = 1, incremental: bool = False) -> None:
     """
     Generate the USFS metadata catalog
     """
+    from catalog.usfs import USFS
 
     usfs = USFS()
-    usfs.build_catalog()
+    usfs.build_catalog(workers=workers, incremental=incremental)
 
 
 @cli.command()
-def build_fs_chromadb() -> None:
+@click.option(
+    "--sync",
+    is_flag=True,
+    help="Only re-embed new or changed documents and delete removed ones.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Number of embedding threads.  [default: up to 4]",
+)
+@click.option(
+    "--batch-size",
+    default=100,
+    type=click.IntRange(min=1),
+    help="Number of documents embedded and written per batch.",
+)
+def build_fs_chromadb(
+    sync: bool = False, workers: int | None = None, batch_size: int = 100
+) -> None:
     """
     Generate the USFS ChromaDB vector store
     """
+    from catalog.usfs import USFS
 
     usfs = USFS()
-    usfs.build_chromadb()
+    usfs.build_chromadb(sync=sync, workers=workers, batch_size=batch_size)
 
 
 @cli.command()
@@ -58,13 +105,18 @@ def build_fs_chromadb() -> None:
     type=click.IntRange(min=1),
     help="Number of results to return.",
 )
-def query_fs_chromadb(qstn: str, nresults: int = 5) -> None:
+@click.option(
+    "--server",
+    default=lambda: Settings().catalog_server_url or None,
+    help="URL of a running `catalog serve` to query instead of searching "
+    "in-process.  [default: CATALOG_SERVER_URL]",
+)
+def query_fs_chromadb(qstn: str, nresults: int = 5, server: str | None = None) -> None:
     """
     Query the USFS ChromaDB vector store
     """
 
-    db = ChromaVectorDB()
-    resp = db.query(qstn=qstn, nresults=nresults)
+    resp = _vector_query(qstn, nresults, server)
     for doc, distance in resp:
         click.echo(doc.to_markdown(distance=distance))
         click.echo("---")
@@ -79,7 +131,31 @@ def query_fs_chromadb(qstn: str, nresults: int = 5) -> None:
     type=click.IntRange(min=1),
     help="Number of results to return.",
 )
-def ollama_chat(qstn: str, nresults: int = 5) -> None:
+@click.option(
+    "--server",
+    default=lambda: Settings().catalog_server_url or None,
+    help="URL of a running `catalog serve` to query instead of searching "
+    "in-process.  [default: CATALOG_SERVER_URL]",
+)
+@click.option(
+    "--stream/--no-stream",
+    default=True,
+    help="Render the answer progressively as the model generates it.",
+)
+@click.option(
+    "--max-context-tokens",
+    default=lambda: Settings().context_max_tokens,
+    type=click.IntRange(min=1),
+    help="Token budget for the search results sent to the LLM.  "
+    "[default: CONTEXT_MAX_TOKENS or 3000]",
+)
+def ollama_chat(
+    qstn: str,
+    nresults: int = 5,
+    server: str | None = None,
+    stream: bool = True,
+    max_context_tokens: int = 3000,
+) -> None:
     """
     Runs a chromadb query and uses Ollama to answer the question.
 
@@ -88,26 +164,23 @@ def ollama_chat(qstn: str, nresults: int = 5) -> None:
     :param nresults: Description
     :type nresults: int
     """
+    from rich.console import Console
+
+    from catalog.bots import OllamaBot
+
     console = Console()
 
-    cvdb = ChromaVectorDB()
-    resp = cvdb.query(qstn=qstn, nresults=nresults)
+    resp = _vector_query(qstn, nresults, server)
     if resp:
-        context = "\n\n---\n\n".join(
-            doc.to_markdown(distance=distance) for doc, distance in resp
-        )
+        context = _build_context(resp, max_context_tokens)
         client = OllamaBot()
-        bot_response = client.chat(question=qstn, context=context)
+        if stream:
+            bot_response = client.chat_stream(question=qstn, context=context)
+        else:
+            bot_response = client.chat(question=qstn, context=context)
 
         # Render the response as formatted markdown in a styled panel
-        console.print(
-            Panel(
-                Markdown(bot_response),
-                title="[bold green]Response[/bold green]",
-                border_style="green",
-                padding=(1, 2),
-            )
-        )
+        _print_response(console, bot_response)
     else:
         console.print("[yellow]No results found for your query.[/yellow]")
 
@@ -121,7 +194,31 @@ def ollama_chat(qstn: str, nresults: int = 5) -> None:
     type=click.IntRange(min=1),
     help="Number of results to return.",
 )
-def ask_verde(qstn: str, nresults: int = 5) -> None:
+@click.option(
+    "--server",
+    default=lambda: Settings().catalog_server_url or None,
+    help="URL of a running `catalog serve` to query instead of searching "
+    "in-process.  [default: CATALOG_SERVER_URL]",
+)
+@click.option(
+    "--stream/--no-stream",
+    default=True,
+    help="Render the answer progressively as the model generates it.",
+)
+@click.option(
+    "--max-context-tokens",
+    default=lambda: Settings().context_max_tokens,
+    type=click.IntRange(min=1),
+    help="Token budget for the search results sent to the LLM.  "
+    "[default: CONTEXT_MAX_TOKENS or 3000]",
+)
+def ask_verde(
+    qstn: str,
+    nresults: int = 5,
+    server: str | None = None,
+    stream: bool = True,
+    max_context_tokens: int = 3000,
+) -> None:
     """
     Docstring for ask_verde
 
@@ -130,26 +227,23 @@ def ask_verde(qstn: str, nresults: int = 5) -> None:
     :param nresults: Description
     :type nresults: int
     """
+    from rich.console import Console
+
+    from catalog.bots import VerdeBot
+
     console = Console()
 
-    cvdb = ChromaVectorDB()
-    resp = cvdb.query(qstn=qstn, nresults=nresults)
+    resp = _vector_query(qstn, nresults, server)
     if resp:
-        context = "\n\n---\n\n".join(
-            doc.to_markdown(distance=distance) for doc, distance in resp
-        )
+        context = _build_context(resp, max_context_tokens)
 
         bot = VerdeBot()
-        bot_response = bot.chat(question=qstn, context=context)
+        if stream:
+            bot_response = bot.chat_stream(question=qstn, context=context)
+        else:
+            bot_response = bot.chat(question=qstn, context=context)
         # Render the response as formatted markdown in a styled panel
-        console.print(
-            Panel(
-                Markdown(bot_response),
-                title="[bold green]Response[/bold green]",
-                border_style="green",
-                padding=(1, 2),
-            )
-        )
+        _print_response(console, bot_response)
     else:
         console.print("[yellow]No results found for your query.[/yellow]")
 
@@ -175,44 +269,110 @@ def ask_verde(qstn: str, nresults: int = 5) -> None:
     is_flag=True,
     help="Whether to expand the query with an LLM before searching.",
 )
-def hybrid_search(qstn: str, nresults: int = 5, bot: str | None = None, expq: bool = False) -> None:
+@click.option(
+    "--multi-query",
+    is_flag=True,
+    help="Also search LLM rephrasings of the query and fuse all results. "
+    "Searching the query itself starts while the rephrasings are generated.",
+)
+@click.option(
+    "--expansions",
+    default=3,
+    type=click.IntRange(min=1),
+    help="Number of rephrasings to search with --multi-query.",
+)
+@click.option(
+    "--server",
+    default=lambda: Settings().catalog_server_url or None,
+    help="URL of a running `catalog serve` to query instead of searching "
+    "in-process.  [default: CATALOG_SERVER_URL]",
+)
+@click.option(
+    "--stream/--no-stream",
+    default=True,
+    help="Render the answer progressively as the model generates it.",
+)
+@click.option(
+    "--max-context-tokens",
+    default=lambda: Settings().context_max_tokens,
+    type=click.IntRange(min=1),
+    help="Token budget for the search results sent to the LLM.  "
+    "[default: CONTEXT_MAX_TOKENS or 3000]",
+)
+def hybrid_search(
+    qstn: str,
+    nresults: int = 5,
+    bot: str | None = None,
+    expq: bool = False,
+    multi_query: bool = False,
+    expansions: int = 3,
+    server: str | None = None,
+    stream: bool = True,
+    max_context_tokens: int = 3000,
+) -> None:
     """
     Query using hybrid search (BM25 keyword + vector semantic).
     Optionally pass results to an LLM with --bot ollama or --bot verde.
     """
+    from rich.console import Console
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+
+    from catalog.bots import OllamaBot, VerdeBot
+
+    if expq and multi_query:
+        raise click.UsageError("--expq and --multi-query cannot be used together.")
 
     console = Console()
-    db = ChromaVectorDB()
-    hs = HybridSearch(vector_db=db)
     if expq:
         expanded_qstn = OllamaBot().expand_query(query=qstn)
         console.print(f"[blue]Expanded query:[/blue] {expanded_qstn}")
         qstn = expanded_qstn
 
-    resp = hs.query(qstn=qstn, nresults=nresults)
+    if server:
+        from catalog.server import CatalogClient
+
+        client = CatalogClient(server)
+
+        def search_many(questions, nresults):
+            return _server_call(client.query_many, questions, nresults=nresults)
+
+    else:
+        from catalog.core import ChromaVectorDB
+        from catalog.search import HybridSearch
+
+        search_many = HybridSearch(vector_db=ChromaVectorDB()).query_many
+
+    if multi_query:
+        from catalog.search import multi_query as run_multi_query
+
+        def expand(query):
+            return OllamaBot().expand_queries(query, n=expansions)
+
+        resp, alternatives = run_multi_query(
+            qstn, expand, search_many, nresults=nresults
+        )
+        for alternative in alternatives:
+            console.print(f"[blue]Also searched:[/blue] {alternative}")
+    else:
+        resp = search_many([qstn], nresults=nresults)[0]
 
     if not resp:
         console.print("[yellow]No results found for your query.[/yellow]")
         return
 
     if bot:
-        context = "\n\n---\n\n".join(
-            doc.to_markdown(distance=score) for doc, score in resp
-        )
+        context = _build_context(resp, max_context_tokens, lower_is_better=False)
         if bot == "ollama":
             bot_client = OllamaBot()
         else:
             bot_client = VerdeBot()
 
-        bot_response = bot_client.chat(question=qstn, context=context)
-        console.print(
-            Panel(
-                Markdown(bot_response),
-                title="[bold green]Response[/bold green]",
-                border_style="green",
-                padding=(1, 2),
-            )
-        )
+        if stream:
+            bot_response = bot_client.chat_stream(question=qstn, context=context)
+        else:
+            bot_response = bot_client.chat(question=qstn, context=context)
+        _print_response(console, bot_response)
     else:
         for doc, score in resp:
             console.print(
@@ -225,25 +385,237 @@ def hybrid_search(qstn: str, nresults: int = 5, bot: str | None = None, expq: bo
             )
 
 
+def _build_context(resp, max_tokens: int, lower_is_better: bool = True) -> str:
+    """Fit search results into a token budget for an LLM prompt."""
+    from catalog.context import ContextBuilder
+
+    builder = ContextBuilder(max_tokens=max_tokens)
+    return builder.build(resp, lower_is_better=lower_is_better)
+
+
+def _print_response(
+    console, response, title: str = "[bold green]Response[/bold green]"
+) -> None:
+    """
+    Render an LLM response as markdown in a styled panel.
+
+    A string is printed at once; an iterator of text chunks is rendered in a
+    live display that redraws the panel as each chunk arrives.
+    """
+    from rich.live import Live
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+
+    def panel(text: str) -> Panel:
+        return Panel(Markdown(text), title=title, border_style="green", padding=(1, 2))
+
+    if isinstance(response, str):
+        console.print(panel(response))
+        return
+
+    text = ""
+    with Live(
+        panel(text), console=console, refresh_per_second=10, vertical_overflow="visible"
+    ) as live:
+        for chunk in response:
+            text += chunk
+            live.update(panel(text))
+
+
+def _server_call(method, *args, **kwargs):
+    """Call a CatalogClient method, reporting server errors as CLI errors."""
+    from catalog.server import ServerError
+
+    try:
+        return method(*args, **kwargs)
+    except ServerError as e:
+        raise click.ClickException(str(e))
+
+
+def _vector_query(qstn: str, nresults: int, server: str | None):
+    """Run a vector query on the server if one is given, else in-process."""
+    if server:
+        from catalog.server import CatalogClient
+
+        client = CatalogClient(server)
+        return _server_call(client.query, qstn, nresults=nresults, mode="vector")
+
+    from catalog.core import ChromaVectorDB
+
+    return ChromaVectorDB().query(qstn=qstn, nresults=nresults)
+
+
+def _read_queries(lines):
+    """Parse JSONL query lines into (fields, query) pairs, skipping blank lines."""
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise click.ClickException(f"Line {line_no}: invalid JSON ({e.msg}).")
+        if isinstance(item, str):
+            item = {"query": item}
+        if not isinstance(item, dict) or not isinstance(item.get("query"), str):
+            raise click.ClickException(
+                f'Line {line_no}: expected a string or an object with a "query".'
+            )
+        yield item
+
+
+@cli.command()
+@click.option(
+    "--input",
+    "-i",
+    "input_file",
+    type=click.File("r"),
+    default="-",
+    help="JSONL file of queries; each line is a string or an object with a "
+    '"query" field.  [default: stdin]',
+)
+@click.option(
+    "--output",
+    "-o",
+    "output_file",
+    type=click.File("w"),
+    default="-",
+    help="File to write JSONL results to.  [default: stdout]",
+)
+@click.option(
+    "--nresults",
+    "-n",
+    default=5,
+    type=click.IntRange(min=1),
+    help="Number of results to return per query.",
+)
+@click.option(
+    "--mode",
+    type=click.Choice(["hybrid", "vector"], case_sensitive=False),
+    default="hybrid",
+    help="Search with hybrid (BM25 + vector) or vector-only retrieval.",
+)
+@click.option(
+    "--batch-size",
+    default=256,
+    type=click.IntRange(min=1),
+    help="Number of queries retrieved together.",
+)
+@click.option(
+    "--server",
+    default=lambda: Settings().catalog_server_url or None,
+    help="URL of a running `catalog serve` to query instead of searching "
+    "in-process.  [default: CATALOG_SERVER_URL]",
+)
+def batch_query(
+    input_file,
+    output_file,
+    nresults: int = 5,
+    mode: str = "hybrid",
+    batch_size: int = 256,
+    server: str | None = None,
+) -> None:
+    """
+    Run many queries in batches, reading JSONL and writing JSONL.
+
+    Each output line repeats the input object's fields and adds "results",
+    a list of {id, title, src, score} (hybrid RRF score, or vector distance).
+    """
+
+    if server:
+        from catalog.server import CatalogClient
+
+        client = CatalogClient(server)
+
+        def search(questions, nresults):
+            return _server_call(
+                client.query_many, questions, nresults=nresults, mode=mode
+            )
+
+    elif mode == "hybrid":
+        from catalog.core import ChromaVectorDB
+        from catalog.search import HybridSearch
+
+        search = HybridSearch(vector_db=ChromaVectorDB()).query_many
+    else:
+        from catalog.core import ChromaVectorDB
+
+        search = ChromaVectorDB().query_many
+
+    def flush(items):
+        results = search([item["query"] for item in items], nresults=nresults)
+        for item, resp in zip(items, results):
+            item["results"] = [
+                {"id": doc.id, "title": doc.title, "src": doc.src, "score": score}
+                for doc, score in resp
+            ]
+            output_file.write(json.dumps(item) + "\n")
+        output_file.flush()
+
+    batch = []
+    for item in _read_queries(input_file):
+        batch.append(item)
+        if len(batch) == batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+
+@cli.command()
+@click.option("--host", default="127.0.0.1", help="Interface to listen on.")
+@click.option(
+    "--port", "-p", default=8765, type=click.IntRange(min=0), help="Port to listen on."
+)
+@click.option(
+    "--bm25-backend",
+    type=click.Choice(BM25_BACKENDS),
+    default="postings",
+    help="BM25 scoring backend for hybrid search.",
+)
+def serve(host: str = "127.0.0.1", port: int = 8765, bm25_backend: str = "postings"):
+    """
+    Serve vector, hybrid, filtered and document search over local HTTP.
+
+    The vector store, embedding model and BM25 index stay loaded between
+    requests. Point the query commands at it with --server or
+    CATALOG_SERVER_URL.
+    """
+    from rich.console import Console
+
+    from catalog.core import ChromaVectorDB
+    from catalog.server import CatalogServer
+
+    console = Console()
+    server = CatalogServer(
+        ChromaVectorDB(), host=host, port=port, bm25_backend=bm25_backend
+    )
+    console.print(f"[green]Catalog server listening on {server.url}[/green]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 @cli.command()
 @click.option("--qstn", "-q", required=True)
 def agent_search(qstn: str) -> None:
     """
     Run an agentic search loop — the LLM drives tool calls until it can answer.
     """
+    from rich.console import Console
+
+    from catalog.bots import AgentBot
+
     console = Console()
 
-    bot = AgentBot()
-    response = bot.run(question=qstn)
+    with AgentBot() as bot:
+        response = bot.run(question=qstn)
 
     if response:
-        console.print(
-            Panel(
-                Markdown(response),
-                title="[bold green]Agent Response[/bold green]",
-                border_style="green",
-                padding=(1, 2),
-            )
+        _print_response(
+            console, response, title="[bold green]Agent Response[/bold green]"
         )
     else:
         console.print("[yellow]No response from agent.[/yellow]")
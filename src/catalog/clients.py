@@ -0,0 +1,138 @@
+"""
+Process-wide registry of pooled LLM clients.
+
+Bots used to build new ollama clients on every init, and ``VerdeBot`` a new
+``ChatLiteLLM`` on every call, so each request could pay for a fresh TCP and
+TLS handshake. The functions here hand out one client per endpoint and
+credentials. The client keeps its keep-alive (optionally HTTP/2)
+connection pool for the life of the process. Pool size and timeouts come
+from ``Settings``.
+
+Async clients are kept per event loop, since an ``httpx.AsyncClient``'s
+connections are bound to the loop that opened them, and are closed when
+their loop shuts down.
+"""
+
+import asyncio
+import threading
+import weakref
+
+import httpx
+from ollama import AsyncClient, Client
+
+from catalog.config import Settings
+
+_lock = threading.Lock()
+_clients: dict[tuple, object] = {}
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_async_closers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _http_options() -> dict:
+    """httpx client options for the pool, from ``Settings``."""
+    settings = Settings()
+    return {
+        "timeout": httpx.Timeout(
+            settings.llm_timeout, connect=settings.llm_connect_timeout
+        ),
+        "limits": httpx.Limits(
+            max_connections=settings.llm_pool_max_connections,
+            max_keepalive_connections=settings.llm_pool_max_keepalive,
+        ),
+        "http2": settings.llm_http2,
+    }
+
+
+def _auth_headers(api_key: str) -> dict:
+    return {"Authorization": "Bearer " + api_key}
+
+
+def ollama_client(host: str, api_key: str) -> Client:
+    """Return the shared ollama ``Client`` for an endpoint and API key."""
+    key = ("ollama", host, api_key)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = Client(
+                host=host, headers=_auth_headers(api_key), **_http_options()
+            )
+            _clients[key] = client
+        return client
+
+
+def ollama_async_client(host: str, api_key: str) -> AsyncClient:
+    """
+    Return the ollama ``AsyncClient`` for an endpoint and API key.
+
+    Must be called from a coroutine; the client is shared by everything
+    running on the current event loop.
+    """
+    loop = asyncio.get_running_loop()
+    key = (host, api_key)
+    with _lock:
+        clients = _async_clients.get(loop)
+        if clients is None:
+            clients = _async_clients[loop] = {}
+            _async_closers[loop] = _close_on_shutdown(clients)
+        client = clients.get(key)
+        if client is None:
+            client = AsyncClient(
+                host=host, headers=_auth_headers(api_key), **_http_options()
+            )
+            clients[key] = client
+        return client
+
+
+def _close_on_shutdown(clients: dict):
+    """
+    Start an async generator that closes a loop's clients when it shuts down.
+
+    Parking the generator at its ``yield`` registers it with the running
+    loop; ``asyncio.run`` (or ``loop.shutdown_asyncgens``) then
+    closes it, running the ``finally`` block on that loop.
+    """
+
+    async def closer():
+        try:
+            yield
+        finally:
+            for client in list(clients.values()):
+                await client.close()
+            clients.clear()
+
+    gen = closer()
+    try:
+        # Runs synchronously to the yield, as nothing before it awaits
+        gen.asend(None).send(None)
+    except StopIteration:
+        pass
+    return gen
+
+
+def litellm_chat(model: str, api_key: str, api_base: str, streaming: bool = False):
+    """Return the shared ``ChatLiteLLM`` for a model, endpoint and API key."""
+    # langchain/litellm take seconds to import, so only load them when used
+    from langchain_litellm import ChatLiteLLM
+
+    key = ("litellm", model, api_key, api_base, streaming)
+    with _lock:
+        llm = _clients.get(key)
+        if llm is None:
+            settings = Settings()
+            llm = ChatLiteLLM(
+                model=model,
+                api_key=api_key,
+                api_base=api_base,
+                streaming=streaming,
+                request_timeout=settings.llm_timeout,
+            )
+            _clients[key] = llm
+        return llm
+
+
+def clear() -> None:
+    """Forget every shared client, e.g. after changing ``Settings``."""
+    with _lock:
+        _clients.clear()
+        _async_clients.clear()
+        _async_closers.clear()
@@ -14,3 +14,38 @@ class Settings:
         self.verde_api_key: str = os.environ.get("VERDE_API_KEY", "")
         self.verde_url: str = os.environ.get("VERDE_URL", "")
         self.verde_model: str = os.environ.get("VERDE_MODEL", "")
+        self.embedding_cache_path: str = os.environ.get(
+            "EMBEDDING_CACHE_PATH", "./cache/embeddings.sqlite3"
+        )
+        self.embedding_cache_max_entries: int = int(
+            os.environ.get("EMBEDDING_CACHE_MAX_ENTRIES", "200000")
+        )
+        self.query_cache_max_entries: int = int(
+            os.environ.get("QUERY_CACHE_MAX_ENTRIES", "1024")
+        )
+        self.query_cache_ttl: float = float(os.environ.get("QUERY_CACHE_TTL", "3600"))
+        self.query_cache_path: str = os.environ.get("QUERY_CACHE_PATH", "")
+        self.catalog_server_url: str = os.environ.get("CATALOG_SERVER_URL", "")
+        self.llm_cache_path: str = os.environ.get(
+            "LLM_CACHE_PATH", "./cache/llm.sqlite3"
+        )
+        self.llm_cache_max_entries: int = int(
+            os.environ.get("LLM_CACHE_MAX_ENTRIES", "10000")
+        )
+        self.llm_cache_ttl: float = float(os.environ.get("LLM_CACHE_TTL", "604800"))
+        self.context_max_tokens: int = int(os.environ.get("CONTEXT_MAX_TOKENS", "3000"))
+        self.llm_timeout: float = float(os.environ.get("LLM_TIMEOUT", "120"))
+        self.llm_connect_timeout: float = float(
+            os.environ.get("LLM_CONNECT_TIMEOUT", "10")
+        )
+        self.llm_pool_max_connections: int = int(
+            os.environ.get("LLM_POOL_MAX_CONNECTIONS", "20")
+        )
+        self.llm_pool_max_keepalive: int = int(
+            os.environ.get("LLM_POOL_MAX_KEEPALIVE", "10")
+        )
+        self.llm_http2: bool = os.environ.get("LLM_HTTP2", "").lower() in (
+            "1",
+            "true",
+            "yes",
+        )
@@ -0,0 +1,180 @@
+"""
+Token-budgeted context assembly for RAG prompts.
+"""
+
+import math
+import re
+
+from catalog.schema import USFSDocument
+
+# Rough characters per token for English prose; close enough for budgeting
+# without pulling in a model-specific tokenizer
+CHARS_PER_TOKEN = 4
+SEPARATOR = "\n\n---\n\n"
+TRUNCATION_MARK = " …"
+
+_WORD = re.compile(r"\w+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in a text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate(text: str | None, max_tokens: int) -> str | None:
+    """
+    Shorten a text to at most ``max_tokens`` estimated tokens.
+
+    Keeps whole leading sentences when that retains at least half of the
+    budget, otherwise cuts at a word boundary, and marks the cut with "…".
+    """
+
+    if not text or estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Leave room for the mark so the result still fits the budget
+    limit = max(max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARK), 0)
+    head = text[:limit]
+    sentence_end = max(head.rfind(". "), head.rfind(".\n"))
+    if sentence_end >= limit // 2:
+        return head[: sentence_end + 1] + TRUNCATION_MARK
+    word_end = head.rfind(" ")
+    if word_end > 0:
+        head = head[:word_end]
+    return head.rstrip(" ,;:") + TRUNCATION_MARK
+
+
+def _shingles(doc: USFSDocument) -> set[str]:
+    text = f"{doc.title or ''} {doc.abstract or ''}".lower()
+    return set(_WORD.findall(text))
+
+
+def _similarity(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class ContextBuilder:
+    """
+    Assembles search results into LLM context that fits a token budget.
+
+    Results are taken in rank order, at most ``max_documents`` of them. For
+    vector distances, documents further than ``max_distance_gap`` from the
+    best hit are dropped; RRF scores carry no absolute meaning, so hybrid
+    results are only cut by rank. Near-duplicates of documents already
+    included (Jaccard similarity of title and abstract words) are dropped,
+    long abstracts, descriptions and purposes are shortened, and documents
+    are added until the budget is used up.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 3000,
+        max_field_tokens: int = 150,
+        max_documents: int = 8,
+        max_distance_gap: float | None = 0.5,
+        duplicate_threshold: float = 0.9,
+    ):
+        """
+        :param max_tokens: Token budget for the whole context.
+        :param max_field_tokens: Token limit for each long text field.
+        :param max_documents: Number of top-ranked results considered.
+        :param max_distance_gap: Drop documents whose distance exceeds the
+            best document's by more than this (None keeps all). Chroma's
+            squared L2 distances on normalized embeddings range from 0 to 4.
+        :param duplicate_threshold: Similarity at or above which a document
+            counts as a duplicate of one already included.
+        """
+        self.max_tokens = max_tokens
+        self.max_field_tokens = max_field_tokens
+        self.max_documents = max_documents
+        self.max_distance_gap = max_distance_gap
+        self.duplicate_threshold = duplicate_threshold
+
+    def compact(self, doc: USFSDocument) -> USFSDocument:
+        """Return a copy of a document with long fields shortened."""
+        return doc.model_copy(
+            update={
+                "abstract": truncate(doc.abstract, self.max_field_tokens),
+                "description": truncate(doc.description, self.max_field_tokens),
+                "purpose": truncate(doc.purpose, self.max_field_tokens),
+            }
+        )
+
+    def assemble(
+        self,
+        results: list[tuple[USFSDocument, float]],
+        lower_is_better: bool = True,
+    ) -> dict:
+        """
+        Build the context for ranked search results.
+
+        :param results: (USFSDocument, score) tuples, best first.
+        :param lower_is_better: True for vector distances, False for
+            similarity scores such as hybrid RRF scores.
+        :return: Dict with the context ``text``, its estimated ``tokens``, the
+            ids of the included ``documents`` and how many results were
+            dropped as ``over_limit`` (past ``max_documents``), ``low_score``,
+            ``duplicate`` or ``over_budget``.
+        """
+
+        context = {
+            "text": "",
+            "tokens": 0,
+            "documents": [],
+            "over_limit": max(len(results) - self.max_documents, 0),
+            "low_score": 0,
+            "duplicate": 0,
+            "over_budget": 0,
+        }
+        results = results[: self.max_documents]
+        if not results:
+            return context
+
+        max_distance = None
+        if lower_is_better and self.max_distance_gap is not None:
+            max_distance = results[0][1] + self.max_distance_gap
+
+        parts: list[str] = []
+        seen: list[set[str]] = []
+        used = 0
+        for rank, (doc, score) in enumerate(results):
+            if max_distance is not None and score > max_distance:
+                context["low_score"] += 1
+                continue
+
+            words = _shingles(doc)
+            if any(
+                _similarity(words, other) >= self.duplicate_threshold for other in seen
+            ):
+                context["duplicate"] += 1
+                continue
+
+            block = self.compact(doc).to_markdown(distance=score)
+            cost = estimate_tokens(block) + (estimate_tokens(SEPARATOR) if parts else 0)
+            if used + cost > self.max_tokens:
+                if parts:
+                    # Results are ranked, so everything after this is the tail
+                    context["over_budget"] += len(results) - rank
+                    break
+                # Always include the best document, cut to the budget
+                block = truncate(block, self.max_tokens)
+                cost = estimate_tokens(block)
+
+            parts.append(block)
+            seen.append(words)
+            context["documents"].append(doc.id)
+            used += cost
+
+        context["text"] = SEPARATOR.join(parts)
+        context["tokens"] = estimate_tokens(context["text"])
+        return context
+
+    def build(
+        self,
+        results: list[tuple[USFSDocument, float]],
+        lower_is_better: bool = True,
+    ) -> str:
+        """Build the context text for ranked search results."""
+        return self.assemble(results, lower_is_better=lower_is_better)["text"]
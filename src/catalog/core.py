@@ -1,21 +1,106 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 from pathlib import Path
+from collections.abc import Callable
 import chromadb
 import json
+import os
+import queue
+import threading
+import time
+import uuid
+from catalog.bm25 import BM25Index
+from catalog.cache import QueryCache, default_query_cache
+from catalog.embeddings import default_embedding_function
+from catalog.lib import hash_string
 from catalog.schema import USFSDocument
 
+VERSION_KEY = "catalog_version"
+BM25_DIR = "bm25"
+
 
 class ChromaVectorDB:
     def __init__(
         self,
         db_path: str = "./chromadb",
         src_catalog_file: str = "data/usfs/catalog.json",
+        embedding_function=None,
+        query_cache: QueryCache | None = None,
     ):
         self.db_path = db_path
         self.src_catalog_file = src_catalog_file
+        if embedding_function is None:
+            embedding_function = default_embedding_function()
+        self.embedding_function = embedding_function
+        self.query_cache = (
+            query_cache if query_cache is not None else default_query_cache()
+        )
         self.client = chromadb.PersistentClient(path=db_path)
-        self.collection = self.client.create_collection("documents", get_or_create=True)
+        self.collection = self._get_collection()
         self.documents = []
 
+    def _get_collection(self, name: str = "documents"):
+        """Open (or create) the collection with the configured embedding function."""
+        return self.client.create_collection(
+            name, embedding_function=self.embedding_function, get_or_create=True
+        )
+
+    @property
+    def version(self) -> str | None:
+        """Stamp that changes every time the collection's contents change."""
+        return (self.collection.metadata or {}).get(VERSION_KEY)
+
+    def _bump_version(self) -> None:
+        """Give the collection a new version stamp after a write."""
+        metadata = dict(self.collection.metadata or {})
+        metadata[VERSION_KEY] = uuid.uuid4().hex
+        self.collection.modify(metadata=metadata)
+
+    def build_bm25_index(self) -> BM25Index:
+        """
+        Builds the BM25 index from the stored documents and saves it.
+
+        The index, including each document's metadata, is written to
+        ``bm25/`` under the ChromaDB directory, tagged with the collection's
+        version stamp and document count.
+
+        :return: The built index.
+        :rtype: BM25Index
+        """
+
+        if self.version is None:
+            self._bump_version()
+
+        all_docs = self.collection.get(include=["documents", "metadatas"])
+        index = BM25Index.build(
+            all_docs["ids"], all_docs["documents"], all_docs["metadatas"]
+        )
+        self._save_bm25_index(index)
+        return index
+
+    def _save_bm25_index(self, index: BM25Index) -> None:
+        """Saves the index tagged with the collection's version and count."""
+        index.save(
+            Path(self.db_path) / BM25_DIR, version=self.version, count=len(index)
+        )
+
+    def load_bm25_index(self) -> BM25Index | None:
+        """
+        Loads the saved BM25 index if it matches the collection.
+
+        :return: The index, or None if there is none or it is stale.
+        :rtype: BM25Index | None
+        """
+
+        index = BM25Index.load(Path(self.db_path) / BM25_DIR)
+        if index is None or self.version is None:
+            return None
+        if index.meta.get("version") != self.version:
+            return None
+        if index.meta.get("count") != self.collection.count():
+            return None
+        return index
+
     def load_document_metadata(self):
         """
         Loads the document metadata from the JSON file.
@@ -45,93 +130,393 @@ class ChromaVectorDB:
 
         return lineage
 
-    def batch_load_documents(self, batch_size: int = 100) -> None:
+    def build_record(self, doc: USFSDocument) -> tuple[str, str, dict]:
+        """
+        Builds the id, embedded text and metadata stored for a document.
+
+        The metadata carries a ``content_hash`` of the text and metadata so
+        ``sync_documents`` can tell which documents changed.
+
+        :param doc: The catalog document.
+        :type doc: USFSDocument
+        :return: Tuple of (id, document text, metadata).
+        :rtype: tuple[str, str, dict]
+        """
+
+        title = doc.title or ""
+        abstract = doc.abstract or ""
+        purpose = doc.purpose or ""
+        description = doc.description or ""
+        source = doc.src or ""
+        lineage_str = self.extract_lineage_info(doc.lineage) if doc.lineage else ""
+
+        text = (
+            f"Title: {title}\n"
+            f"Abstract: {abstract}\n"
+            f"Description: {description}\n"
+            f"Purpose: {purpose}\n"
+            f"Source: {source}\n"
+            f"Keywords: {', '.join(doc.keywords) if doc.keywords else ''}\n"
+            f"Lineage: {lineage_str}\n"
+        )
+        metadata = {
+            "id": doc.id,
+            "title": title,
+            "abstract": abstract,
+            "description": description,
+            "source": source,
+            "purpose": purpose,
+            "keywords": ",".join(doc.keywords) if doc.keywords else "",
+            "lineage": lineage_str,
+        }
+        metadata["content_hash"] = hash_string(
+            text + json.dumps(metadata, sort_keys=True)
+        )
+
+        return doc.id, text, metadata
+
+    def batch_load_documents(
+        self,
+        batch_size: int = 100,
+        workers: int | None = None,
+        queue_size: int | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> dict:
         """
         Loads the documents into the ChromaDB collection in batches.
+
+        The load runs as a pipeline: one thread assembles the record text,
+        ``workers`` threads embed batches concurrently and the calling thread
+        writes the embedded batches to the collection. The queues between
+        the stages hold at most ``queue_size`` batches, so a slow stage
+        holds back the ones in front of it instead of buffering the catalog.
+        The first batch is embedded on the calling thread before the workers
+        start, so the embedding model is loaded only once.
+
         :param batch_size: Number of documents to process in each batch.
         :type batch_size: int
-        :return: None
+        :param workers: Number of embedding threads (default: up to 4).
+        :type workers: int | None
+        :param queue_size: Batches buffered between stages (default: 2 per worker).
+        :type queue_size: int | None
+        :param progress: Called with (documents written, total) after each write.
+        :type progress: Callable[[int, int], None] | None
+        :return: Documents and batches written, elapsed seconds and docs/second.
+        :rtype: dict
         """
 
         if not self.documents:
             self.load_document_metadata()
 
         self.client.delete_collection(self.collection.name)
-        self.collection = self.client.create_collection(
-            name=self.collection.name, get_or_create=True
-        )
+        self.collection = self._get_collection(self.collection.name)
 
-        for i in range(0, len(self.documents), batch_size):
-            batch = self.documents[i : i + batch_size]
-            ids = []
-            documents = []
-            metadatas = []
-
-            for doc in batch:
-                title = doc.title or ""
-                abstract = doc.abstract or ""
-                purpose = doc.purpose or ""
-                description = doc.description or ""
-                source = doc.src or ""
-                lineage_str = (
-                    self.extract_lineage_info(doc.lineage) if doc.lineage else ""
-                )
+        workers = workers or min(4, os.cpu_count() or 1)
+        queue_size = queue_size or 2 * workers
+        records = queue.Queue(maxsize=queue_size)
+        embedded = queue.Queue(maxsize=queue_size)
+        failed = threading.Event()
+        documents = self.documents
+        total = len(documents)
 
-                ids.append(doc.id)
-                documents.append(
-                    f"Title: {title}\n"
-                    f"Abstract: {abstract}\n"
-                    f"Description: {description}\n"
-                    f"Purpose: {purpose}\n"
-                    f"Source: {source}\n"
-                    f"Keywords: {', '.join(doc.keywords) if doc.keywords else ''}\n"
-                    f"Lineage: {lineage_str}\n"
-                )
-                metadatas.append(
-                    {
-                        "id": doc.id,
-                        "title": title,
-                        "abstract": abstract,
-                        "description": description,
-                        "source": source,
-                        "purpose": purpose,
-                        "keywords": ",".join(doc.keywords) if doc.keywords else "",
-                        "lineage": lineage_str,
-                    }
+        def put(q: queue.Queue, item) -> None:
+            # Give up instead of blocking forever once another stage has failed
+            while not failed.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def get(q: queue.Queue):
+            # Returns None (the end-of-stream marker) once another stage has failed
+            while not failed.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return None
+
+        def embed_batch(batch: list[tuple]) -> tuple:
+            ids, texts, metadatas = (list(field) for field in zip(*batch))
+            return ids, texts, metadatas, self.embedding_function(texts)
+
+        # Embed the first batch before starting the workers: embedding
+        # functions such as chromadb's default load (and, on a cold machine,
+        # download) their model lazily without a lock, so concurrent first
+        # calls would race each other
+        started = time.perf_counter()
+        first = [self.build_record(doc) for doc in documents[:batch_size]]
+        if first:
+            embedded.put(embed_batch(first))
+
+        def assemble() -> None:
+            try:
+                for i in range(batch_size, total, batch_size):
+                    batch = [
+                        self.build_record(doc) for doc in documents[i : i + batch_size]
+                    ]
+                    put(records, batch)
+            except BaseException:
+                failed.set()
+                raise
+            finally:
+                for _ in range(workers):
+                    put(records, None)
+
+        def embed() -> None:
+            try:
+                while (batch := get(records)) is not None:
+                    put(embedded, embed_batch(batch))
+            except BaseException:
+                failed.set()
+                raise
+            finally:
+                put(embedded, None)
+
+        written = batches = 0
+        with ThreadPoolExecutor(max_workers=workers + 1) as executor:
+            futures = [executor.submit(assemble)]
+            futures += [executor.submit(embed) for _ in range(workers)]
+
+            finished = 0
+            try:
+                while finished < workers and not failed.is_set():
+                    item = get(embedded)
+                    if item is None:
+                        finished += 1
+                        continue
+
+                    ids, texts, metadatas, embeddings = item
+                    self.collection.add(
+                        ids=ids,
+                        documents=texts,
+                        metadatas=metadatas,
+                        embeddings=embeddings,
+                    )
+                    written += len(ids)
+                    batches += 1
+                    if progress is not None:
+                        progress(written, total)
+            except BaseException:
+                # Covers the progress callback too, so the other stages exit
+                failed.set()
+                raise
+
+        for future in futures:
+            future.result()
+
+        self._bump_version()
+        self.build_bm25_index()
+
+        elapsed = time.perf_counter() - started
+        return {
+            "documents": written,
+            "batches": batches,
+            "seconds": elapsed,
+            "docs_per_second": written / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def sync_documents(self, batch_size: int = 100) -> dict:
+        """
+        Brings the collection in line with the catalog without rebuilding it.
+
+        Documents are compared by id and the ``content_hash`` stored in their
+        metadata: new and changed documents are upserted (and so re-embedded),
+        documents no longer in the catalog are deleted, and unchanged
+        documents are left alone. The collection stays queryable throughout.
+        The saved BM25 index is patched with the same changes rather than
+        rebuilt, unless it was already out of date.
+
+        :param batch_size: Number of documents to upsert or delete per call.
+        :type batch_size: int
+        :return: Counts of added, updated, deleted and unchanged documents.
+        :rtype: dict
+        """
+
+        if not self.documents:
+            self.load_document_metadata()
+
+        # Only an index matching the collection before the sync can be patched
+        bm25_index = self.load_bm25_index()
+        existing = self.collection.get(include=["metadatas"])
+        existing_hashes = {
+            doc_id: (meta or {}).get("content_hash")
+            for doc_id, meta in zip(existing["ids"], existing["metadatas"])
+        }
+
+        stats = {"added": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        pending = []
+        for doc in self.documents:
+            record = self.build_record(doc)
+            doc_id, _text, metadata = record
+            if doc_id not in existing_hashes:
+                stats["added"] += 1
+            elif existing_hashes[doc_id] != metadata["content_hash"]:
+                stats["updated"] += 1
+            else:
+                stats["unchanged"] += 1
+                continue
+            pending.append(record)
+
+        for i in range(0, len(pending), batch_size):
+            ids, documents, metadatas = zip(*pending[i : i + batch_size])
+            self.collection.upsert(
+                documents=list(documents), metadatas=list(metadatas), ids=list(ids)
+            )
+
+        catalog_ids = {doc.id for doc in self.documents}
+        removed = [doc_id for doc_id in existing_hashes if doc_id not in catalog_ids]
+        for i in range(0, len(removed), batch_size):
+            self.collection.delete(ids=removed[i : i + batch_size])
+        stats["deleted"] = len(removed)
+
+        if pending or removed:
+            self._bump_version()
+            if bm25_index is None:
+                self.build_bm25_index()
+            else:
+                bm25_index.upsert(
+                    [doc_id for doc_id, _text, _meta in pending],
+                    [text for _doc_id, text, _meta in pending],
+                    [meta for _doc_id, _text, meta in pending],
                 )
+                bm25_index.delete(removed)
+                self._save_bm25_index(bm25_index)
 
-            self.collection.add(documents=documents, metadatas=metadatas, ids=ids)
+        return stats
 
-    def query(self, qstn: str = None, nresults=5) -> list[tuple[USFSDocument, float]]:
+    def query(
+        self, qstn: str | None = None, nresults=5, where: dict | None = None
+    ) -> list[tuple[USFSDocument, float]]:
         """Query the collection. Returns list of (USFSDocument, distance) tuples.
         :param qstn: The question or query text.
         :type qstn: str
         :param nresults: Number of results to return.
         :type nresults: int
+        :param where: Optional ChromaDB metadata filter.
+        :type where: dict | None
         :return: List of tuples containing USFSDocument and distance.
         """
 
         if qstn is None:
             return []
 
-        results_list = []
-        if self.collection and self.collection.count() > 0:
-            results = self.collection.query(query_texts=[qstn], n_results=nresults)
-            if results:
-                metadatas = results.get("metadatas", [[]])[0]
-                distances = results.get("distances", [[]])[0]
-                for meta, distance in zip(metadatas, distances):
-                    keywords_str = meta.get("keywords", "")
-                    doc = USFSDocument(
-                        id=meta.get("id", ""),
-                        title=meta.get("title"),
-                        abstract=meta.get("abstract"),
-                        description=meta.get("description"),
-                        purpose=meta.get("purpose"),
-                        src=meta.get("source") or meta.get("src"),
-                        keywords=keywords_str.split(",") if keywords_str else [],
-                        lineage=None,
-                    )
-                    results_list.append((doc, distance))
+        return self.query_many([qstn], nresults=nresults, where=where)[0]
+
+    def query_many(
+        self,
+        questions: list[str],
+        nresults: int = 5,
+        batch_size: int = 256,
+        where: dict | None = None,
+    ) -> list[list[tuple[USFSDocument, float]]]:
+        """
+        Query the collection with many questions at once.
+
+        Questions are embedded and searched together, one ``collection.query``
+        call per ``batch_size`` questions. Results are served from and stored
+        in ``query_cache`` when one is configured.
+
+        :param questions: The question or query texts.
+        :type questions: list[str]
+        :param nresults: Number of results to return per question.
+        :type nresults: int
+        :param batch_size: Number of questions sent per ChromaDB query.
+        :type batch_size: int
+        :param where: Optional ChromaDB metadata filter.
+        :type where: dict | None
+        :return: One list of (USFSDocument, distance) tuples per question.
+        :rtype: list[list[tuple[USFSDocument, float]]]
+        """
+
+        results_lists = [[] for _ in questions]
+        if not questions or not self.collection:
+            return results_lists
+
+        cache = self.query_cache
+        keys = []
+        pending = list(range(len(questions)))
+        if cache is not None:
+            version = self.version
+            keys = [
+                cache.make_key(qstn, nresults, "vector", version, where)
+                for qstn in questions
+            ]
+            pending = []
+            for i, key in enumerate(keys):
+                cached = cache.get(key)
+                if cached is None:
+                    pending.append(i)
+                else:
+                    results_lists[i] = [
+                        (document_from_metadata(meta), distance)
+                        for meta, distance in cached
+                    ]
+
+        # Only misses need the collection; cache hits make no ChromaDB call
+        if pending and self.collection.count() == 0:
+            return results_lists
+
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            results = self.collection.query(
+                query_texts=[questions[i] for i in batch],
+                n_results=nresults,
+                where=where,
+            )
+            if not results:
+                continue
+
+            metadatas = results.get("metadatas") or [[] for _ in batch]
+            distances = results.get("distances") or [[] for _ in batch]
+            for i, metas, dists in zip(batch, metadatas, distances):
+                results_lists[i] = [
+                    (document_from_metadata(meta), distance)
+                    for meta, distance in zip(metas, dists)
+                ]
+                if cache is not None:
+                    cache.put(keys[i], [list(pair) for pair in zip(metas, dists)])
+
+        return results_lists
+
+    async def aquery(
+        self, qstn: str | None = None, nresults=5, where: dict | None = None
+    ) -> list[tuple[USFSDocument, float]]:
+        """Async version of ``query``; embedding and search run in a thread."""
+        return await asyncio.to_thread(self.query, qstn, nresults, where)
+
+    async def aquery_many(
+        self,
+        questions: list[str],
+        nresults: int = 5,
+        batch_size: int = 256,
+        where: dict | None = None,
+    ) -> list[list[tuple[USFSDocument, float]]]:
+        """Async version of ``query_many``; embedding and search run in a thread."""
+        return await asyncio.to_thread(
+            self.query_many, questions, nresults, batch_size, where
+        )
+
+
+def document_from_metadata(meta: dict) -> USFSDocument:
+    """
+    Builds a USFSDocument from the metadata stored with a ChromaDB record.
+
+    :param meta: Metadata as written by ``ChromaVectorDB.build_record``.
+    :type meta: dict
+    :return: The document (lineage is not stored, so it is left empty).
+    :rtype: USFSDocument
+    """
 
-        return results_list
+    keywords_str = meta.get("keywords", "")
+    return USFSDocument(
+        id=meta.get("id", ""),
+        title=meta.get("title"),
+        abstract=meta.get("abstract"),
+        description=meta.get("description"),
+        purpose=meta.get("purpose"),
+        src=meta.get("source") or meta.get("src"),
+        keywords=keywords_str.split(",") if keywords_str else [],
+        lineage=None,
+    )
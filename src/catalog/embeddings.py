@@ -0,0 +1,214 @@
+"""
+Embedding functions for the ChromaDB collection, with a persistent cache.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from chromadb.api.types import (
+    DefaultEmbeddingFunction,
+    Documents,
+    EmbeddingFunction,
+    Embeddings,
+)
+
+from catalog.config import Settings
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding cache backed by SQLite.
+
+    Vectors are keyed on ``(model id, sha256 of text)`` and stored as float32
+    blobs. Every hit refreshes the entry's last-used time, and once the cache
+    grows past ``max_entries`` the least recently used entries are evicted.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = 200_000):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL,"
+            " text_hash TEXT NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (model, text_hash))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+        )
+        self._conn.commit()
+
+    def get_many(self, model: str, text_hashes: list[str]) -> dict[str, np.ndarray]:
+        """Return the cached vectors for the given text hashes (misses omitted)."""
+        found = {}
+        if not text_hashes:
+            return found
+
+        unique = list(dict.fromkeys(text_hashes))
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(unique), 500):
+                chunk = unique[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT text_hash, vector FROM embeddings"
+                    f" WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *chunk],
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ?"
+                    " WHERE model = ? AND text_hash = ?",
+                    [(now, model, text_hash) for text_hash in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, model: str, items: dict[str, np.ndarray]) -> None:
+        """Store vectors keyed by text hash, then evict down to max_entries."""
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (model, text_hash, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for text_hash, vector in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings"
+                " (model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN ("
+                    " SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """
+    Wraps a ChromaDB embedding function with an ``EmbeddingCache``.
+
+    Texts already in the cache are served from it and only the misses are
+    sent to the wrapped model, so rebuilding the collection or repeating a
+    query skips the model entirely on cache hits. The wrapper reports the
+    wrapped function's name and config, so the collection's persisted
+    configuration is unchanged.
+    """
+
+    def __init__(
+        self,
+        embedding_function: EmbeddingFunction,
+        cache: EmbeddingCache,
+        model_id: str | None = None,
+    ):
+        self.embedding_function = embedding_function
+        self.cache = cache
+        self.model_id = model_id or (
+            f"{embedding_function.name()}:"
+            f"{json.dumps(embedding_function.get_config(), sort_keys=True)}"
+        )
+        self.hits = 0
+        self.misses = 0
+        # The load pipeline embeds from several threads at once
+        self._stats_lock = threading.Lock()
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return self._embed(input, self.model_id, self.embedding_function)
+
+    def embed_query(self, input: Documents) -> Embeddings:
+        # Query embeddings may differ from document embeddings for some models
+        return self._embed(
+            input, f"{self.model_id}:query", self.embedding_function.embed_query
+        )
+
+    def _embed(self, input: Documents, model: str, embed) -> Embeddings:
+        hashes = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in input]
+        cached = self.cache.get_many(model, hashes)
+
+        missing = {}
+        for text_hash, text in zip(hashes, input):
+            if text_hash not in cached:
+                missing.setdefault(text_hash, text)
+
+        with self._stats_lock:
+            self.hits += sum(1 for text_hash in hashes if text_hash in cached)
+            self.misses += len(missing)
+
+        if missing:
+            vectors = embed(list(missing.values()))
+            computed = {
+                text_hash: np.asarray(vector, dtype=np.float32)
+                for text_hash, vector in zip(missing, vectors)
+            }
+            self.cache.put_many(model, computed)
+            cached.update(computed)
+
+        return [cached[text_hash] for text_hash in hashes]
+
+    def name(self) -> str:
+        return self.embedding_function.name()
+
+    def get_config(self) -> dict:
+        return self.embedding_function.get_config()
+
+    @staticmethod
+    def build_from_config(config: dict) -> EmbeddingFunction:
+        # Chroma calls this on every collection open to probe for legacy
+        # functions, so it must not open the cache as a side effect
+        return DefaultEmbeddingFunction()
+
+    def default_space(self):
+        return self.embedding_function.default_space()
+
+    def supported_spaces(self):
+        return self.embedding_function.supported_spaces()
+
+
+def default_embedding_function() -> EmbeddingFunction:
+    """
+    Build the embedding function used by ``ChromaVectorDB`` when none is given.
+
+    Returns ChromaDB's default model wrapped in a persistent cache configured
+    from ``Settings``; a ``max_entries`` of 0 disables the cache.
+    """
+
+    settings = Settings()
+    embedding_function = DefaultEmbeddingFunction()
+    if settings.embedding_cache_max_entries <= 0:
+        return embedding_function
+
+    cache = EmbeddingCache(
+        settings.embedding_cache_path, max_entries=settings.embedding_cache_max_entries
+    )
+    return CachedEmbeddingFunction(embedding_function, cache)
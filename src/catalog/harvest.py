@@ -0,0 +1,241 @@
+"""
+HTTP helpers shared by the USFS metadata harvesters.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "Mozilla/5.0 (compatible; FSGeodataDownloader/1.0)"
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+CHUNK_SIZE = 1024 * 1024
+
+# conditional_download results
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+
+class RateLimiter:
+    """
+    Thread-safe per-host rate limiter.
+
+    Each call to ``wait`` reserves the next free request slot for the URL's
+    host and sleeps until that slot arrives, so concurrent workers hitting
+    the same host are spaced at least ``1 / requests_per_second`` apart while
+    requests to different hosts do not block each other.
+    """
+
+    def __init__(self, requests_per_second: float = 8.0):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be greater than 0.")
+        self.interval = 1.0 / requests_per_second
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        """Block until a request to the URL's host is allowed."""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def create_session(
+    pool_size: int = 10,
+    retries: int = 3,
+    backoff_factor: float = 0.5,
+    user_agent: str = USER_AGENT,
+) -> requests.Session:
+    """
+    Create a requests Session with a pooled, retrying HTTP adapter.
+
+    :param pool_size: Number of pooled connections kept per host.
+    :param retries: Number of retries for connection errors and retryable status codes.
+    :param backoff_factor: Exponential backoff factor between retries (seconds).
+    :param user_agent: User-Agent header sent with every request.
+    :return: Configured session.
+    """
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": user_agent})
+    return session
+
+
+class DownloadManifest:
+    """
+    Records the validators of every downloaded URL in a JSON file.
+
+    Each entry stores the response ``ETag`` and ``Last-Modified`` headers,
+    the SHA-256 of the saved body, the output path, when it was last checked
+    and whether the last check found new content. Harvesters use it to send
+    conditional requests, and later stages can read ``changed()`` to find
+    out which resources were actually updated.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.entries: dict[str, dict] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def get(self, url: str) -> dict:
+        """Return the manifest entry for a URL (empty dict if unknown)."""
+        with self._lock:
+            return dict(self.entries.get(url, {}))
+
+    def conditional_headers(self, url: str, output_path: Path) -> dict:
+        """
+        Build ``If-None-Match``/``If-Modified-Since`` headers for a URL.
+
+        Headers are only sent when the previous download is still on disk,
+        otherwise a 304 would leave us without a copy.
+        """
+        entry = self.get(url)
+        if not entry or not Path(output_path).exists():
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(
+        self, url: str, output_path: Path, response: requests.Response, sha256: str
+    ) -> bool:
+        """
+        Record a full (200) download. Returns True if the content changed.
+        """
+        with self._lock:
+            previous = self.entries.get(url, {})
+            changed = previous.get("sha256") != sha256
+            self.entries[url] = {
+                "path": str(output_path),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "sha256": sha256,
+                "checked_at": _utc_now(),
+                "changed": changed,
+            }
+        return changed
+
+    def mark_unchanged(self, url: str) -> None:
+        """Record a 304 revalidation for a URL."""
+        with self._lock:
+            entry = self.entries.setdefault(url, {})
+            entry["checked_at"] = _utc_now()
+            entry["changed"] = False
+
+    def changed(self) -> list[str]:
+        """Return the URLs whose content changed on their last check."""
+        with self._lock:
+            return [url for url, entry in self.entries.items() if entry.get("changed")]
+
+    def save(self) -> None:
+        """Write the manifest to disk atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._lock, open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def conditional_download(
+    session: requests.Session,
+    url: str,
+    output_path: str | Path,
+    manifest: DownloadManifest,
+    rate_limiter: RateLimiter | None = None,
+    validate: Callable[[Path], None] | None = None,
+    timeout: float = 30,
+) -> str:
+    """
+    Download a URL to ``output_path`` unless the server reports it unchanged.
+
+    Sends the validators stored in the manifest as a conditional GET. A 304
+    leaves the existing file in place; a 200 is written to a temporary file,
+    optionally checked by ``validate`` (which should raise on bad content),
+    and then moved over the previous copy. The body is streamed to disk in
+    chunks and hashed on the fly.
+
+    :param session: Session used to perform the request.
+    :param url: URL to download.
+    :param output_path: Destination path.
+    :param manifest: Manifest holding the URL's validators.
+    :param rate_limiter: Optional per-host rate limiter.
+    :param validate: Optional callable that raises if the downloaded file is invalid.
+    :param timeout: Request timeout in seconds.
+    :return: ``UPDATED`` if content changed, otherwise ``UNCHANGED``.
+    :raises requests.RequestException: If the request fails.
+    """
+
+    output_path = Path(output_path)
+    headers = manifest.conditional_headers(url, output_path)
+
+    if rate_limiter is not None:
+        rate_limiter.wait(url)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".part")
+    try:
+        # Stream the body to disk so large feeds never sit in memory
+        with session.get(
+            url, headers=headers, timeout=timeout, stream=True
+        ) as response:
+            if response.status_code == 304:
+                manifest.mark_unchanged(url)
+                return UNCHANGED
+            response.raise_for_status()
+
+            digest = hashlib.sha256()
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+
+        if validate is not None:
+            validate(tmp_path)
+        os.replace(tmp_path, output_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    changed = manifest.record(url, output_path, response, digest.hexdigest())
+    return UPDATED if changed else UNCHANGED
+
+
+def _utc_now() -> str:
+    return datetime.now(UTC).isoformat(timespec="seconds")
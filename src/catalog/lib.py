@@ -1,5 +1,8 @@
 import json
+import re
 from pathlib import Path
+from collections.abc import Iterator
+from typing import Any, TextIO
 from bs4 import BeautifulSoup
 import hashlib
 
@@ -71,6 +74,144 @@ def load_json(file_path: str | Path) -> dict | list:
         return json.load(f)
 
 
+def iter_json_array(
+    file_path: str | Path, key: str, chunk_size: int = 65536
+) -> Iterator[Any]:
+    """
+    Iterate the items of an array member of a top-level JSON object without
+    loading the whole file.
+
+    The file is read in chunks and each array item is decoded on its own, so
+    peak memory is bounded by the largest single item rather than the file
+    size. The rest of the document is still parsed, so malformed JSON raises
+    ``json.JSONDecodeError`` just like ``json.load``.
+
+    Args:
+        file_path: Path to the JSON file to read
+        key: Name of the top-level member holding the array
+        chunk_size: Number of characters to read at a time (default: 65536)
+
+    Yields:
+        Each item of the array, in order. Nothing is yielded if the member is
+        missing or is not an array.
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+
+    Example:
+        >>> for item in iter_json_array("data/usfs/gdd/gdd_metadata.json", "dataset"):
+        ...     print(item["title"])
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        stream = _JSONStream(f, chunk_size)
+
+        stream.expect("{")
+        if stream.peek() == "}":
+            stream.advance()
+            return
+
+        while True:
+            member = stream.decode()
+            if not isinstance(member, str):
+                raise stream.error("Expecting property name enclosed in double quotes")
+            stream.expect(":")
+
+            if member == key and stream.peek() == "[":
+                stream.advance()
+                if stream.peek() == "]":
+                    stream.advance()
+                else:
+                    while True:
+                        yield stream.decode()
+                        if stream.peek() == "]":
+                            stream.advance()
+                            break
+                        stream.expect(",")
+            elif member == key:
+                value = stream.decode()
+                if isinstance(value, list):
+                    yield from value
+            else:
+                stream.decode()
+
+            if stream.peek() == "}":
+                stream.advance()
+                break
+            stream.expect(",")
+
+        if stream.peek() != "":
+            raise stream.error("Extra data")
+
+
+_NUMBER_START = frozenset("-0123456789")
+_NUMBER_END = re.compile(r"[^0-9eE+\-.]")
+
+
+class _JSONStream:
+    """Chunked reader that decodes one JSON value at a time."""
+
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> bool:
+        """Read more data into the buffer. Returns False at end of file."""
+        if self.eof:
+            return False
+        if self.pos > self.chunk_size:
+            self.buffer = self.buffer[self.pos :]
+            self.pos = 0
+        data = self.f.read(size)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer += data
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of file)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill(self.chunk_size):
+                return self.buffer[self.pos : self.pos + 1]
+
+    def advance(self) -> None:
+        self.pos += 1
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self.error(f"Expecting '{char}' delimiter")
+        self.advance()
+
+    def decode(self) -> Any:
+        """Decode the next complete JSON value, reading more data as needed."""
+        if self.peek() in _NUMBER_START:
+            # A number is only complete once a non-number character follows
+            while not _NUMBER_END.search(self.buffer, self.pos) and self._fill(
+                self.chunk_size
+            ):
+                pass
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Grow reads with the pending value so retries stay linear
+                if self._fill(max(self.chunk_size, len(self.buffer) - self.pos)):
+                    continue
+                raise
+            self.pos = end
+            return value
+
+    def error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self.buffer, self.pos)
+
+
 def clean_str(text: str) -> str:
     """
     Cleans the input text by removing HTML tags and extra whitespace.
@@ -97,6 +238,10 @@ def strip_html(text: str) -> str:
         String with HTML tags removed.
     """
 
+    # Plain text has nothing to strip; skip building a parse tree
+    if "<" not in text and "&" not in text:
+        return text
+
     soup = BeautifulSoup(text, "html.parser")
     stripped_text = soup.get_text()
 
@@ -108,6 +253,15 @@ def hash_string(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
 
+def hash_file(file_path: str | Path, chunk_size: int = 1024 * 1024) -> str:
+    """Generate a SHA-256 hash of a file's contents, reading it in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def dedupe_catalog(file_path: str | Path) -> None:
     """Remove duplicate entries from a catalog JSON file based on the 'id' field.
 
@@ -1,42 +1,210 @@
-from rank_bm25 import BM25Okapi
-from catalog.core import ChromaVectorDB
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from catalog.bm25 import BM25Index, BM25Matrix
+from catalog.core import ChromaVectorDB, document_from_metadata
 from catalog.schema import USFSDocument
 
+logger = logging.getLogger("catalog")
+
+
+def fuse_result_lists(
+    result_lists: list[list[tuple[USFSDocument, float]]],
+    nresults: int = 5,
+    k_constant: int = 60,
+) -> list[tuple[USFSDocument, float]]:
+    """
+    Fuse ranked result lists, e.g. one per phrasing of a question, with RRF.
+
+    :param result_lists: Lists of (USFSDocument, score) tuples, best first.
+    :param nresults: Number of fused results to return.
+    :param k_constant: RRF rank constant.
+    :return: (USFSDocument, rrf_score) tuples sorted by score descending.
+    """
+    docs: dict[str, USFSDocument] = {}
+    rrf_scores: dict[str, float] = {}
+    for results in result_lists:
+        for rank, (doc, _score) in enumerate(results):
+            docs.setdefault(doc.id, doc)
+            rrf_scores[doc.id] = rrf_scores.get(doc.id, 0.0) + 1.0 / (
+                k_constant + rank + 1
+            )
+
+    fused = sorted(rrf_scores.items(), key=lambda x: x[1], reverse=True)
+    return [(docs[doc_id], score) for doc_id, score in fused[:nresults]]
+
+
+def multi_query(
+    qstn: str,
+    expand: Callable[[str], list[str]],
+    search_many: Callable[..., list[list[tuple[USFSDocument, float]]]],
+    nresults: int = 5,
+    expansion_timeout: float | None = 15.0,
+) -> tuple[list[tuple[USFSDocument, float]], list[str]]:
+    """
+    Search a question and its LLM rephrasings, hiding the expansion latency.
+
+    Retrieval for the raw question starts while ``expand`` is still writing
+    alternative phrasings; the alternatives are then searched in one batch
+    and every result list is fused with RRF. If the expansion fails or takes
+    longer than ``expansion_timeout`` seconds, the raw results are returned.
+
+    :param qstn: The question as asked.
+    :param expand: Returns alternative phrasings of a question.
+    :param search_many: Batch search such as ``HybridSearch.query_many``.
+    :param nresults: Number of results to return.
+    :param expansion_timeout: Seconds to wait for the expansion (None: no limit).
+    :return: (USFSDocument, score) tuples, RRF scores when fused, and the
+        alternative phrasings that were searched (empty on fallback).
+    """
+    depth = nresults * 2
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query-expansion")
+    try:
+        expansion = pool.submit(expand, qstn)
+        raw = search_many([qstn], nresults=depth)[0]
+        try:
+            alternatives = list(expansion.result(timeout=expansion_timeout))
+        except TimeoutError:
+            logger.warning("Query expansion timed out, using the raw query only")
+            return raw[:nresults], []
+        except Exception:
+            logger.exception("Query expansion failed, using the raw query only")
+            return raw[:nresults], []
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    if not alternatives:
+        return raw[:nresults], []
+    expanded = search_many(alternatives, nresults=depth)
+    return fuse_result_lists([raw, *expanded], nresults=nresults), alternatives
+
 
 class HybridSearch:
     """Combines BM25 keyword search with ChromaDB vector search using Reciprocal Rank Fusion."""
 
-    def __init__(self, vector_db: ChromaVectorDB):
+    BM25_BACKENDS = ("postings", "matrix")
+
+    def __init__(
+        self,
+        vector_db: ChromaVectorDB,
+        bm25_backend: str = "postings",
+        vector_timeout: float | None = 30.0,
+        bm25_timeout: float | None = 5.0,
+    ):
+        """
+        :param vector_db: The vector store to search.
+        :param bm25_backend: ``"postings"`` scores each query over the postings
+            of its terms; ``"matrix"`` precomputes every BM25 weight and scores
+            queries as a sparse matrix product, which suits batches of queries.
+        :param vector_timeout: Seconds to wait for vector results (None: no limit).
+        :param bm25_timeout: Seconds to wait for BM25 results (None: no limit).
+        """
+        if bm25_backend not in self.BM25_BACKENDS:
+            raise ValueError(
+                f"Unknown BM25 backend {bm25_backend!r}, "
+                f"expected one of {', '.join(self.BM25_BACKENDS)}."
+            )
+
         self.vector_db = vector_db
-        self.bm25 = None
-        self.doc_texts = []
-        self.doc_ids = []
-        self._build_bm25_index()
-
-    def _build_bm25_index(self):
-        """Build BM25 index from documents already stored in ChromaDB."""
-        collection = self.vector_db.collection
-        if collection.count() == 0:
-            return
+        self.bm25_backend = bm25_backend
+        self.vector_timeout = vector_timeout
+        self.bm25_timeout = bm25_timeout
+        self.bm25: BM25Index | BM25Matrix | None = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="hybrid-search"
+        )
+        self._load_bm25_index()
+
+    def close(self) -> None:
+        """Shut down the retriever pool; searches still running finish."""
+        self._executor.shutdown(wait=False)
 
-        all_docs = collection.get(include=["documents", "metadatas"])
-        self.doc_ids = all_docs["ids"]
-        self.doc_texts = all_docs["documents"]
+    def _load_bm25_index(self):
+        """Load the saved BM25 index, rebuilding it from ChromaDB if stale."""
+        if self.vector_db.collection.count() == 0:
+            return
 
-        tokenized = [doc.lower().split() for doc in self.doc_texts]
-        self.bm25 = BM25Okapi(tokenized)
+        index = self.vector_db.load_bm25_index()
+        if index is None:
+            index = self.vector_db.build_bm25_index()
+        self.bm25 = BM25Matrix(index) if self.bm25_backend == "matrix" else index
 
-    def _bm25_search(self, query: str, k: int) -> list[tuple[str, float]]:
-        """Return top-k (doc_id, score) pairs from BM25."""
+    def _bm25_search(
+        self, query: str, k: int, with_metadata: bool = False
+    ) -> list[tuple]:
+        """Return top-k (doc_id, score) pairs (or triples with metadata) from BM25."""
         if self.bm25 is None:
             return []
 
-        tokenized_query = query.lower().split()
-        scores = self.bm25.get_scores(tokenized_query)
+        return self.bm25.search(query, k, with_metadata=with_metadata)
+
+    def _bm25_search_many(
+        self, queries: list[str], k: int, with_metadata: bool = False
+    ) -> list[list[tuple]]:
+        """Return top-k BM25 hits for each query, scored as one batch."""
+        if self.bm25 is None:
+            return [[] for _ in queries]
+
+        return self.bm25.search_batch(queries, k, with_metadata=with_metadata)
+
+    def _submit_timed(self, fn, *args, **kwargs) -> tuple[Future, dict]:
+        """Submit work to the pool, recording when it starts running."""
+        started: dict = {"event": threading.Event(), "at": None}
 
-        scored_ids = list(zip(self.doc_ids, scores))
-        scored_ids.sort(key=lambda x: x[1], reverse=True)
-        return scored_ids[:k]
+        def run():
+            started["at"] = time.monotonic()
+            started["event"].set()
+            return fn(*args, **kwargs)
+
+        return self._executor.submit(run), started
+
+    def _retrieve(self, questions: list[str], k: int) -> tuple[list, list, bool]:
+        """
+        Run the vector and BM25 retrievers concurrently for a batch of questions.
+
+        Each retriever gets its own timeout, measured from when it starts
+        running on the shared pool, so time spent queued behind concurrent
+        searches isn't counted against it. A retriever also gets up to its
+        timeout to leave the queue; one that doesn't is cancelled. A
+        retriever that times out is logged and contributes no results.
+        Errors raised by a retriever propagate.
+
+        :return: Per-question vector results, per-question BM25 hits and
+            whether both retrievers finished in time.
+        """
+
+        vector_future, vector_started = self._submit_timed(
+            self.vector_db.query_many, questions, nresults=k
+        )
+        bm25_future, bm25_started = self._submit_timed(
+            self._bm25_search_many, questions, k, with_metadata=True
+        )
+
+        results = []
+        complete = True
+        for name, future, started, timeout in (
+            ("vector", vector_future, vector_started, self.vector_timeout),
+            ("bm25", bm25_future, bm25_started, self.bm25_timeout),
+        ):
+            try:
+                remaining = None
+                if timeout is not None:
+                    # Still queued after its timeout: drop it rather than
+                    # leave it to occupy a worker once this search is over
+                    if not started["event"].wait(timeout) and future.cancel():
+                        raise TimeoutError
+                    started["event"].wait()
+                    remaining = max(0.0, started["at"] + timeout - time.monotonic())
+                results.append(future.result(timeout=remaining))
+            except TimeoutError:
+                logger.warning(f"Hybrid search: {name} retriever timed out")
+                results.append([[] for _ in questions])
+                complete = False
+        return results[0], results[1], complete
 
     def _rrf(
         self,
@@ -70,41 +238,125 @@ class HybridSearch:
         if not qstn:
             return []
 
-        retrieve_k = nresults * 3
+        return self.query_many([qstn], nresults=nresults)[0]
 
-        vector_results = self.vector_db.query(qstn=qstn, nresults=retrieve_k)
-        bm25_results = self._bm25_search(qstn, k=retrieve_k)
+    def query_many(
+        self, questions: list[str], nresults: int = 5, batch_size: int = 256
+    ) -> list[list[tuple[USFSDocument, float]]]:
+        """Run hybrid search for many questions at once.
 
-        fused = self._rrf(vector_results, bm25_results)
-        top_ids = [doc_id for doc_id, _score in fused[:nresults]]
-        top_scores = {doc_id: score for doc_id, score in fused[:nresults]}
+        Each batch of questions is embedded and searched with one vector
+        query and scored with one BM25 batch, then fused per question. The
+        retriever timeouts apply to each batch. Results are served from and
+        stored in the vector store's ``query_cache`` when one is configured;
+        results degraded by a retriever timeout are not cached.
 
-        # Build USFSDocument objects from ChromaDB metadata
-        collection_data = self.vector_db.collection.get(
-            ids=top_ids, include=["metadatas"]
-        )
+        :param questions: The query texts.
+        :param nresults: Number of results to return per question.
+        :param batch_size: Number of questions retrieved together.
+        :return: One list of (USFSDocument, rrf_score) tuples per question.
+        """
+        results: list[list[tuple[USFSDocument, float]]] = [[] for _ in questions]
+        asked = [i for i, qstn in enumerate(questions) if qstn]
+        retrieve_k = nresults * 3
 
-        meta_by_id = {}
-        for doc_id, meta in zip(collection_data["ids"], collection_data["metadatas"]):
-            meta_by_id[doc_id] = meta
+        cache = self.vector_db.query_cache
+        keys = {}
+        if cache is not None:
+            version = self.vector_db.version
+            pending = []
+            for i in asked:
+                keys[i] = cache.make_key(questions[i], nresults, "hybrid", version)
+                cached = cache.get(keys[i])
+                if cached is None:
+                    pending.append(i)
+                else:
+                    results[i] = [
+                        (USFSDocument.model_validate(doc), score)
+                        for doc, score in cached
+                    ]
+            asked = pending
 
-        results = []
-        for doc_id in top_ids:
-            meta = meta_by_id.get(doc_id)
-            if meta is None:
-                continue
-
-            keywords_str = meta.get("keywords", "")
-            doc = USFSDocument(
-                id=meta.get("id", ""),
-                title=meta.get("title"),
-                abstract=meta.get("abstract"),
-                description=meta.get("description"),
-                purpose=meta.get("purpose"),
-                src=meta.get("source") or meta.get("src"),
-                keywords=keywords_str.split(",") if keywords_str else [],
-                lineage=None,
+        for start in range(0, len(asked), batch_size):
+            batch = asked[start : start + batch_size]
+            vector_batch, bm25_batch, complete = self._retrieve(
+                [questions[i] for i in batch], retrieve_k
             )
-            results.append((doc, top_scores[doc_id]))
+
+            fused_batch = []
+            docs_by_id: dict[str, USFSDocument] = {}
+            for vector_results, bm25_hits in zip(vector_batch, bm25_batch):
+                bm25_results = [(doc_id, score) for doc_id, score, _meta in bm25_hits]
+                fused_batch.append(self._rrf(vector_results, bm25_results)[:nresults])
+
+                # Hydrate from what the retrievers returned: vector hits are
+                # already documents and BM25 hits carry their stored metadata
+                for doc, _distance in vector_results:
+                    docs_by_id.setdefault(doc.id, doc)
+                for doc_id, _score, meta in bm25_hits:
+                    if doc_id not in docs_by_id and meta is not None:
+                        docs_by_id[doc_id] = document_from_metadata(meta)
+
+            # Only an index saved without metadata leaves ids to fetch
+            missing = {
+                doc_id
+                for fused in fused_batch
+                for doc_id, _score in fused
+                if doc_id not in docs_by_id
+            }
+            if missing:
+                collection_data = self.vector_db.collection.get(
+                    ids=sorted(missing), include=["metadatas"]
+                )
+                for doc_id, meta in zip(
+                    collection_data["ids"], collection_data["metadatas"]
+                ):
+                    docs_by_id[doc_id] = document_from_metadata(meta)
+
+            for i, fused in zip(batch, fused_batch):
+                results[i] = [
+                    (docs_by_id[doc_id], score)
+                    for doc_id, score in fused
+                    if doc_id in docs_by_id
+                ]
+                if cache is not None and complete:
+                    cache.put(
+                        keys[i],
+                        [
+                            [doc.model_dump(mode="json"), score]
+                            for doc, score in results[i]
+                        ],
+                    )
 
         return results
+
+    def query_expanded(
+        self,
+        qstn: str,
+        expand: Callable[[str], list[str]],
+        nresults: int = 5,
+        expansion_timeout: float | None = 15.0,
+    ) -> tuple[list[tuple[USFSDocument, float]], list[str]]:
+        """Run ``multi_query`` with hybrid search; see there for details."""
+        if not qstn:
+            return [], []
+
+        return multi_query(
+            qstn,
+            expand,
+            self.query_many,
+            nresults=nresults,
+            expansion_timeout=expansion_timeout,
+        )
+
+    async def aquery(
+        self, qstn: str, nresults: int = 5
+    ) -> list[tuple[USFSDocument, float]]:
+        """Async version of ``query``; retrieval and fusion run in a thread."""
+        return await asyncio.to_thread(self.query, qstn, nresults)
+
+    async def aquery_many(
+        self, questions: list[str], nresults: int = 5, batch_size: int = 256
+    ) -> list[list[tuple[USFSDocument, float]]]:
+        """Async version of ``query_many``; retrieval and fusion run in a thread."""
+        return await asyncio.to_thread(self.query_many, questions, nresults, batch_size)
@@ -0,0 +1,297 @@
+"""
+Local HTTP query server that keeps the vector store and BM25 index warm.
+
+The server answers JSON requests on a handful of routes:
+
+- ``GET /health``: status, collection version and query cache stats.
+- ``POST /query``: ``{"query", "nresults", "mode", "source"}``.
+- ``POST /query_many``: ``{"queries", "nresults", "mode", "source"}``.
+- ``GET /documents/<id>``: a single document.
+- ``POST /reload``: reopen the collection and reload the BM25 index.
+
+``mode`` is ``"hybrid"`` or ``"vector"``; ``source`` restricts a vector
+search to one metadata source. ``CatalogClient`` wraps these routes and
+returns the same ``(USFSDocument, score)`` tuples as the in-process search.
+"""
+
+import json
+import logging
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+from urllib.parse import unquote
+
+import requests
+
+from catalog.schema import USFSDocument
+
+if TYPE_CHECKING:
+    from catalog.core import ChromaVectorDB
+    from catalog.search import HybridSearch
+
+logger = logging.getLogger("catalog")
+
+MODES = ("hybrid", "vector")
+
+
+class RequestError(Exception):
+    """A client error, answered with a 4xx status and a JSON message."""
+
+    def __init__(self, message: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+class ServerError(Exception):
+    """Raised by ``CatalogClient`` when the server is unreachable or fails."""
+
+
+class CatalogServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server holding a warm ``ChromaVectorDB`` and ``HybridSearch``.
+
+    The ChromaDB client, embedding model, BM25 index and query cache are
+    created once and shared by every request thread.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        vector_db: "ChromaVectorDB",
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        bm25_backend: str = "postings",
+    ):
+        self.vector_db = vector_db
+        self.bm25_backend = bm25_backend
+        self.hybrid = self._hybrid_search()
+        super().__init__((host, port), CatalogRequestHandler)
+
+    def _hybrid_search(self) -> "HybridSearch":
+        # Imported here so that CatalogClient doesn't pull in chromadb
+        from catalog.search import HybridSearch
+
+        return HybridSearch(vector_db=self.vector_db, bm25_backend=self.bm25_backend)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reload(self) -> None:
+        """Reopen the collection and reload the BM25 index after a rebuild."""
+        self.vector_db.collection = self.vector_db._get_collection(
+            self.vector_db.collection.name
+        )
+        previous, self.hybrid = self.hybrid, self._hybrid_search()
+        previous.close()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.hybrid.close()
+
+    def search(
+        self,
+        questions: list[str],
+        nresults: int = 5,
+        mode: str = "hybrid",
+        source: str | None = None,
+    ) -> list[list[tuple[USFSDocument, float]]]:
+        """Run a batch of searches with the warm indexes."""
+        if source is not None:
+            return self.vector_db.query_many(
+                questions, nresults=nresults, where={"source": source}
+            )
+        if mode == "hybrid":
+            return self.hybrid.query_many(questions, nresults=nresults)
+        return self.vector_db.query_many(questions, nresults=nresults)
+
+    def document(self, doc_id: str) -> USFSDocument | None:
+        """Return a single document by id, or None if it is not in the store."""
+        from catalog.core import document_from_metadata
+
+        raw = self.vector_db.collection.get(ids=[doc_id], include=["metadatas"])
+        if not raw["ids"]:
+            return None
+        return document_from_metadata(raw["metadatas"][0])
+
+
+class CatalogRequestHandler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the ``CatalogServer``."""
+
+    server: CatalogServer
+
+    def do_GET(self) -> None:
+        self._handle(self._get)
+
+    def do_POST(self) -> None:
+        self._handle(self._post)
+
+    def _get(self) -> dict:
+        if self.path == "/health":
+            return {
+                "status": "ok",
+                "version": self.server.vector_db.version,
+                "cache": (
+                    self.server.vector_db.query_cache.stats
+                    if self.server.vector_db.query_cache is not None
+                    else None
+                ),
+            }
+        if self.path.startswith("/documents/"):
+            doc_id = unquote(self.path.removeprefix("/documents/"))
+            doc = self.server.document(doc_id)
+            if doc is None:
+                raise RequestError(
+                    f"No document found with ID: {doc_id}", HTTPStatus.NOT_FOUND
+                )
+            return {"document": doc.model_dump(mode="json")}
+        raise RequestError(f"Unknown route: {self.path}", HTTPStatus.NOT_FOUND)
+
+    def _post(self) -> dict:
+        if self.path == "/reload":
+            self.server.reload()
+            return {"status": "ok", "version": self.server.vector_db.version}
+
+        if self.path not in ("/query", "/query_many"):
+            raise RequestError(f"Unknown route: {self.path}", HTTPStatus.NOT_FOUND)
+
+        body = self._read_json()
+        if self.path == "/query":
+            questions = [body.get("query")]
+        else:
+            questions = body.get("queries")
+            if not isinstance(questions, list):
+                raise RequestError('"queries" must be a list of strings.')
+        if not all(isinstance(qstn, str) for qstn in questions):
+            raise RequestError("Queries must be strings.")
+
+        nresults = body.get("nresults", 5)
+        if not isinstance(nresults, int) or nresults < 1:
+            raise RequestError('"nresults" must be a positive integer.')
+        mode = body.get("mode", "hybrid")
+        if mode not in MODES:
+            raise RequestError(f'"mode" must be one of {", ".join(MODES)}.')
+
+        results = [
+            [
+                {"document": doc.model_dump(mode="json"), "score": score}
+                for doc, score in resp
+            ]
+            for resp in self.server.search(
+                questions, nresults=nresults, mode=mode, source=body.get("source")
+            )
+        ]
+        if self.path == "/query":
+            return {"results": results[0]}
+        return {"results": results}
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            raise RequestError(f"Invalid JSON: {e.msg}.")
+        if not isinstance(body, dict):
+            raise RequestError("Request body must be a JSON object.")
+        return body
+
+    def _handle(self, route) -> None:
+        try:
+            status, payload = HTTPStatus.OK, route()
+        except RequestError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            logger.exception(f"Error handling {self.command} {self.path}")
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.info(f"{self.address_string()} {format % args}")
+
+
+class CatalogClient:
+    """Client for a running ``catalog serve`` server."""
+
+    def __init__(self, url: str, timeout: float | None = 60.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _request(self, method: str, path: str, **kwargs) -> dict:
+        try:
+            response = self.session.request(
+                method, f"{self.url}{path}", timeout=self.timeout, **kwargs
+            )
+        except requests.RequestException as e:
+            raise ServerError(f"Could not reach catalog server at {self.url}: {e}")
+        if response.status_code == HTTPStatus.NOT_FOUND and path.startswith(
+            "/documents/"
+        ):
+            return {}
+        if not response.ok:
+            try:
+                message = response.json()["error"]
+            except (ValueError, KeyError):
+                message = response.text
+            raise ServerError(
+                f"Catalog server error ({response.status_code}): {message}"
+            )
+        return response.json()
+
+    @staticmethod
+    def _results(items: list[dict]) -> list[tuple[USFSDocument, float]]:
+        return [
+            (USFSDocument.model_validate(item["document"]), item["score"])
+            for item in items
+        ]
+
+    def health(self) -> dict:
+        return self._request("GET", "/health")
+
+    def query(
+        self,
+        qstn: str,
+        nresults: int = 5,
+        mode: str = "hybrid",
+        source: str | None = None,
+    ) -> list[tuple[USFSDocument, float]]:
+        """Run one search on the server. Returns (USFSDocument, score) tuples."""
+        body = {"query": qstn, "nresults": nresults, "mode": mode, "source": source}
+        return self._results(self._request("POST", "/query", json=body)["results"])
+
+    def query_many(
+        self,
+        questions: list[str],
+        nresults: int = 5,
+        mode: str = "hybrid",
+        source: str | None = None,
+    ) -> list[list[tuple[USFSDocument, float]]]:
+        """Run a batch of searches on the server in one request."""
+        body = {
+            "queries": questions,
+            "nresults": nresults,
+            "mode": mode,
+            "source": source,
+        }
+        response = self._request("POST", "/query_many", json=body)
+        return [self._results(items) for items in response["results"]]
+
+    def document(self, doc_id: str) -> USFSDocument | None:
+        """Return a single document by id, or None if it is not in the store."""
+        response = self._request(
+            "GET", f"/documents/{requests.utils.quote(doc_id, safe='')}"
+        )
+        if not response:
+            return None
+        return USFSDocument.model_validate(response["document"])
+
+    def reload(self) -> dict:
+        return self._request("POST", "/reload")
@@ -1,8 +1,12 @@
 """Tool definitions and executors for agentic search."""
 
-from catalog.core import ChromaVectorDB
+from typing import TYPE_CHECKING
+
 from catalog.schema import USFSDocument
 
+if TYPE_CHECKING:
+    from catalog.core import ChromaVectorDB
+
 TOOLS = [
     {
         "type": "function",
@@ -98,26 +102,10 @@ TOOLS = [
 def _format_results(results: list[tuple[USFSDocument, float]]) -> str:
     if not results:
         return "No results found."
-    return "\n\n---\n\n".join(
-        doc.to_markdown(distance=score) for doc, score in results
-    )
-
+    return "\n\n---\n\n".join(doc.to_markdown(distance=score) for doc, score in results)
 
-def _meta_to_doc(meta: dict) -> USFSDocument:
-    keywords_str = meta.get("keywords", "")
-    return USFSDocument(
-        id=meta.get("id", ""),
-        title=meta.get("title"),
-        abstract=meta.get("abstract"),
-        description=meta.get("description"),
-        purpose=meta.get("purpose"),
-        src=meta.get("source") or meta.get("src"),
-        keywords=keywords_str.split(",") if keywords_str else [],
-        lineage=None,
-    )
 
-
-def execute_tool(name: str, args: dict, db: ChromaVectorDB, hs) -> str:
+def execute_tool(name: str, args: dict, db: "ChromaVectorDB", hs) -> str:
     """Route a tool call to the appropriate executor and return result as a string."""
 
     if name == "search_vector_db":
@@ -130,14 +118,11 @@ def execute_tool(name: str, args: dict, db: ChromaVectorDB, hs) -> str:
 
     if name == "filter_by_source":
         try:
-            raw = db.collection.query(
-                query_texts=[args["query"]],
-                n_results=args.get("n_results", 5),
+            results = db.query(
+                qstn=args["query"],
+                nresults=args.get("n_results", 5),
                 where={"source": args["source"]},
             )
-            metadatas = raw.get("metadatas", [[]])[0]
-            distances = raw.get("distances", [[]])[0]
-            results = [(_meta_to_doc(m), d) for m, d in zip(metadatas, distances)]
             return _format_results(results)
         except Exception as e:
             return f"Error filtering by source: {e}"
@@ -149,7 +134,10 @@ def execute_tool(name: str, args: dict, db: ChromaVectorDB, hs) -> str:
             )
             if not raw["ids"]:
                 return f"No document found with ID: {args['doc_id']}"
-            doc = _meta_to_doc(raw["metadatas"][0])
+            # catalog.core pulls in chromadb, so it's imported only when used
+            from catalog.core import document_from_metadata
+
+            doc = document_from_metadata(raw["metadatas"][0])
             return doc.to_markdown()
         except Exception as e:
             return f"Error retrieving document: {e}"
@@ -1,12 +1,35 @@
 from pathlib import Path
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
 from urllib.parse import urljoin
-import time
-from catalog.lib import clean_str, hash_string, save_json
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    TextColumn,
+    TimeElapsedColumn,
+)
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from catalog.harvest import (
+    UPDATED,
+    DownloadManifest,
+    RateLimiter,
+    conditional_download,
+    create_session,
+)
+from catalog.lib import (
+    clean_str,
+    hash_file,
+    hash_string,
+    iter_json_array,
+    load_json,
+    save_json,
+)
 import os
 import json
 import logging
+import time
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -14,53 +37,113 @@ logging.basicConfig(
 logger = logging.getLogger("catalog")
 
 DATA_DIR = "./data/usfs"
+MANIFEST_FILE = "manifest.json"
+BUILD_CACHE_FILE = "build_cache.json"
 
 
 class USFS:
     def __init__(self, output_dir: str = DATA_DIR) -> None:
         self.output_dir = Path(output_dir)
 
-    def build_chromadb(self) -> None:
-        """Build ChromaDB vector store from USFS catalog"""
+    def build_chromadb(
+        self, sync: bool = False, workers: int | None = None, batch_size: int = 100
+    ) -> None:
+        """Build ChromaDB vector store from USFS catalog
+
+        :param sync: Only upsert changed documents and delete removed ones
+            instead of rebuilding the whole collection.
+        :param workers: Number of embedding threads used for a full rebuild.
+        :param batch_size: Number of documents embedded and written per batch.
+        """
 
-        print("Building USFS ChromaDB vector store...")
         from catalog.core import ChromaVectorDB
 
         db = ChromaVectorDB()
-        db.batch_load_documents()
+        if sync:
+            print("Syncing USFS ChromaDB vector store...")
+            stats = db.sync_documents(batch_size=batch_size)
+            print(
+                f"Added {stats['added']}, updated {stats['updated']}, "
+                f"deleted {stats['deleted']}, unchanged {stats['unchanged']}"
+            )
+        else:
+            print("Building USFS ChromaDB vector store...")
+            with Progress(
+                TextColumn("Embedding"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                TextColumn("{task.fields[rate]:.1f} docs/s"),
+                TimeElapsedColumn(),
+            ) as bar:
+                task = bar.add_task("embed", total=None, rate=0.0)
+                started = time.perf_counter()
+
+                def progress(written: int, total: int) -> None:
+                    rate = written / max(time.perf_counter() - started, 1e-9)
+                    bar.update(task, completed=written, total=total, rate=rate)
+
+                stats = db.batch_load_documents(
+                    batch_size=batch_size, workers=workers, progress=progress
+                )
+            print(
+                f"Loaded {stats['documents']} docs in {stats['seconds']:.1f}s "
+                f"({stats['docs_per_second']:.1f} docs/s)"
+            )
+
+    def build_catalog(
+        self, format: str = "json", workers: int = 1, incremental: bool = False
+    ):
+        """Build the USFS catalog from the downloaded metadata.
 
-    def build_catalog(self, format: str = "json"):
+        A build cache of source file fingerprints and parsed documents is
+        written on every build. With ``incremental`` the cache is used to
+        re-parse only the source files and feed records that changed since
+        the previous build.
+
+        :param format: Output format of the catalog.
+        :param workers: Number of processes used to parse the FSGeodata XML.
+        :param incremental: Reuse unchanged documents from the previous build.
+        """
         print("Building USFS catalog...")
+        cache = CatalogBuildCache(self.output_dir / BUILD_CACHE_FILE, reuse=incremental)
         fsgeodata = FSGeodataLoader()
         gdd = GeospatialDataDiscovery()
         rda = RDALoader()
 
-        fsgeo_docs = fsgeodata.parse_metadata()
-        gdd_docs = gdd.parse_metadata()
-        rda_docs = rda.parse_metadata()
+        fsgeo_docs = fsgeodata.parse_metadata(workers=workers, cache=cache)
+        gdd_docs = gdd.parse_metadata(cache=cache)
+        rda_docs = rda.parse_metadata(cache=cache)
         documents = fsgeo_docs + rda_docs + gdd_docs
 
         print(f"USFS Catalog Docs: {len(documents)}")
+        if incremental:
+            print(
+                f"Reused {cache.stats['reused']} cached docs, "
+                f"parsed {cache.stats['parsed']}"
+            )
 
         if format == "json":
             save_json(documents, "./data/usfs/catalog.json")
+        cache.save()
 
-    def download_metadata(self) -> None:
+    def download_metadata(self, workers: int = 8) -> None:
         """Download USFS metadata files."""
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        self.download_fsgeodata()
+        self.download_fsgeodata(workers=workers)
         self.download_rda()
         self.download_gdd()
 
-    def download_fsgeodata(self) -> None:
+    def download_fsgeodata(self, workers: int = 8) -> None:
         """
         Handles downloading of FSGeoData metadata
         """
 
         print("Downloading FSGeoData metadata...")
-        fsgeodata = FSGeodataLoader(data_dir=self.output_dir / "fsgeodata")
+        fsgeodata = FSGeodataLoader(
+            data_dir=self.output_dir / "fsgeodata", max_workers=workers
+        )
         fsgeodata.download_all()
 
     def download_rda(self) -> None:
@@ -90,24 +173,39 @@ class FSGeodataLoader:
 
     DATASETS_URL = f"{BASE_URL}/geodata/edw/datasets.php"
 
-    def __init__(self, data_dir="data/usfs/fsgeodata"):
-        """Initialize downloader with data directory"""
+    def __init__(
+        self,
+        data_dir="data/usfs/fsgeodata",
+        max_workers: int = 8,
+        requests_per_second: float = 8.0,
+        retries: int = 3,
+    ):
+        """Initialize downloader with data directory
+
+        args:
+            data_dir: Directory to store metadata and service files
+            max_workers: Number of concurrent download workers
+            requests_per_second: Maximum request rate per host
+            retries: Number of retries (with exponential backoff) per request
+        """
         self.data_dir = Path(data_dir)
         self.metadata_dir = self.data_dir / "metadata"
         self.services_dir = self.data_dir / "services"
+        self.max_workers = max(1, max_workers)
 
         # Create directories
         self.metadata_dir.mkdir(parents=True, exist_ok=True)
         self.services_dir.mkdir(parents=True, exist_ok=True)
 
-        self.session = requests.Session()
-        self.session.headers.update(
-            {"User-Agent": "Mozilla/5.0 (compatible; FSGeodataDownloader/1.0)"}
-        )
+        # Pool enough connections for every worker to keep one open per host
+        self.session = create_session(pool_size=self.max_workers, retries=retries)
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.manifest = DownloadManifest(self.data_dir / MANIFEST_FILE)
 
     def fetch_datasets_page(self):
         """Fetch the main datasets page"""
-        response = self.session.get(self.DATASETS_URL)
+        self.rate_limiter.wait(self.DATASETS_URL)
+        response = self.session.get(self.DATASETS_URL, timeout=30)
         response.raise_for_status()
         return response.text
 
@@ -148,45 +246,77 @@ class FSGeodataLoader:
 
     def download_file(
         self, url: str, output_path: Path, description: str = "file"
-    ) -> bool:
+    ) -> str | None:
         """Download a file from URL to output_path
 
+        A conditional GET is sent when the manifest holds validators for the
+        URL, so unchanged files cost a 304 instead of a full body.
+
         args:
             url (str): URL to download
             output_path (Path): Path to save the downloaded file
             description (str): Description of the file being downloaded
         returns:
-            bool: True if download succeeded, False otherwise
+            str | None: UPDATED or UNCHANGED if the download succeeded, None otherwise
         """
 
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            with open(output_path, "wb") as f:
-                f.write(response.content)
-        except Exception as e:
+            return conditional_download(
+                self.session,
+                url,
+                output_path,
+                self.manifest,
+                rate_limiter=self.rate_limiter,
+            )
+        except (requests.exceptions.RequestException, OSError) as e:
             logger.error(f"Failed to download {description} from {url}: {e}")
-            return False
+            return None
 
-        return True
-
-    def download_service_info(self, url: str, output_path: Path) -> bool:
+    def download_service_info(self, url: str, output_path: Path) -> str | None:
         """Download service info (JSON format)"""
 
-        json_url = f"{url}?f=json"
-        try:
-            response = self.session.get(json_url, timeout=30)
-            response.raise_for_status()
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(response.text)
-        except Exception as e:
-            logger.error(f"Failed to download service info from {json_url}: {e}")
-            return False
+        return self.download_file(f"{url}?f=json", output_path, "service info")
+
+    def download_dataset(self, dataset: dict) -> dict:
+        """Download the metadata and service info for a single dataset
+
+        args:
+            dataset (dict): Dataset entry produced by parse_datasets
+        returns:
+            dict: Partial stats counts for this dataset
+        """
+
+        stats = {}
+
+        metadata_path = self.metadata_dir / f"{dataset['name']}.xml"
+        status = self.download_file(dataset["metadata_url"], metadata_path, "metadata")
+        if status:
+            stats["metadata_success"] = 1
+            stats["metadata_updated"] = int(status == UPDATED)
+        else:
+            stats["metadata_failed"] = 1
+
+        # Download service info if available
+        if dataset["service_url"]:
+            service_path = self.services_dir / f"{dataset['name']}_service.json"
+            status = self.download_service_info(dataset["service_url"], service_path)
+            if status:
+                stats["service_success"] = 1
+                stats["service_updated"] = int(status == UPDATED)
+            else:
+                stats["service_failed"] = 1
+
+        return stats
 
-        return True
+    def download_all(self) -> dict:
+        """Main method to download all datasets
 
-    def download_all(self):
-        """Main method to download all datasets"""
+        Datasets are downloaded concurrently by ``max_workers`` threads sharing
+        the pooled session. Requests are spaced per host by the rate limiter.
+
+        returns:
+            dict: Download statistics
+        """
 
         # Fetch and parse the datasets page
         html_content = self.fetch_datasets_page()
@@ -196,108 +326,265 @@ class FSGeodataLoader:
             "total": len(datasets),
             "metadata_success": 0,
             "metadata_failed": 0,
+            "metadata_updated": 0,
             "service_success": 0,
             "service_failed": 0,
+            "service_updated": 0,
         }
 
-        # Download each dataset
-        for i, dataset in enumerate(datasets, 1):
-            # Download metadata
-            metadata_path = self.metadata_dir / f"{dataset['name']}.xml"
-
-            if not metadata_path.exists():
-                if self.download_file(
-                    dataset["metadata_url"], metadata_path, "metadata"
-                ):
-                    stats["metadata_success"] += 1
-                else:
-                    stats["metadata_failed"] += 1
-            else:
-                stats["metadata_success"] += 1
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self.download_dataset, dataset) for dataset in datasets
+            ]
+            for future in as_completed(futures):
+                for key, count in future.result().items():
+                    stats[key] += count
+
+        self.manifest.save()
+
+        logger.info(
+            "FSGeodata download complete: %(total)d datasets, "
+            "%(metadata_success)d/%(metadata_failed)d metadata ok/failed "
+            "(%(metadata_updated)d updated), "
+            "%(service_success)d/%(service_failed)d services ok/failed "
+            "(%(service_updated)d updated)",
+            stats,
+        )
+        return stats
+
+    def parse_metadata(
+        self,
+        workers: int = 1,
+        engine: str = "lxml",
+        cache: "CatalogBuildCache | None" = None,
+    ) -> list[dict]:
+        """Parse metadata XML to extract title and abstract
 
-            # Download service info if available
-            if dataset["service_url"]:
-                service_path = self.services_dir / f"{dataset['name']}_service.json"
-                if not service_path.exists():
-                    if self.download_service_info(dataset["service_url"], service_path):
-                        stats["service_success"] += 1
-                    else:
-                        stats["service_failed"] += 1
-                else:
-                    stats["service_success"] += 1
+        args:
+            workers (int): Number of worker processes. With more than one
+                worker the XML files are parsed in a process pool.
+            engine (str): "lxml" (streaming, default) or "bs4" (BeautifulSoup)
+            cache (CatalogBuildCache | None): Build cache; files whose
+                fingerprint is unchanged reuse their cached document.
+        returns:
+            list[dict]: Documents, ordered by XML file name
+        """
 
-            # Be nice to the server
-            time.sleep(0.25)
+        if engine not in FGDC_ENGINES:
+            raise ValueError(f"Unknown FGDC parser engine: {engine}")
+        parse = FGDC_ENGINES[engine]
 
-    def parse_metadata(self):
-        """Parse metadata XML to extract title and abstract"""
+        xml_files = sorted(self.metadata_dir.glob("*.xml"))
 
-        documents = []
-        xml_path = "data/usfs/fsgeodata/metadata"
-        xml_files = Path(xml_path)
+        documents = {}
+        if cache is not None:
+            for xml_file in xml_files:
+                cached = cache.lookup(xml_file)
+                if cached is not None:
+                    documents[xml_file] = cached[0]
+        to_parse = [xml_file for xml_file in xml_files if xml_file not in documents]
 
-        if xml_files.is_dir():
-            xml_files = list(xml_files.glob("*.xml"))
+        if workers <= 1 or len(to_parse) < 2:
+            parsed = [parse(xml_file) for xml_file in to_parse]
         else:
-            xml_files = [xml_files]
-
-        for idx, xml_file in enumerate(xml_files):
-            with open(xml_file, "r", encoding="utf-8") as f:
-                soup = BeautifulSoup(f, "xml")
-                abstract = ""
-                purpose = ""
-                keywords = []
-                procdate = ""
-                procdesc = ""
-
-                title_elem = soup.find("title")
-                title = clean_str(title_elem.get_text()) if title_elem else ""
-
-                descript = soup.find("descript")
-                if descript:
-                    abstract_elem = descript.find("abstract")
-                    abstract = (
-                        clean_str(abstract_elem.get_text()) if abstract_elem else ""
-                    )
-                    purpose_elem = descript.find("purpose")
-                    purpose = clean_str(purpose_elem.get_text()) if purpose_elem else ""
-
-                lineage = []
-                dataqual = soup.find_all("dataqual")
-                if dataqual:
-                    dq = dataqual[0]
-                    procsteps = dq.find_all("procstep")
-                    for step in procsteps:
-                        if step.find("procdate"):
-                            procdate = step.find("procdate").get_text()
-                        if step.find("procdesc"):
-                            procdesc = step.find("procdesc").get_text()
-
-                        if procdate and procdesc:
-                            procstep = {
-                                "description": procdesc,
-                                "date": procdate,
-                            }
-                            lineage.append(procstep)
-
-                if soup.find_all("themekey") is not None:
-                    themekeys = soup.find_all("themekey")
-                    if len(themekeys) > 0:
-                        keywords = [w.get_text() for w in themekeys]
-
-                document = {
-                    "id": hash_string(title.lower().strip()),
-                    "title": title,
-                    "lineage": lineage,
-                    "abstract": abstract,
-                    "purpose": purpose,
-                    "keywords": keywords,
-                    "src": "fsgeodata",
+            # Hand each worker several files at a time to amortize IPC overhead;
+            # map() yields results in input order, keeping the output deterministic
+            chunksize = max(1, len(to_parse) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(executor.map(parse, to_parse, chunksize=chunksize))
+
+        for xml_file, document in zip(to_parse, parsed):
+            documents[xml_file] = document
+            if cache is not None:
+                cache.store(xml_file, [document])
+
+        return [documents[xml_file] for xml_file in xml_files]
+
+
+def parse_fgdc_xml(xml_file: str | Path) -> dict:
+    """Parse a single FGDC metadata XML file into a document
+
+    Streams the file with lxml's iterparse and only keeps the subtrees that
+    hold the extracted fields (the first ``title``, ``descript`` and
+    ``dataqual`` elements and every ``themekey``). All other elements are
+    discarded as soon as they have been parsed, so memory stays bounded by
+    the largest kept subtree rather than the whole file. Produces the same
+    documents as ``parse_fgdc_xml_bs4``.
+
+    Defined at module level so it can be sent to worker processes.
+
+    args:
+        xml_file (str | Path): Path to the FGDC XML file
+    returns:
+        dict: Document dictionary
+    """
+
+    title = ""
+    abstract = ""
+    purpose = ""
+    keywords = []
+    lineage = []
+
+    seen = set()
+    kept = set()
+
+    context = etree.iterparse(
+        str(xml_file),
+        events=("start", "end"),
+        recover=True,
+        huge_tree=True,
+        resolve_entities=False,
+    )
+    for event, elem in context:
+        tag = elem.tag
+        if not isinstance(tag, str):
+            continue
+        name = tag.rpartition("}")[2]
+
+        if event == "start":
+            if name == "themekey" or (name in _FGDC_FIRST_TAGS and name not in seen):
+                seen.add(name)
+                kept.add(elem)
+            continue
+
+        if elem in kept:
+            kept.discard(elem)
+            if name == "themekey":
+                keywords.append(_xml_text(elem))
+            elif name == "title":
+                title = clean_str(_xml_text(elem))
+            elif name == "descript":
+                abstract_elem = next(elem.iter("{*}abstract"), None)
+                abstract = (
+                    clean_str(_xml_text(abstract_elem))
+                    if abstract_elem is not None
+                    else ""
+                )
+                purpose_elem = next(elem.iter("{*}purpose"), None)
+                purpose = (
+                    clean_str(_xml_text(purpose_elem))
+                    if purpose_elem is not None
+                    else ""
+                )
+            elif name == "dataqual":
+                lineage = _fgdc_lineage(elem)
+
+        if not kept:
+            # Free everything parsed so far that no pending field still needs
+            elem.clear()
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+    return {
+        "id": hash_string(title.lower().strip()),
+        "title": title,
+        "lineage": lineage,
+        "abstract": abstract,
+        "purpose": purpose,
+        "keywords": keywords,
+        "src": "fsgeodata",
+    }
+
+
+_FGDC_FIRST_TAGS = frozenset(["title", "descript", "dataqual"])
+
+
+def _xml_text(elem) -> str:
+    """Concatenated text of an element and its descendants."""
+    return "".join(elem.itertext())
+
+
+def _fgdc_lineage(dataqual) -> list[dict]:
+    """Extract the process steps of an FGDC ``dataqual`` element.
+
+    A step missing its date or description reuses the value from the previous
+    step, matching the original BeautifulSoup parser.
+    """
+
+    lineage = []
+    procdate = ""
+    procdesc = ""
+    for step in dataqual.iter("{*}procstep"):
+        date_elem = next(step.iter("{*}procdate"), None)
+        if date_elem is not None:
+            procdate = _xml_text(date_elem)
+        desc_elem = next(step.iter("{*}procdesc"), None)
+        if desc_elem is not None:
+            procdesc = _xml_text(desc_elem)
+
+        if procdate and procdesc:
+            lineage.append({"description": procdesc, "date": procdate})
+    return lineage
+
+
+def parse_fgdc_xml_bs4(xml_file: str | Path) -> dict:
+    """Parse a single FGDC metadata XML file into a document with BeautifulSoup
+
+    Reference implementation kept for parity checks and as a fallback for
+    files the lxml engine cannot handle.
+
+    args:
+        xml_file (str | Path): Path to the FGDC XML file
+    returns:
+        dict: Document dictionary
+    """
+
+    with open(xml_file, "r", encoding="utf-8") as f:
+        soup = BeautifulSoup(f, "xml")
+
+    abstract = ""
+    purpose = ""
+    keywords = []
+    procdate = ""
+    procdesc = ""
+
+    title_elem = soup.find("title")
+    title = clean_str(title_elem.get_text()) if title_elem else ""
+
+    descript = soup.find("descript")
+    if descript:
+        abstract_elem = descript.find("abstract")
+        abstract = clean_str(abstract_elem.get_text()) if abstract_elem else ""
+        purpose_elem = descript.find("purpose")
+        purpose = clean_str(purpose_elem.get_text()) if purpose_elem else ""
+
+    lineage = []
+    dataqual = soup.find_all("dataqual")
+    if dataqual:
+        dq = dataqual[0]
+        procsteps = dq.find_all("procstep")
+        for step in procsteps:
+            if step.find("procdate"):
+                procdate = step.find("procdate").get_text()
+            if step.find("procdesc"):
+                procdesc = step.find("procdesc").get_text()
+
+            if procdate and procdesc:
+                procstep = {
+                    "description": procdesc,
+                    "date": procdate,
                 }
+                lineage.append(procstep)
 
-                documents.append(document)
+    if soup.find_all("themekey") is not None:
+        themekeys = soup.find_all("themekey")
+        if len(themekeys) > 0:
+            keywords = [w.get_text() for w in themekeys]
+
+    return {
+        "id": hash_string(title.lower().strip()),
+        "title": title,
+        "lineage": lineage,
+        "abstract": abstract,
+        "purpose": purpose,
+        "keywords": keywords,
+        "src": "fsgeodata",
+    }
 
-        return documents
+
+FGDC_ENGINES = {"lxml": parse_fgdc_xml, "bs4": parse_fgdc_xml_bs4}
 
 
 class GeospatialDataDiscovery:
@@ -313,76 +600,86 @@ class GeospatialDataDiscovery:
         self.dest_output_dir = "./data/usfs/gdd"
         self.dest_output_file = "gdd_metadata.json"
 
-    def download_gdd_metadata(self):
-        response = requests.get(self.metadata_source_url)
+    def download_gdd_metadata(self) -> str | None:
+        """
+        Downloads the GDD DCAT-US feed, revalidating any previous copy.
+
+        :return: UPDATED or UNCHANGED on success, None on failure
+        :rtype: str | None
+        """
 
         # Make output dir if needed.
         os.makedirs(self.dest_output_dir, exist_ok=True)
 
-        if response.status_code == 200:
-            try:
-                response.json()
-            except requests.exceptions.JSONDecodeError:
-                logger.error("GDD metadata response is not valid JSON")
-                return
-            fpath = Path(self.dest_output_dir) / self.dest_output_file
-            with open(fpath, "w", encoding="utf-8") as f:
-                f.write(response.text)
-        else:
-            logger.error(
-                f"Failed to download GDD metadata: {response.status_code} {response.text}"
+        fpath = Path(self.dest_output_dir) / self.dest_output_file
+        manifest = DownloadManifest(Path(self.dest_output_dir) / MANIFEST_FILE)
+        try:
+            status = conditional_download(
+                create_session(),
+                self.metadata_source_url,
+                fpath,
+                manifest,
+                validate=_validate_dcat_feed,
+                timeout=120,
             )
+        except json.JSONDecodeError:
+            logger.error("GDD metadata response is not valid JSON")
+            return None
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to download GDD metadata: {e}")
+            return None
 
-    def parse_metadata(self) -> None:
+        manifest.save()
+        return status
+
+    def parse_metadata(self, cache: "CatalogBuildCache | None" = None) -> list[dict]:
         """
         Parses GDD metadata JSON file and returns list of documents
 
+        The ``dataset`` array is read incrementally, so memory stays flat as
+        the hub feed grows.
+
+        :param cache: Build cache used to skip unchanged files and records
+        :type cache: CatalogBuildCache | None
         :return: List of document dictionaries
         :rtype: list[dict]
         """
 
-        documents = []
-
         src_file = Path(self.dest_output_dir) / self.dest_output_file
 
         if not os.path.exists(src_file):
             return []
 
-        with open(src_file, "r", encoding="utf-8") as f:
-            json_data = json.load(f)
-
-            if "dataset" in json_data.keys():
-                dataset = json_data.get("dataset")
-
-                if dataset and len(dataset) > 0:
-                    for item in dataset:
-                        title = (
-                            clean_str(item.get("title"))
-                            if "title" in item.keys()
-                            else ""
-                        )
-                        description = (
-                            clean_str(item.get("description"))
-                            if "description" in item.keys()
-                            else ""
-                        )
-                        keyword = (
-                            item.get("keyword") if "keyword" in item.keys() else []
-                        )
-                        theme = item.get("theme") if "theme" in item.keys() else []
-
-                        document = {
-                            "id": hash_string(title.lower().strip()),
-                            "title": title,
-                            "description": description,
-                            "keywords": keyword,
-                            "themes": theme,
-                            "src": "gdd",
-                        }
-
-                        documents.append(document)
+        if cache is not None:
+            return cache.parse_feed(src_file, self.parse_item)
 
-        return documents
+        return [self.parse_item(item) for item in iter_json_array(src_file, "dataset")]
+
+    def parse_item(self, item: dict) -> dict:
+        """
+        Converts a single DCAT-US dataset entry into a document
+
+        :param item: DCAT-US dataset entry
+        :type item: dict
+        :return: Document dictionary
+        :rtype: dict
+        """
+
+        title = clean_str(item.get("title")) if "title" in item.keys() else ""
+        description = (
+            clean_str(item.get("description")) if "description" in item.keys() else ""
+        )
+        keyword = item.get("keyword") if "keyword" in item.keys() else []
+        theme = item.get("theme") if "theme" in item.keys() else []
+
+        return {
+            "id": hash_string(title.lower().strip()),
+            "title": title,
+            "description": description,
+            "keywords": keyword,
+            "themes": theme,
+            "src": "gdd",
+        }
 
 
 class RDALoader:
@@ -393,38 +690,205 @@ class RDALoader:
 
         os.makedirs(self.dest_output_dir, exist_ok=True)
 
-    def download(self):
-        response = requests.get(self.source_url)
-        if response.status_code == 200:
-            json_data = response.json()
+    def download(self) -> str | None:
+        """
+        Downloads the RDA data.gov feed, revalidating any previous copy.
+
+        :return: UPDATED or UNCHANGED on success, None on failure
+        :rtype: str | None
+        """
+
+        src_file = Path(self.dest_output_dir) / self.dest_output_file
+        manifest = DownloadManifest(Path(self.dest_output_dir) / MANIFEST_FILE)
+        try:
+            status = conditional_download(
+                create_session(),
+                self.source_url,
+                src_file,
+                manifest,
+                validate=_validate_dcat_feed,
+                timeout=120,
+            )
+        except (json.JSONDecodeError, requests.exceptions.RequestException) as e:
+            logger.error(f"Failed to download RDA metadata: {e}")
+            return None
 
-            src_file = Path(self.dest_output_dir) / self.dest_output_file
-            with open(src_file, "w", encoding="utf-8") as f:
-                json.dump(json_data, f, indent=4)
+        manifest.save()
+        return status
 
-    def parse_metadata(self):
-        documents = []
+    def parse_metadata(self, cache: "CatalogBuildCache | None" = None) -> list[dict]:
         src_file = Path(self.dest_output_dir) / self.dest_output_file
 
         if not os.path.exists(src_file):
             return []
 
-        with open(src_file, "r", encoding="utf-8") as f:
-            json_data = json.load(f)
-            dataset = json_data.get("dataset", [])
-            for item in dataset:
-                title = clean_str(item.get("title"))
-                description = clean_str(item.get("description"))
-                keywords = item.get("keyword")
-
-                doc = {
-                    "id": hash_string(title.lower().strip()),
-                    "title": title,
-                    "description": description,
-                    "keywords": keywords,
-                    "src": "rda",
-                }
+        if cache is not None:
+            return cache.parse_feed(src_file, self.parse_item)
+
+        return [self.parse_item(item) for item in iter_json_array(src_file, "dataset")]
+
+    def parse_item(self, item: dict) -> dict:
+        """
+        Converts a single data.gov dataset entry into a document
+
+        :param item: data.gov dataset entry
+        :type item: dict
+        :return: Document dictionary
+        :rtype: dict
+        """
+
+        title = clean_str(item.get("title"))
+        description = clean_str(item.get("description"))
+        keywords = item.get("keyword")
+
+        return {
+            "id": hash_string(title.lower().strip()),
+            "title": title,
+            "description": description,
+            "keywords": keywords,
+            "src": "rda",
+        }
+
 
-                documents.append(doc)
+class CatalogBuildCache:
+    """
+    Fingerprints of catalog source files and the documents parsed from them.
+
+    A file is unchanged when its mtime and size match the cached entry, or,
+    failing that, when its SHA-256 matches. Hashes are only computed when the
+    cache is reused, so a full rebuild doesn't read every file twice; entries
+    it writes match on mtime and size alone. Records of the JSON feeds are
+    cached by the hash of their raw JSON, so a feed with a few changed
+    entries only re-parses those entries (keyed per feed file, so identical
+    entries in different feeds stay separate); a feed's file entry lists its
+    record keys instead of repeating the documents. Entries not used during
+    a build are dropped when the cache is saved.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: str | Path, reuse: bool = True):
+        self.path = Path(path)
+        self.reuse = reuse
+        self.files: dict[str, dict] = {}
+        self.records: dict[str, dict] = {}
+        self._files_used: dict[str, dict] = {}
+        self._records_used: dict[str, dict] = {}
+        self._hashes: dict[str, str] = {}
+        self.stats = {"reused": 0, "parsed": 0}
+
+        if reuse and self.path.exists():
+            data = load_json(self.path)
+            if data.get("version") == self.VERSION:
+                self.files = data.get("files", {})
+                self.records = data.get("records", {})
+
+    def _hash(self, path: Path) -> str:
+        key = str(path)
+        if key not in self._hashes:
+            self._hashes[key] = hash_file(path)
+        return self._hashes[key]
+
+    def _fingerprint(self, path: Path) -> dict:
+        """Fingerprint of a file for a new cache entry."""
+        stat = path.stat()
+        fingerprint = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        if self.reuse:
+            fingerprint["sha256"] = self._hash(path)
+        return fingerprint
+
+    def _unchanged(self, path: Path, entry: dict) -> dict | None:
+        """Return the refreshed entry if a file is unchanged, else None."""
+        stat = path.stat()
+        fingerprint = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return {**entry, **fingerprint}
+        if "sha256" in entry and self._hash(path) == entry["sha256"]:
+            return {**entry, **fingerprint}
+        return None
+
+    def lookup(self, path: str | Path) -> list[dict] | None:
+        """Return the cached documents for a file, or None if it changed."""
+        key = str(path)
+        entry = self.files.get(key)
+        if entry is None:
+            return None
+
+        entry = self._unchanged(Path(path), entry)
+        if entry is None:
+            return None
+
+        self._files_used[key] = entry
+        self.stats["reused"] += len(entry["documents"])
+        return entry["documents"]
+
+    def store(self, path: str | Path, documents: list[dict]) -> None:
+        """Cache the documents parsed from a file under its fingerprint."""
+        fingerprint = self._fingerprint(Path(path))
+        self._files_used[str(path)] = {**fingerprint, "documents": documents}
+        self.stats["parsed"] += len(documents)
+
+    def parse_feed(self, path: str | Path, parse_item) -> list[dict]:
+        """
+        Parse the ``dataset`` array of a JSON feed, reusing cached documents.
 
+        :param path: Path to the feed file
+        :param parse_item: Callable converting a feed entry into a document
+        :return: Documents in feed order
+        """
+
+        key = str(path)
+        entry = self.files.get(key)
+        if entry is not None:
+            entry = self._unchanged(Path(path), entry)
+        if entry is not None and all(k in self.records for k in entry["record_keys"]):
+            documents = []
+            for record_key in entry["record_keys"]:
+                self._records_used[record_key] = self.records[record_key]
+                documents.append(self.records[record_key])
+            self._files_used[key] = entry
+            self.stats["reused"] += len(documents)
+            return documents
+
+        documents = []
+        record_keys = []
+        reused = 0
+        for item in iter_json_array(path, "dataset"):
+            record_key = hash_string(f"{path}\n{json.dumps(item, sort_keys=True)}")
+            document = self.records.get(record_key)
+            if document is None:
+                document = parse_item(item)
+            else:
+                reused += 1
+            self._records_used[record_key] = document
+            record_keys.append(record_key)
+            documents.append(document)
+
+        self._files_used[key] = {
+            **self._fingerprint(Path(path)),
+            "record_keys": record_keys,
+        }
+        self.stats["reused"] += reused
+        self.stats["parsed"] += len(documents) - reused
         return documents
+
+    def save(self) -> None:
+        """Write the entries used during this build to disk."""
+        save_json(
+            {
+                "version": self.VERSION,
+                "files": self._files_used,
+                "records": self._records_used,
+            },
+            self.path,
+            indent=None,
+        )
+
+
+def _validate_dcat_feed(path: Path) -> None:
+    """Raise json.JSONDecodeError if a DCAT feed is not valid JSON.
+
+    Walks the feed incrementally instead of loading it into memory.
+    """
+    for _ in iter_json_array(path, "dataset"):
+        pass
@@ -1,6 +1,12 @@
 """Shared pytest fixtures for the catalog test suite."""
 
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
+from chromadb.api.types import EmbeddingFunction
 
 
 @pytest.fixture
@@ -25,3 +31,157 @@ def sample_lineage_list():
         {"description": "Initial creation", "date": "2024-01-01"},
         {"description": "Updated metadata", "date": "2024-06-15"},
     ]
+
+
+class StandInServer:
+    """Local HTTP stand-in for the remote metadata hosts.
+
+    ``routes`` maps a request path (without query string) to either a
+    ``(status, body)`` tuple or a callable taking the request handler and
+    returning ``(status, headers, body)``. Every request path is recorded.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                with server._lock:
+                    server.requests.append(self.path)
+                route = server.routes.get(path, (404, b"not found"))
+                if callable(route):
+                    status, headers, body = route(self)
+                else:
+                    status, body = route
+                    headers = {}
+                if isinstance(body, str):
+                    body = body.encode("utf-8")
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_with_etag(self, path, body, etag='"v1"'):
+        """Serve a fixed body at ``path`` that honours ``If-None-Match``."""
+
+        def route(handler):
+            if handler.headers.get("If-None-Match") == etag:
+                return 304, {"ETag": etag}, b""
+            headers = {"ETag": etag, "Last-Modified": "Mon, 05 Jan 2026 00:00:00 GMT"}
+            return 200, headers, body
+
+        self.routes[path] = route
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def stand_in_server():
+    """Fixture providing a local HTTP stand-in server."""
+    server = StandInServer()
+    yield server
+    server.close()
+
+
+class FakeEmbeddingFunction(EmbeddingFunction):
+    """Deterministic, offline embedding function that records what it embeds."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, input):
+        self.calls.append(list(input))
+        return [
+            [b / 255.0 for b in hashlib.sha256(text.encode("utf-8")).digest()[:8]]
+            for text in input
+        ]
+
+    @staticmethod
+    def name():
+        return "fake"
+
+    def get_config(self):
+        return {}
+
+    @staticmethod
+    def build_from_config(config):
+        return FakeEmbeddingFunction()
+
+    @property
+    def embedded(self):
+        """All texts embedded so far."""
+        return [text for call in self.calls for text in call]
+
+
+def _make_catalog(count, src="fsgeodata"):
+    """Build a list of catalog document dicts."""
+    return [
+        {
+            "id": f"doc{i}",
+            "title": f"Dataset {i}",
+            "abstract": f"Abstract for dataset {i} about forests.",
+            "keywords": ["forest", f"kw{i}"],
+            "src": src,
+            "lineage": [],
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def fake_embedder():
+    """Fixture providing an offline embedding function."""
+    return FakeEmbeddingFunction()
+
+
+@pytest.fixture
+def make_catalog():
+    """Fixture providing a factory for catalog document dicts."""
+    return _make_catalog
+
+
+@pytest.fixture
+def catalog_file(tmp_path):
+    """Fixture providing a small catalog JSON file."""
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(_make_catalog(5)))
+    return path
+
+
+@pytest.fixture
+def chroma_db(tmp_path, catalog_file, fake_embedder):
+    """Fixture providing a ChromaVectorDB on a temp store with a fake embedder."""
+    from catalog.core import ChromaVectorDB
+
+    return ChromaVectorDB(
+        db_path=str(tmp_path / "chromadb"),
+        src_catalog_file=str(catalog_file),
+        embedding_function=fake_embedder,
+    )
+
+
+@pytest.fixture(autouse=True)
+def llm_cache(monkeypatch):
+    """Give each test's bots a fresh in-memory LLM cache instead of ./cache."""
+    from catalog.cache import LLMCache
+
+    cache = LLMCache()
+    monkeypatch.setattr("catalog.bots.default_llm_cache", lambda: cache)
+    return cache
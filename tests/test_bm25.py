@@ -0,0 +1,186 @@
+"""Tests for catalog.bm25 module."""
+
+import random
+
+import numpy as np
+import pytest
+from rank_bm25 import BM25Okapi
+
+from catalog.bm25 import BM25Index, BM25Matrix, tokenize
+
+
+@pytest.fixture
+def corpus():
+    """Fixture providing a random corpus with common, rare and repeated terms."""
+    rng = random.Random(7)
+    words = ["forest", "fire", "trail", "road", "soil", "water", "elk", "lidar"]
+    texts = [
+        " ".join(
+            rng.choices(words, weights=[30, 8, 5, 5, 3, 3, 1, 1], k=rng.randint(1, 25))
+        )
+        for _ in range(60)
+    ]
+    texts.append("")
+    return [f"doc{i}" for i in range(len(texts))], texts
+
+
+QUERIES = ["forest", "fire trail", "elk elk lidar", "Forest ROAD", "unknown", ""]
+
+
+class TestBM25Index:
+    """Tests for BM25Index class."""
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_scores_match_rank_bm25(self, corpus, query):
+        """Test that scores match BM25Okapi, including negative-idf terms."""
+        doc_ids, texts = corpus
+        expected = BM25Okapi([tokenize(t) for t in texts]).get_scores(tokenize(query))
+
+        index = BM25Index.build(doc_ids, texts)
+
+        np.testing.assert_allclose(index.get_scores(tokenize(query)), expected)
+
+    @pytest.mark.parametrize("query", QUERIES)
+    @pytest.mark.parametrize("k", [1, 5, 100])
+    def test_search_matches_full_ranking(self, corpus, query, k):
+        """Test that sparse top-k search matches ranking every document."""
+        doc_ids, texts = corpus
+        index = BM25Index.build(doc_ids, texts)
+        scores = index.get_scores(tokenize(query))
+        matching = {
+            i
+            for i, text in enumerate(texts)
+            if set(tokenize(text)) & set(tokenize(query))
+        }
+        ranked = sorted(matching, key=lambda i: (-scores[i], i))[:k]
+
+        results = index.search(query, k=k)
+
+        assert [doc_id for doc_id, _ in results] == [doc_ids[i] for i in ranked]
+        np.testing.assert_allclose([s for _, s in results], scores[ranked])
+
+    def test_search_skips_documents_without_query_terms(self):
+        """Test that only documents containing a query term are returned."""
+        index = BM25Index.build(["a", "b", "c"], ["elk forest", "fire", "elk"])
+
+        assert [doc_id for doc_id, _ in index.search("elk", k=10)] == ["c", "a"]
+        assert index.search("moose", k=10) == []
+
+    def test_updates_match_fresh_build(self, corpus, tmp_path):
+        """Test that add/update/delete give the same scores as a rebuild."""
+        doc_ids, texts = corpus
+        index = BM25Index.build(doc_ids, texts)
+        docs = dict(zip(doc_ids, texts))
+
+        changes = {"doc3": "elk elk moose", "new1": "moose lidar", "new2": "fire"}
+        index.upsert(list(changes), list(changes.values()))
+        index.delete(["doc0", "doc5", "missing"])
+        docs.update(changes)
+        for doc_id in ["doc0", "doc5"]:
+            del docs[doc_id]
+        expected = BM25Index.build(list(docs), list(docs.values()))
+
+        def scores_by_id(idx, query):
+            return {
+                doc_id: score for doc_id, score in idx.search(query, k=len(docs) + 5)
+            }
+
+        assert len(index) == len(docs)
+        for query in QUERIES + ["moose", "elk moose"]:
+            assert scores_by_id(index, query) == pytest.approx(
+                scores_by_id(expected, query)
+            )
+
+        index.save(tmp_path / "bm25")
+        loaded = BM25Index.load(tmp_path / "bm25")
+        assert sorted(loaded.doc_ids) == sorted(docs)
+        for query in ["moose", "elk moose", "forest"]:
+            assert scores_by_id(loaded, query) == pytest.approx(
+                scores_by_id(expected, query)
+            )
+
+    def test_metadata_survives_updates_and_save(self, tmp_path):
+        """Test that stored metadata follows documents through updates and saves."""
+        index = BM25Index.build(
+            ["a", "b"], ["elk forest", "fire"], [{"title": "A"}, {"title": "B"}]
+        )
+        index.upsert(["b", "c"], ["fire elk", "elk"], [{"title": "B2"}, None])
+        index.delete(["a"])
+
+        hits = index.search("elk", k=5, with_metadata=True)
+        assert {doc_id: meta for doc_id, _, meta in hits} == {
+            "b": {"title": "B2"},
+            "c": None,
+        }
+
+        index.save(tmp_path / "bm25")
+        loaded = BM25Index.load(tmp_path / "bm25")
+        hits = loaded.search("elk", k=5, with_metadata=True)
+        assert {doc_id: meta for doc_id, _, meta in hits} == {
+            "b": {"title": "B2"},
+            "c": None,
+        }
+
+    def test_save_and_load_round_trip(self, corpus, tmp_path):
+        """Test that a saved index loads memory-mapped with the same scores."""
+        doc_ids, texts = corpus
+        index = BM25Index.build(doc_ids, texts)
+        index.save(tmp_path / "bm25", version="v1", count=len(index))
+
+        loaded = BM25Index.load(tmp_path / "bm25")
+
+        assert isinstance(loaded.postings, np.memmap)
+        assert loaded.meta["version"] == "v1"
+        assert loaded.search("fire trail", 5) == index.search("fire trail", 5)
+
+    def test_load_without_meta_returns_none(self, corpus, tmp_path):
+        """Test that an index missing its meta file is not loaded."""
+        doc_ids, texts = corpus
+        BM25Index.build(doc_ids, texts).save(tmp_path / "bm25")
+        (tmp_path / "bm25" / "meta.json").unlink()
+
+        assert BM25Index.load(tmp_path / "bm25") is None
+        assert BM25Index.load(tmp_path / "missing") is None
+
+
+class TestBM25Matrix:
+    """Tests for BM25Matrix class."""
+
+    def test_score_batch_matches_rank_bm25(self, corpus):
+        """Test that batched matrix scores match BM25Okapi for every query."""
+        doc_ids, texts = corpus
+        bm25 = BM25Okapi([tokenize(t) for t in texts])
+        matrix = BM25Matrix(BM25Index.build(doc_ids, texts))
+
+        scores = matrix.score_batch(QUERIES)
+
+        assert scores.shape == (len(QUERIES), len(texts))
+        for row, query in zip(scores, QUERIES):
+            np.testing.assert_allclose(row, bm25.get_scores(tokenize(query)))
+
+    @pytest.mark.parametrize("max_batch_cells", [1, 100, 4_000_000])
+    def test_search_batch_matches_postings_backend(self, corpus, max_batch_cells):
+        """Test that matrix search returns the same results as postings search."""
+        doc_ids, texts = corpus
+        index = BM25Index.build(doc_ids, texts)
+        matrix = BM25Matrix(index, max_batch_cells=max_batch_cells)
+
+        results = matrix.search_batch(QUERIES, k=7)
+
+        for query, result in zip(QUERIES, results):
+            expected = index.search(query, k=7)
+            assert [d for d, _ in result] == [d for d, _ in expected]
+            np.testing.assert_allclose([s for _, s in result], [s for _, s in expected])
+
+    def test_matrix_reflects_index_updates(self, corpus):
+        """Test that a matrix built after updates scores the updated corpus."""
+        doc_ids, texts = corpus
+        index = BM25Index.build(doc_ids, texts)
+        index.upsert(["doc1", "new"], ["moose", "moose elk"])
+        index.delete(["doc2"])
+        expected = {q: index.search(q, k=7) for q in QUERIES + ["moose"]}
+
+        matrix = BM25Matrix(index)
+
+        for query, result in expected.items():
+            assert matrix.search(query, k=7) == pytest.approx(result)
@@ -1,8 +1,13 @@
 """Tests for catalog.bots."""
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pytest
-from unittest.mock import patch, MagicMock
-from catalog.bots import VerdeBot, OllamaBot
+from unittest.mock import patch, AsyncMock, MagicMock
+from langchain_litellm import ChatLiteLLM
+from catalog.bots import AgentBot, VerdeBot, OllamaBot
+from catalog.cache import LLMCache
 
 
 class TestVerdeBot:
@@ -39,8 +44,8 @@ class TestVerdeBot:
 
         with patch.dict("os.environ", env, clear=True):
             bot = VerdeBot()
-            with patch(
-                "langchain_litellm.ChatLiteLLM.invoke", return_value=mock_response
+            with patch.object(
+                ChatLiteLLM, "invoke", return_value=mock_response
             ) as mock_invoke:
                 result = bot.chat(question="fire data", context="some context")
 
@@ -62,3 +67,347 @@ class TestOllamaBot:
         bot = OllamaBot()
         result = bot.expand_query(query=question)
         assert isinstance(result, str)
+
+
+OLLAMA_ENV = {
+    "OLLAMA_API_KEY": "test-key",
+    "OLLAMA_API_URL": "http://localhost:11434",
+    "OLLAMA_MODEL": "test-model",
+}
+
+
+class TestAsyncBots:
+    """Tests for the async bot methods."""
+
+    def test_ollama_achat_uses_async_client(self):
+        """Test that achat awaits the AsyncClient and returns content."""
+        with patch.dict("os.environ", OLLAMA_ENV, clear=True):
+            bot = OllamaBot()
+        bot.async_client = MagicMock()
+        bot.async_client.chat = AsyncMock(
+            return_value={"message": {"content": "Fire datasets."}}
+        )
+
+        result = asyncio.run(bot.achat(question="fire data", context="ctx"))
+
+        assert result == "Fire datasets."
+        messages = bot.async_client.chat.call_args.kwargs["messages"]
+        assert messages == bot._chat_messages("fire data", "ctx")
+
+    def test_agent_arun_executes_tools(self):
+        """Test that arun runs tool calls and returns the final answer."""
+        with (
+            patch.dict("os.environ", OLLAMA_ENV, clear=True),
+            patch("catalog.core.ChromaVectorDB"),
+            patch("catalog.search.HybridSearch"),
+        ):
+            bot = AgentBot()
+        tool_call = {
+            "function": {"name": "search_hybrid", "arguments": {"query": "fire"}}
+        }
+        bot.async_client = MagicMock()
+        bot.async_client.chat = AsyncMock(
+            side_effect=[
+                {"message": {"role": "assistant", "tool_calls": [tool_call]}},
+                {"message": {"role": "assistant", "content": "Found fire data."}},
+            ]
+        )
+
+        with patch("catalog.bots.execute_tool", return_value="results") as tool:
+            result = asyncio.run(bot.arun("Any fire data?"))
+        bot.close()
+
+        assert result == "Found fire data."
+        tool.assert_called_once_with("search_hybrid", {"query": "fire"}, bot.db, bot.hs)
+        sent = bot.async_client.chat.call_args.kwargs["messages"]
+        assert sent[2:4] == [
+            {"role": "assistant", "tool_calls": [tool_call]},
+            {"role": "tool", "content": "results"},
+        ]
+
+
+@pytest.fixture
+def agent_bot():
+    """Fixture providing an AgentBot with the vector store mocked out."""
+    with (
+        patch.dict("os.environ", OLLAMA_ENV, clear=True),
+        patch("catalog.core.ChromaVectorDB"),
+        patch("catalog.search.HybridSearch"),
+        AgentBot() as bot,
+    ):
+        yield bot
+
+
+def _tool_turn(*queries):
+    """A model message requesting one search_hybrid call per query."""
+    calls = [
+        {"function": {"name": "search_hybrid", "arguments": {"query": q}}}
+        for q in queries
+    ]
+    return {"message": {"role": "assistant", "tool_calls": calls}}
+
+
+def _blocking_tool(release):
+    """execute_tool stand-in that blocks "slow" queries until ``release`` is set."""
+
+    def tool(name, args, db, hs):
+        if args["query"] == "slow":
+            release.wait(5)
+        return f"results for {args['query']}"
+
+    return tool
+
+
+class TestAgentBotTools:
+    """Tests for concurrent tool execution in AgentBot."""
+
+    def test_run_executes_tools_concurrently_in_order(self, agent_bot):
+        """Test that a turn's tools run in parallel and keep the call order."""
+        agent_bot.client = MagicMock()
+        agent_bot.client.chat.side_effect = [
+            _tool_turn("a", "b", "c"),
+            {"message": {"role": "assistant", "content": "done"}},
+        ]
+        # Every call waits for the other two, so this only passes if all
+        # three run at the same time
+        barrier = threading.Barrier(3)
+
+        def tool(name, args, db, hs):
+            barrier.wait(5)
+            return f"results for {args['query']}"
+
+        with patch("catalog.bots.execute_tool", side_effect=tool):
+            result = agent_bot.run("question")
+
+        assert result == "done"
+        messages = agent_bot.client.chat.call_args.kwargs["messages"]
+        assert [m["content"] for m in messages if m["role"] == "tool"] == [
+            "results for a",
+            "results for b",
+            "results for c",
+        ]
+
+    def test_close_shuts_down_tool_pool(self):
+        """Test that leaving the context manager stops the tool threads."""
+        with (
+            patch.dict("os.environ", OLLAMA_ENV, clear=True),
+            patch("catalog.core.ChromaVectorDB"),
+            patch("catalog.search.HybridSearch"),
+            AgentBot() as bot,
+        ):
+            assert bot._tool_executor.submit(sum, [1, 2]).result() == 3
+
+        with pytest.raises(RuntimeError, match="shutdown"):
+            bot._tool_executor.submit(sum, [1, 2])
+
+    def test_slow_tool_times_out(self, agent_bot):
+        """Test that a tool past the timeout is reported without stalling."""
+        agent_bot.TOOL_TIMEOUT = 0.2
+        release = threading.Event()
+        tool_calls = _tool_turn("a", "slow")["message"]["tool_calls"]
+
+        with patch("catalog.bots.execute_tool", side_effect=_blocking_tool(release)):
+            try:
+                results = agent_bot._run_tools(tool_calls)
+            finally:
+                release.set()
+
+        assert results == [
+            "results for a",
+            "Error: search_hybrid timed out after 0.2 seconds.",
+        ]
+
+    def test_queued_tools_are_cancelled_on_timeout(self, agent_bot):
+        """Test that calls still queued at the timeout never run."""
+        agent_bot.TOOL_TIMEOUT = 0.1
+        agent_bot._tool_executor = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        tool_calls = _tool_turn("slow", "a")["message"]["tool_calls"]
+
+        with patch(
+            "catalog.bots.execute_tool", side_effect=_blocking_tool(release)
+        ) as tool:
+            try:
+                results = agent_bot._run_tools(tool_calls)
+            finally:
+                release.set()
+                agent_bot._tool_executor.shutdown(wait=True)
+
+        assert results == ["Error: search_hybrid timed out after 0.1 seconds."] * 2
+        assert tool.call_count == 1
+
+    def test_arun_tools_time_out(self, agent_bot):
+        """Test that the async path runs tools concurrently with timeouts."""
+        agent_bot.TOOL_TIMEOUT = 0.2
+        release = threading.Event()
+        tool_calls = _tool_turn("slow", "a", "b")["message"]["tool_calls"]
+
+        with patch("catalog.bots.execute_tool", side_effect=_blocking_tool(release)):
+            try:
+                results = asyncio.run(agent_bot._arun_tools(tool_calls))
+            finally:
+                release.set()
+
+        assert results == [
+            "Error: search_hybrid timed out after 0.2 seconds.",
+            "results for a",
+            "results for b",
+        ]
+
+
+class TestStreaming:
+    """Tests for the streaming chat methods."""
+
+    def test_ollama_chat_stream_yields_chunks(self):
+        """Test that chat_stream requests a stream and yields its text."""
+        with patch.dict("os.environ", OLLAMA_ENV, clear=True):
+            bot = OllamaBot()
+        bot.client = MagicMock()
+        bot.client.chat.return_value = iter(
+            {"message": {"content": text}} for text in ["Fire ", "", "datasets."]
+        )
+
+        chunks = list(bot.chat_stream(question="fire data", context="ctx"))
+
+        assert chunks == ["Fire ", "datasets."]
+        assert bot.client.chat.call_args.kwargs["stream"] is True
+
+    def test_verde_chat_stream_yields_chunks(self):
+        """Test that VerdeBot.chat_stream yields the streamed message text."""
+        env = {
+            "VERDE_API_KEY": "test-key",
+            "VERDE_URL": "http://localhost:8000",
+            "VERDE_MODEL": "test-model",
+        }
+        with patch.dict("os.environ", env, clear=True):
+            bot = VerdeBot()
+        chunks = [MagicMock(content="Some "), MagicMock(content="datasets.")]
+
+        with patch.object(ChatLiteLLM, "stream", return_value=iter(chunks)):
+            result = list(bot.chat_stream(question="fire data", context="ctx"))
+
+        assert result == ["Some ", "datasets."]
+
+
+class TestLLMCaching:
+    """Tests for caching LLM responses in the bots."""
+
+    def test_expand_query_repeats_hit_cache(self, llm_cache):
+        """Test that a repeated expansion doesn't call the model again."""
+        with patch.dict("os.environ", OLLAMA_ENV, clear=True):
+            bot = OllamaBot()
+        bot.client = MagicMock()
+        bot.client.chat.return_value = {"message": {"content": "fire wildfire"}}
+
+        assert bot.expand_query("fire") == "fire wildfire"
+        assert bot.expand_query("fire") == "fire wildfire"
+        assert bot.client.chat.call_count == 1
+        assert llm_cache.hits == 1
+
+    def test_uses_given_empty_cache(self, monkeypatch):
+        """Test that an empty cache passed to a bot isn't swapped for the default."""
+
+        def fail():
+            raise AssertionError("default cache should not be built")
+
+        monkeypatch.setattr("catalog.bots.default_llm_cache", fail)
+        env = {
+            **OLLAMA_ENV,
+            "VERDE_API_KEY": "test-key",
+            "VERDE_URL": "http://localhost:8000",
+            "VERDE_MODEL": "test-model",
+        }
+        caches = [LLMCache(), LLMCache(), LLMCache()]
+        with (
+            patch.dict("os.environ", env, clear=True),
+            patch("catalog.core.ChromaVectorDB"),
+            patch("catalog.search.HybridSearch"),
+        ):
+            bots = [
+                cls(cache=cache)
+                for cls, cache in zip((OllamaBot, AgentBot, VerdeBot), caches)
+            ]
+        bots[0].client = MagicMock()
+        bots[0].client.chat.return_value = {"message": {"content": "fire wildfire"}}
+        bots[0].expand_query("fire")
+        bots[1].close()
+
+        assert all(bot.cache is cache for bot, cache in zip(bots, caches))
+        assert len(caches[0]) == 1
+
+    def test_verde_key_covers_sent_request(self, llm_cache):
+        """Test that VerdeBot caches under the key of the request it sends."""
+        env = {
+            "VERDE_API_KEY": "test-key",
+            "VERDE_URL": "http://localhost:8000",
+            "VERDE_MODEL": "test-model",
+        }
+        with patch.dict("os.environ", env, clear=True):
+            bot = VerdeBot()
+        response = MagicMock(content="Some datasets.")
+
+        with patch.object(ChatLiteLLM, "invoke", return_value=response) as invoke:
+            assert bot.chat("fire data", "ctx") == "Some datasets."
+            assert bot.chat("fire data", "ctx") == "Some datasets."
+
+        sent = invoke.call_args.args[0]
+        key = llm_cache.request_key("litellm_proxy/test-model", sent)
+        assert invoke.call_count == 1
+        assert llm_cache.get(key) == "Some datasets."
+
+    def test_streamed_answer_is_reused(self):
+        """Test that a streamed answer is cached for chat and chat_stream."""
+        with patch.dict("os.environ", OLLAMA_ENV, clear=True):
+            bot = OllamaBot()
+        bot.client = MagicMock()
+        bot.client.chat.return_value = iter(
+            {"message": {"content": text}} for text in ["Two ", "datasets."]
+        )
+
+        assert "".join(bot.chat_stream("q", "ctx")) == "Two datasets."
+        assert bot.chat("q", "ctx") == "Two datasets."
+        assert list(bot.chat_stream("q", "ctx")) == ["Two datasets."]
+        assert bot.client.chat.call_count == 1
+
+    def test_agent_replays_cached_turns(self, agent_bot):
+        """Test that a repeated question replays model turns but reruns tools."""
+        agent_bot.client = MagicMock()
+        agent_bot.client.chat.side_effect = [
+            _tool_turn("fire"),
+            {"message": {"role": "assistant", "content": "Found fire data."}},
+        ]
+
+        with patch("catalog.bots.execute_tool", return_value="results") as tool:
+            first = agent_bot.run("Any fire data?")
+            second = agent_bot.run("Any fire data?")
+
+        assert first == second == "Found fire data."
+        assert agent_bot.client.chat.call_count == 2
+        assert tool.call_count == 2
+
+
+class TestExpandQueries:
+    """Tests for OllamaBot.expand_queries."""
+
+    def test_parses_alternative_phrasings(self):
+        """Test that list markers, quotes, blanks and repeats are dropped."""
+        with patch.dict("os.environ", OLLAMA_ENV, clear=True):
+            bot = OllamaBot()
+        bot.client = MagicMock()
+        bot.client.chat.return_value = {
+            "message": {
+                "content": '1. wildfire perimeters\n\n- "burn severity"\n'
+                "Fire history\n2) burn severity\n* fire occurrence points"
+            }
+        }
+
+        alternatives = bot.expand_queries("fire history", n=3)
+
+        assert alternatives == [
+            "wildfire perimeters",
+            "burn severity",
+            "fire occurrence points",
+        ]
+        prompt = bot.client.chat.call_args.kwargs["messages"][1]["content"]
+        assert "3 different search queries" in prompt
+        assert prompt.endswith("fire history")
@@ -0,0 +1,160 @@
+"""Tests for catalog.cache module."""
+
+from catalog.cache import LLMCache, QueryCache
+from catalog.core import ChromaVectorDB
+from catalog.search import HybridSearch
+from catalog.tools import execute_tool
+
+
+class TestQueryCache:
+    """Tests for QueryCache class."""
+
+    def test_key_normalizes_query(self):
+        """Test that case and whitespace differences share a key."""
+        key = QueryCache.make_key("Forest  Fire", 5, "vector", "v1")
+
+        assert QueryCache.make_key(" forest fire ", 5, "vector", "v1") == key
+        assert QueryCache.make_key("forest fire", 3, "vector", "v1") != key
+        assert QueryCache.make_key("forest fire", 5, "hybrid", "v1") != key
+        assert QueryCache.make_key("forest fire", 5, "vector", "v2") != key
+        assert (
+            QueryCache.make_key("forest fire", 5, "vector", "v1", {"source": "gdd"})
+            != key
+        )
+
+    def test_counts_hits_and_misses(self):
+        """Test that lookups are counted for monitoring."""
+        cache = QueryCache()
+        assert cache.get("k") is None
+        cache.put("k", [["a", 1.0]])
+
+        assert cache.get("k") == [["a", 1.0]]
+        assert cache.stats == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+    def test_evicts_least_recently_used(self):
+        """Test that the cache is bounded and evicts the oldest entries first."""
+        cache = QueryCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+    def test_expires_entries(self, monkeypatch):
+        """Test that entries older than the TTL are misses."""
+        now = [1000.0]
+        monkeypatch.setattr("catalog.cache.time.time", lambda: now[0])
+        cache = QueryCache(ttl=10)
+        cache.put("k", 1)
+
+        now[0] += 5
+        assert cache.get("k") == 1
+        now[0] += 10
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries survive reopening the cache file."""
+        QueryCache(path=tmp_path / "q.sqlite3").put("k", {"x": 1})
+        cache = QueryCache(path=tmp_path / "q.sqlite3")
+
+        assert cache.get("k") == {"x": 1}
+        cache.clear()
+        assert QueryCache(path=tmp_path / "q.sqlite3").get("k") is None
+
+
+class TestSearchCaching:
+    """Tests for the query cache in front of the search layer."""
+
+    def test_uses_given_empty_cache(self, tmp_path, catalog_file, fake_embedder):
+        """Test that an empty cache passed in isn't swapped for the default."""
+        cache = QueryCache()
+        db = ChromaVectorDB(
+            db_path=str(tmp_path / "chromadb"),
+            src_catalog_file=str(catalog_file),
+            embedding_function=fake_embedder,
+            query_cache=cache,
+        )
+        db.batch_load_documents()
+        db.query(qstn="forest data")
+
+        assert db.query_cache is cache
+        assert len(cache) == 1
+
+    def test_repeat_vector_query_skips_collection(self, chroma_db, monkeypatch):
+        """Test that a repeated vector query is served from the cache."""
+        chroma_db.batch_load_documents()
+        first = chroma_db.query(qstn="forest data", nresults=3)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("query should be cached")
+
+        monkeypatch.setattr(chroma_db.collection, "query", fail)
+        monkeypatch.setattr(chroma_db.collection, "count", fail)
+        second = chroma_db.query(qstn="  Forest DATA", nresults=3)
+
+        assert second == first
+        assert chroma_db.query_cache.hits == 1
+
+    def test_repeat_hybrid_query_skips_retrievers(self, chroma_db, monkeypatch):
+        """Test that a repeated hybrid query is served from the cache."""
+        chroma_db.batch_load_documents()
+        hs = HybridSearch(vector_db=chroma_db)
+        first = hs.query("dataset 2", nresults=3)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("query should be cached")
+
+        monkeypatch.setattr(hs, "_retrieve", fail)
+
+        assert hs.query("dataset 2", nresults=3) == first
+
+    def test_reload_invalidates_cache(self, chroma_db):
+        """Test that reloading the collection stops serving cached results."""
+        chroma_db.batch_load_documents()
+        chroma_db.query(qstn="forest data")
+        chroma_db.batch_load_documents()
+        chroma_db.query(qstn="forest data")
+
+        assert chroma_db.query_cache.hits == 0
+
+    def test_filter_by_source_is_filtered_and_cached(self, chroma_db):
+        """Test that the filter tool caches per source."""
+        chroma_db.batch_load_documents()
+        args = {"query": "forest data", "source": "fsgeodata", "n_results": 5}
+
+        first = execute_tool("filter_by_source", args, chroma_db, None)
+        second = execute_tool("filter_by_source", args, chroma_db, None)
+        other = execute_tool(
+            "filter_by_source", {**args, "source": "none"}, chroma_db, None
+        )
+
+        assert first == second
+        assert chroma_db.query_cache.hits == 1
+        assert other == "No results found."
+
+
+class TestLLMCache:
+    """Tests for LLMCache class."""
+
+    def test_request_key_covers_model_messages_and_tools(self):
+        """Test that any change to the request changes the key."""
+        messages = [{"role": "user", "content": "fire data"}]
+        key = LLMCache.request_key("m", messages)
+
+        assert LLMCache.request_key("m", [dict(messages[0])]) == key
+        assert LLMCache.request_key("other", messages) != key
+        assert LLMCache.request_key("m", [{"role": "user", "content": "x"}]) != key
+        assert LLMCache.request_key("m", messages, [{"name": "t"}]) != key
+
+    def test_shares_file_with_query_cache(self, tmp_path):
+        """Test that both caches can use one SQLite file without clashing."""
+        path = tmp_path / "cache.sqlite3"
+        QueryCache(path=path).put("k", "query")
+        LLMCache(path=path).put("k", "llm")
+
+        assert QueryCache(path=path).get("k") == "query"
+        assert LLMCache(path=path).get("k") == "llm"
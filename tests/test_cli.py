@@ -1,6 +1,14 @@
 """Tests for catalog.cli Click commands."""
 
+import json
 import warnings
+from unittest.mock import MagicMock
+
+from click.testing import CliRunner
+
+from catalog import cli as cli_module
+from catalog.context import estimate_tokens
+from catalog.search import HybridSearch
 
 
 class TestHealthCommand:
@@ -49,3 +57,149 @@ class TestOllamaChatCommand:
     def test_ollama_chat_sends_query(self):
         """Test that ollama_chat sends query to LLM."""
         warnings.warn("TODO: Implement test for ollama chat command", UserWarning)
+
+
+class TestBatchQueryCommand:
+    """Tests for batch_query CLI command."""
+
+    def test_batch_query_reads_and_writes_jsonl(self, chroma_db, monkeypatch):
+        """Test that each input line gets one output line with its results."""
+        chroma_db.batch_load_documents()
+        monkeypatch.setattr("catalog.core.ChromaVectorDB", lambda: chroma_db)
+        lines = [
+            json.dumps({"id": "q1", "query": "dataset 2"}),
+            "",
+            json.dumps("dataset 4"),
+            json.dumps({"id": "q3", "query": "dataset 1"}),
+        ]
+
+        result = CliRunner().invoke(
+            cli_module.cli,
+            ["batch-query", "-n", "2", "--batch-size", "2"],
+            input="\n".join(lines) + "\n",
+        )
+
+        assert result.exit_code == 0, result.output
+        rows = [json.loads(line) for line in result.output.splitlines()]
+        assert [row.get("id") for row in rows] == ["q1", None, "q3"]
+        expected = HybridSearch(vector_db=chroma_db).query_many(
+            ["dataset 2", "dataset 4", "dataset 1"], nresults=2
+        )
+        assert [[hit["id"] for hit in row["results"]] for row in rows] == [
+            [doc.id for doc, _score in resp] for resp in expected
+        ]
+
+    def test_batch_query_rejects_bad_lines(self, chroma_db, monkeypatch):
+        """Test that malformed input reports the offending line."""
+        monkeypatch.setattr("catalog.core.ChromaVectorDB", lambda: chroma_db)
+
+        result = CliRunner().invoke(
+            cli_module.cli, ["batch-query", "--mode", "vector"], input='{"q": 1}\n'
+        )
+
+        assert result.exit_code != 0
+        assert "Line 1" in result.output
+
+
+class TestStreamingOutput:
+    """Tests for streamed bot answers in the CLI."""
+
+    def test_ollama_chat_streams_answer(self, chroma_db, monkeypatch):
+        """Test that ollama-chat renders the chunks of a streamed answer."""
+        chroma_db.batch_load_documents()
+        monkeypatch.setattr("catalog.core.ChromaVectorDB", lambda: chroma_db)
+        bot = MagicMock()
+        bot.chat_stream.return_value = iter(["Two **fire**", " datasets", " found."])
+        monkeypatch.setattr("catalog.bots.OllamaBot", lambda: bot)
+
+        result = CliRunner().invoke(cli_module.cli, ["ollama-chat", "-q", "fire"])
+
+        assert result.exit_code == 0, result.output
+        assert "Two fire datasets found." in result.output
+        bot.chat.assert_not_called()
+
+    def test_no_stream_uses_chat(self, chroma_db, monkeypatch):
+        """Test that --no-stream waits for the whole answer."""
+        chroma_db.batch_load_documents()
+        monkeypatch.setattr("catalog.core.ChromaVectorDB", lambda: chroma_db)
+        bot = MagicMock()
+        bot.chat.return_value = "Whole answer."
+        monkeypatch.setattr("catalog.bots.OllamaBot", lambda: bot)
+
+        result = CliRunner().invoke(
+            cli_module.cli, ["ollama-chat", "-q", "fire", "--no-stream"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Whole answer." in result.output
+        bot.chat_stream.assert_not_called()
+
+
+class TestContextBudget:
+    """Tests for the --max-context-tokens option."""
+
+    def test_context_fits_budget(self, chroma_db, monkeypatch):
+        """Test that the context sent to the bot respects the token budget."""
+        chroma_db.batch_load_documents()
+        monkeypatch.setattr("catalog.core.ChromaVectorDB", lambda: chroma_db)
+        bot = MagicMock()
+        bot.chat.return_value = "Answer."
+        monkeypatch.setattr("catalog.bots.OllamaBot", lambda: bot)
+
+        result = CliRunner().invoke(
+            cli_module.cli,
+            ["ollama-chat", "-q", "fire", "--no-stream", "--max-context-tokens", "60"],
+        )
+
+        assert result.exit_code == 0, result.output
+        context = bot.chat.call_args.kwargs["context"]
+        assert 0 < estimate_tokens(context) <= 60
+        assert context.count("**ID:**") == 1
+
+
+class TestMultiQueryOption:
+    """Tests for hybrid-search --multi-query."""
+
+    def test_searches_and_prints_alternatives(self, chroma_db, monkeypatch):
+        """Test that the rephrasings are searched and fused with the query."""
+        chroma_db.batch_load_documents()
+        monkeypatch.setattr("catalog.core.ChromaVectorDB", lambda: chroma_db)
+        bot = MagicMock()
+        bot.expand_queries.return_value = ["dataset 3 kw3"]
+        monkeypatch.setattr("catalog.bots.OllamaBot", lambda: bot)
+
+        result = CliRunner().invoke(
+            cli_module.cli,
+            ["hybrid-search", "-q", "dataset 2", "--multi-query", "--expansions", "1"],
+        )
+
+        assert result.exit_code == 0, result.output
+        bot.expand_queries.assert_called_once_with("dataset 2", n=1)
+        assert "Also searched: dataset 3 kw3" in result.output
+        assert "Dataset 2" in result.output
+        assert "Dataset 3" in result.output
+
+    def test_failed_expansion_prints_no_alternatives(self, chroma_db, monkeypatch):
+        """Test that only phrasings that were actually searched are reported."""
+        chroma_db.batch_load_documents()
+        monkeypatch.setattr("catalog.core.ChromaVectorDB", lambda: chroma_db)
+        bot = MagicMock()
+        bot.expand_queries.side_effect = ConnectionError("LLM down")
+        monkeypatch.setattr("catalog.bots.OllamaBot", lambda: bot)
+
+        result = CliRunner().invoke(
+            cli_module.cli, ["hybrid-search", "-q", "dataset 2", "--multi-query"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Also searched" not in result.output
+        assert "Dataset 2" in result.output
+
+    def test_rejects_expq(self):
+        """Test that --multi-query can't be combined with --expq."""
+        result = CliRunner().invoke(
+            cli_module.cli, ["hybrid-search", "-q", "fire", "--multi-query", "--expq"]
+        )
+
+        assert result.exit_code != 0
+        assert "cannot be used together" in result.output
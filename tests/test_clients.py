@@ -0,0 +1,77 @@
+"""Tests for catalog.clients module."""
+
+import asyncio
+
+import pytest
+
+from catalog import clients
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    """Start and end each test with an empty client registry."""
+    clients.clear()
+    yield
+    clients.clear()
+
+
+class TestClientRegistry:
+    """Tests for the shared LLM client registry."""
+
+    def test_reuses_client_per_endpoint(self):
+        """Test that one client is shared per endpoint and key."""
+        client = clients.ollama_client("http://llm:11434", "key")
+
+        assert clients.ollama_client("http://llm:11434", "key") is client
+        assert clients.ollama_client("http://llm:11434", "other") is not client
+        assert clients.ollama_client("http://other:11434", "key") is not client
+
+    def test_applies_pool_settings(self, monkeypatch):
+        """Test that timeouts and pool limits come from Settings."""
+        monkeypatch.setenv("LLM_TIMEOUT", "42")
+        monkeypatch.setenv("LLM_CONNECT_TIMEOUT", "3")
+        monkeypatch.setenv("LLM_POOL_MAX_CONNECTIONS", "7")
+
+        http = clients.ollama_client("http://llm:11434", "key")._client
+        pool = http._transport._pool
+
+        assert (http.timeout.read, http.timeout.connect) == (42.0, 3.0)
+        assert pool._max_connections == 7
+        assert http.headers["authorization"] == "Bearer key"
+
+    def test_async_clients_are_per_event_loop(self):
+        """Test that async clients are shared within a loop but not across."""
+
+        async def get_pair():
+            return (
+                clients.ollama_async_client("http://llm:11434", "key"),
+                clients.ollama_async_client("http://llm:11434", "key"),
+            )
+
+        first, again = asyncio.run(get_pair())
+        other, _ = asyncio.run(get_pair())
+
+        assert first is again
+        assert other is not first
+
+    def test_async_clients_close_with_their_loop(self):
+        """Test that a loop's async clients are closed when the loop finishes."""
+
+        async def get_client():
+            client = clients.ollama_async_client("http://llm:11434", "key")
+            assert not client._client.is_closed
+            return client
+
+        client = asyncio.run(get_client())
+
+        assert client._client.is_closed
+
+    def test_bots_share_clients(self, monkeypatch):
+        """Test that bots built with the same settings share one client."""
+        from catalog.bots import OllamaBot
+
+        monkeypatch.setenv("OLLAMA_API_KEY", "key")
+        monkeypatch.setenv("OLLAMA_API_URL", "http://llm:11434")
+        monkeypatch.setenv("OLLAMA_MODEL", "model")
+
+        assert OllamaBot().client is OllamaBot().client
@@ -0,0 +1,128 @@
+"""Tests for catalog.context module."""
+
+from catalog.context import ContextBuilder, estimate_tokens, truncate
+from catalog.schema import USFSDocument
+from catalog.search import HybridSearch
+
+
+def _doc(i, abstract=None, **fields):
+    return USFSDocument(
+        id=f"doc{i}",
+        title=f"Dataset {i}",
+        abstract=abstract or f"Abstract for dataset {i} covering topic {i}.",
+        **fields,
+    )
+
+
+class TestTruncate:
+    """Tests for truncate function."""
+
+    def test_keeps_short_text(self):
+        """Test that text within the budget is unchanged."""
+        assert truncate("Short text.", 10) == "Short text."
+        assert truncate(None, 10) is None
+
+    def test_cuts_at_sentence_or_word(self):
+        """Test that long text is cut at a sentence, else a word, boundary."""
+        text = "First sentence here. Second sentence is a good deal longer."
+        assert truncate(text, 7) == "First sentence here. …"
+        assert truncate("one two three four five six seven", 3) == "one two …"
+
+    def test_result_fits_budget(self):
+        """Test that the truncation mark doesn't push the text over budget."""
+        texts = ["x" * 200, "word " * 60, "Sentence one. " * 20, "a b. " * 50]
+        for text in texts:
+            for max_tokens in range(1, 40):
+                assert estimate_tokens(truncate(text, max_tokens)) <= max_tokens
+
+
+class TestContextBuilder:
+    """Tests for ContextBuilder class."""
+
+    def test_fits_budget_and_drops_tail(self):
+        """Test that documents are added in rank order until the budget is hit."""
+        results = [(_doc(i, abstract="word " * 100), 0.1) for i in range(10)]
+        builder = ContextBuilder(
+            max_tokens=400, max_documents=10, duplicate_threshold=1.1
+        )
+
+        context = builder.assemble(results)
+
+        assert context["tokens"] <= 400
+        assert context["documents"] == [
+            f"doc{i}" for i in range(len(context["documents"]))
+        ]
+        assert context["over_budget"] == 10 - len(context["documents"])
+        assert context["over_budget"] > 0
+
+    def test_shortens_long_fields(self):
+        """Test that long abstracts are compacted."""
+        doc = _doc(1, abstract="A long abstract. " * 200)
+
+        text = ContextBuilder(max_field_tokens=50).build([(doc, 0.2)])
+
+        assert estimate_tokens(text) < 150
+        assert "…" in text
+
+    def test_drops_low_scores_and_duplicates(self):
+        """Test that weak hits and near-duplicates are left out."""
+        results = [
+            (_doc(1), 0.2),
+            (_doc(1).model_copy(update={"id": "copy"}), 0.25),
+            (_doc(2), 0.3),
+            (_doc(3), 9.0),
+        ]
+
+        context = ContextBuilder().assemble(results)
+
+        assert context["documents"] == ["doc1", "doc2"]
+        assert (context["duplicate"], context["low_score"]) == (1, 1)
+
+    def test_rrf_scores_are_cut_by_rank(self):
+        """Test that similarity scores are only limited by max_documents."""
+        results = [(_doc(1), 0.03), (_doc(2), 0.02), (_doc(3), 0.005)]
+
+        context = ContextBuilder(max_documents=2).assemble(
+            results, lower_is_better=False
+        )
+
+        assert context["documents"] == ["doc1", "doc2"]
+        assert (context["over_limit"], context["low_score"]) == (1, 0)
+
+    def test_distance_gap_on_vector_results(self, chroma_db):
+        """Test the distance cut-off on distances returned by ChromaDB."""
+        chroma_db.batch_load_documents()
+        results = chroma_db.query("dataset 2", nresults=5)
+        distances = [distance for _doc, distance in results]
+        # Keep the best two hits: cut halfway between the second and third
+        gap = (distances[1] + distances[2]) / 2 - distances[0]
+
+        context = ContextBuilder(
+            max_distance_gap=gap, duplicate_threshold=1.1
+        ).assemble(results)
+
+        assert distances[2] > distances[1]
+        assert context["documents"] == [doc.id for doc, _d in results[:2]]
+        assert context["low_score"] == 3
+
+    def test_rank_limit_on_hybrid_results(self, chroma_db):
+        """Test that hybrid RRF results are limited by rank, not score."""
+        chroma_db.batch_load_documents()
+        results = HybridSearch(vector_db=chroma_db).query("dataset 2", nresults=5)
+
+        context = ContextBuilder(max_documents=3, duplicate_threshold=1.1).assemble(
+            results, lower_is_better=False
+        )
+
+        assert context["documents"] == [doc.id for doc, _score in results[:3]]
+        assert context["over_limit"] == 2
+
+    def test_oversized_best_document_is_cut_to_budget(self):
+        """Test that the best document is always included, even if too long."""
+        doc = _doc(1, description="x" * 5000)
+        context = ContextBuilder(max_tokens=50, max_field_tokens=5000).assemble(
+            [(doc, 0.1)]
+        )
+
+        assert context["documents"] == ["doc1"]
+        assert context["tokens"] <= 52
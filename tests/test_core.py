@@ -1,7 +1,12 @@
 """Tests for catalog.core ChromaDB integration."""
 
+import json
+import threading
+import time
 import warnings
 
+import pytest
+
 
 class TestChromaVectorDB:
     """Tests for ChromaVectorDB class."""
@@ -42,10 +47,99 @@ class TestBatchLoadDocuments:
         """Test that batch_load_documents stores correct metadata."""
         warnings.warn("TODO: Implement test for metadata storage", UserWarning)
 
+    def test_pipeline_loads_every_document(
+        self, chroma_db, catalog_file, make_catalog, fake_embedder
+    ):
+        """Test that parallel embedding workers load every document once."""
+        catalog_file.write_text(json.dumps(make_catalog(23)))
+        updates = []
+
+        stats = chroma_db.batch_load_documents(
+            batch_size=2, workers=3, queue_size=1, progress=lambda *a: updates.append(a)
+        )
+
+        assert stats["documents"] == 23
+        assert stats["batches"] == 12
+        assert updates[-1] == (23, 23)
+        assert sorted(fake_embedder.embedded) == sorted(
+            chroma_db.build_record(doc)[1] for doc in chroma_db.documents
+        )
+
+        stored = chroma_db.collection.get(include=["documents", "embeddings"])
+        assert len(stored["ids"]) == 23
+        for text, vector in zip(stored["documents"], stored["embeddings"]):
+            assert list(vector) == pytest.approx(fake_embedder([text])[0])
+
+    def test_pipeline_surfaces_embedding_errors(self, chroma_db, monkeypatch):
+        """Test that a failing embedding worker aborts the load instead of hanging."""
+
+        def fail(self, input):
+            raise RuntimeError("model unavailable")
+
+        monkeypatch.setattr(type(chroma_db.embedding_function), "__call__", fail)
+
+        with pytest.raises(RuntimeError, match="model unavailable"):
+            chroma_db.batch_load_documents(batch_size=1, workers=2, queue_size=1)
+
+    def test_pipeline_loads_model_before_workers(self, chroma_db, monkeypatch):
+        """Test that the first embedding call finishes before any other starts."""
+        embed = type(chroma_db.embedding_function).__call__
+        calls = []
+        lock = threading.Lock()
+
+        def track(self, input):
+            with lock:
+                calls.append(("start", threading.current_thread()))
+            time.sleep(0.02)
+            result = embed(self, input)
+            with lock:
+                calls.append(("end", threading.current_thread()))
+            return result
+
+        monkeypatch.setattr(type(chroma_db.embedding_function), "__call__", track)
+        chroma_db.batch_load_documents(batch_size=1, workers=3)
+
+        assert calls[0] == ("start", threading.main_thread())
+        assert calls[1] == ("end", threading.main_thread())
+        assert len(calls) == 10
+
+    def test_pipeline_surfaces_progress_errors(self, chroma_db):
+        """Test that a failing progress callback stops the workers."""
+
+        def progress(written, total):
+            raise RuntimeError("display closed")
+
+        done = threading.Event()
+        errors = []
+
+        def load():
+            try:
+                chroma_db.batch_load_documents(
+                    batch_size=1, workers=2, queue_size=1, progress=progress
+                )
+            except RuntimeError as e:
+                errors.append(e)
+            finally:
+                done.set()
+
+        threading.Thread(target=load, daemon=True).start()
+
+        assert done.wait(10), "batch_load_documents hung"
+        assert str(errors[0]) == "display closed"
+
 
 class TestQuery:
     """Tests for query method."""
 
+    def test_query_many_matches_single_queries(self, chroma_db):
+        """Test that batched queries return what one-at-a-time queries do."""
+        chroma_db.batch_load_documents()
+        questions = ["dataset 1", "forests", "dataset 3 kw3"]
+
+        batched = chroma_db.query_many(questions, nresults=2, batch_size=2)
+
+        assert batched == [chroma_db.query(qstn=q, nresults=2) for q in questions]
+
     def test_query_returns_tuples(self):
         """Test that query returns list of (USFSDocument, distance) tuples."""
         warnings.warn("TODO: Implement test for query return type", UserWarning)
@@ -57,3 +151,45 @@ class TestQuery:
     def test_query_respects_nresults(self):
         """Test that query respects nresults parameter."""
         warnings.warn("TODO: Implement test for nresults parameter", UserWarning)
+
+
+class TestSyncDocuments:
+    """Tests for sync_documents method."""
+
+    def test_sync_on_empty_collection_adds_everything(self, chroma_db):
+        """Test that a first sync adds every catalog document."""
+        stats = chroma_db.sync_documents()
+
+        assert stats == {"added": 5, "updated": 0, "deleted": 0, "unchanged": 0}
+        assert chroma_db.collection.count() == 5
+
+    def test_sync_only_embeds_changes(self, chroma_db, catalog_file, make_catalog):
+        """Test that only new or changed documents are re-embedded."""
+        chroma_db.batch_load_documents()
+        embedder = chroma_db.embedding_function
+        embedder.calls.clear()
+
+        docs = make_catalog(5)
+        docs[1]["abstract"] = "A changed abstract."
+        docs.pop(4)
+        docs.append({"id": "new", "title": "New dataset", "src": "gdd"})
+        catalog_file.write_text(json.dumps(docs))
+        chroma_db.documents = []
+
+        stats = chroma_db.sync_documents()
+
+        assert stats == {"added": 1, "updated": 1, "deleted": 1, "unchanged": 3}
+        assert len(embedder.embedded) == 2
+        assert sorted(chroma_db.collection.get()["ids"]) == sorted(
+            d["id"] for d in docs
+        )
+
+    def test_sync_is_noop_when_unchanged(self, chroma_db):
+        """Test that a repeated sync does not touch the collection."""
+        chroma_db.sync_documents()
+        chroma_db.embedding_function.calls.clear()
+
+        stats = chroma_db.sync_documents()
+
+        assert stats["unchanged"] == 5
+        assert chroma_db.embedding_function.calls == []
@@ -0,0 +1,95 @@
+"""Tests for catalog.embeddings caching."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from catalog.core import ChromaVectorDB
+from catalog.embeddings import CachedEmbeddingFunction, EmbeddingCache
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache class."""
+
+    def test_round_trips_vectors(self, tmp_path):
+        """Test that stored vectors are returned for their model and hash."""
+        cache = EmbeddingCache(tmp_path / "emb.sqlite3")
+        cache.put_many("m", {"h1": np.array([0.5, 1.0])})
+
+        assert np.allclose(cache.get_many("m", ["h1", "h2"])["h1"], [0.5, 1.0])
+        assert cache.get_many("other", ["h1"]) == {}
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that vectors survive reopening the cache file."""
+        EmbeddingCache(tmp_path / "emb.sqlite3").put_many("m", {"h1": [1.0]})
+        assert "h1" in EmbeddingCache(tmp_path / "emb.sqlite3").get_many("m", ["h1"])
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test that the cache is bounded and evicts the oldest entries first."""
+        cache = EmbeddingCache(tmp_path / "emb.sqlite3", max_entries=2)
+        cache.put_many("m", {"a": [1.0]})
+        cache.put_many("m", {"b": [2.0]})
+        cache.get_many("m", ["a"])
+        cache.put_many("m", {"c": [3.0]})
+
+        assert len(cache) == 2
+        assert set(cache.get_many("m", ["a", "b", "c"])) == {"a", "c"}
+
+
+class TestCachedEmbeddingFunction:
+    """Tests for CachedEmbeddingFunction class."""
+
+    def test_only_embeds_misses(self, tmp_path, fake_embedder):
+        """Test that cached texts skip the wrapped model."""
+        inner = fake_embedder
+        ef = CachedEmbeddingFunction(inner, EmbeddingCache(tmp_path / "e.sqlite3"))
+
+        first = ef(["alpha", "beta"])
+        second = ef(["beta", "gamma", "alpha"])
+
+        assert inner.embedded == ["alpha", "beta", "gamma"]
+        assert np.allclose(second[0], first[1])
+        assert np.allclose(second[2], first[0])
+        assert (ef.hits, ef.misses) == (2, 3)
+
+    def test_counts_concurrent_calls(self, tmp_path, fake_embedder):
+        """Test that hit and miss counts add up when threads embed at once."""
+        ef = CachedEmbeddingFunction(
+            fake_embedder, EmbeddingCache(tmp_path / "e.sqlite3")
+        )
+        texts = [f"text {i}" for i in range(20)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(ef, [texts] * 50))
+
+        assert ef.hits + ef.misses == 50 * len(texts)
+        assert ef.misses >= len(texts)
+
+    def test_reports_wrapped_name(self, tmp_path, fake_embedder):
+        """Test that the collection config sees the wrapped function's name."""
+        ef = CachedEmbeddingFunction(
+            fake_embedder, EmbeddingCache(tmp_path / "e.sqlite3")
+        )
+        assert ef.name() == "fake"
+        assert ef.model_id == "fake:{}"
+
+    def test_rebuild_and_repeat_query_hit_cache(
+        self, tmp_path, catalog_file, fake_embedder
+    ):
+        """Test that a collection rebuild and a repeated query skip the model."""
+        inner = fake_embedder
+        ef = CachedEmbeddingFunction(inner, EmbeddingCache(tmp_path / "e.sqlite3"))
+        db = ChromaVectorDB(
+            db_path=str(tmp_path / "chromadb"),
+            src_catalog_file=str(catalog_file),
+            embedding_function=ef,
+        )
+
+        db.batch_load_documents()
+        db.query(qstn="forest data")
+        inner.calls.clear()
+        db.batch_load_documents()
+        results = db.query(qstn="forest data")
+
+        assert inner.calls == []
+        assert len(results) == 5
@@ -0,0 +1,140 @@
+"""Tests for catalog.harvest HTTP helpers."""
+
+import hashlib
+import json
+import time
+
+import pytest
+
+from catalog.harvest import (
+    UNCHANGED,
+    UPDATED,
+    DownloadManifest,
+    RateLimiter,
+    conditional_download,
+    create_session,
+)
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter class."""
+
+    def test_rejects_non_positive_rate(self):
+        """Test that a non-positive rate raises ValueError."""
+        with pytest.raises(ValueError):
+            RateLimiter(requests_per_second=0)
+
+    def test_spaces_requests_to_same_host(self):
+        """Test that requests to one host are spaced by the interval."""
+        limiter = RateLimiter(requests_per_second=20)
+        start = time.monotonic()
+        for _ in range(4):
+            limiter.wait("http://example.com/a.xml")
+        assert time.monotonic() - start >= 3 * 0.05 * 0.9
+
+    def test_does_not_block_other_hosts(self):
+        """Test that different hosts have independent slots."""
+        limiter = RateLimiter(requests_per_second=1)
+        limiter.wait("http://one.example.com/a")
+        start = time.monotonic()
+        limiter.wait("http://two.example.com/a")
+        assert time.monotonic() - start < 0.5
+
+
+class TestCreateSession:
+    """Tests for create_session function."""
+
+    def test_sets_user_agent(self):
+        """Test that the session sends the configured User-Agent."""
+        session = create_session(user_agent="test-agent")
+        assert session.headers["User-Agent"] == "test-agent"
+
+    def test_retries_retryable_status(self, stand_in_server):
+        """Test that 503 responses are retried until success."""
+        calls = []
+
+        def flaky(handler):
+            calls.append(1)
+            if len(calls) < 3:
+                return 503, {}, b"busy"
+            return 200, {}, b"ok"
+
+        stand_in_server.routes["/flaky"] = flaky
+        session = create_session(retries=3, backoff_factor=0)
+        response = session.get(f"{stand_in_server.url}/flaky", timeout=5)
+
+        assert response.status_code == 200
+        assert response.text == "ok"
+        assert len(calls) == 3
+
+
+class TestConditionalDownload:
+    """Tests for conditional_download and DownloadManifest."""
+
+    def test_first_download_records_validators(self, stand_in_server, tmp_path):
+        """Test that a 200 saves the body and records ETag/Last-Modified/hash."""
+        stand_in_server.serve_with_etag("/a.xml", b"<a/>")
+        manifest = DownloadManifest(tmp_path / "manifest.json")
+        url = f"{stand_in_server.url}/a.xml"
+
+        status = conditional_download(
+            create_session(), url, tmp_path / "a.xml", manifest
+        )
+
+        assert status == UPDATED
+        assert (tmp_path / "a.xml").read_bytes() == b"<a/>"
+        entry = manifest.get(url)
+        assert entry["etag"] == '"v1"'
+        assert entry["last_modified"] == "Mon, 05 Jan 2026 00:00:00 GMT"
+        assert entry["sha256"] == hashlib.sha256(b"<a/>").hexdigest()
+        assert manifest.changed() == [url]
+
+    def test_revalidation_returns_unchanged(self, stand_in_server, tmp_path):
+        """Test that a second download sends If-None-Match and accepts a 304."""
+        stand_in_server.serve_with_etag("/a.xml", b"<a/>")
+        manifest = DownloadManifest(tmp_path / "manifest.json")
+        url = f"{stand_in_server.url}/a.xml"
+        session = create_session()
+
+        conditional_download(session, url, tmp_path / "a.xml", manifest)
+        manifest.save()
+        manifest = DownloadManifest(tmp_path / "manifest.json")
+        status = conditional_download(session, url, tmp_path / "a.xml", manifest)
+
+        assert status == UNCHANGED
+        assert (tmp_path / "a.xml").read_bytes() == b"<a/>"
+        assert manifest.changed() == []
+
+    def test_missing_file_is_downloaded_in_full(self, stand_in_server, tmp_path):
+        """Test that validators are not sent when the local copy is gone."""
+        stand_in_server.serve_with_etag("/a.xml", b"<a/>")
+        manifest = DownloadManifest(tmp_path / "manifest.json")
+        url = f"{stand_in_server.url}/a.xml"
+        session = create_session()
+
+        conditional_download(session, url, tmp_path / "a.xml", manifest)
+        (tmp_path / "a.xml").unlink()
+        conditional_download(session, url, tmp_path / "a.xml", manifest)
+
+        assert (tmp_path / "a.xml").read_bytes() == b"<a/>"
+
+    def test_invalid_content_keeps_previous_copy(self, stand_in_server, tmp_path):
+        """Test that a failed validation leaves the existing file untouched."""
+        stand_in_server.routes["/feed.json"] = (200, "not json")
+        (tmp_path / "feed.json").write_text("{}")
+        manifest = DownloadManifest(tmp_path / "manifest.json")
+
+        def validate(path):
+            json.loads(path.read_text())
+
+        with pytest.raises(json.JSONDecodeError):
+            conditional_download(
+                create_session(),
+                f"{stand_in_server.url}/feed.json",
+                tmp_path / "feed.json",
+                manifest,
+                validate=validate,
+            )
+
+        assert (tmp_path / "feed.json").read_text() == "{}"
+        assert not (tmp_path / "feed.json.part").exists()
@@ -1,7 +1,12 @@
 """Tests for catalog.lib utility functions."""
 
+import json
 import warnings
 
+import pytest
+
+from catalog.lib import iter_json_array, strip_html
+
 
 class TestCleanStr:
     """Tests for clean_str function."""
@@ -30,6 +35,11 @@ class TestStripHtml:
         """Test that strip_html preserves text content."""
         warnings.warn("TODO: Implement test for text preservation", UserWarning)
 
+    def test_strip_html_decodes_entities(self):
+        """Test that markup and entities are handled while plain text passes through."""
+        assert strip_html("Roads &amp; <b>Trails</b>") == "Roads & Trails"
+        assert strip_html("Plain  text\n") == "Plain  text\n"
+
 
 class TestHashString:
     """Tests for hash_string function."""
@@ -79,3 +89,44 @@ class TestDedupeCatalog:
         warnings.warn(
             "TODO: Implement test for first occurrence preservation", UserWarning
         )
+
+
+class TestIterJsonArray:
+    """Tests for iter_json_array function."""
+
+    def _write(self, tmp_path, data):
+        path = tmp_path / "feed.json"
+        path.write_text(data, encoding="utf-8")
+        return path
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 65536])
+    def test_yields_array_items(self, tmp_path, chunk_size):
+        """Test that items match json.load for any chunk size."""
+        feed = {
+            "@context": "https://project-open-data.cio.gov/v1.1/schema",
+            "dataset": [
+                {"title": "Fire <b>perimeters</b>", "keyword": ["fire", "wildfire"]},
+                {"title": "Trails", "count": -12.5e3, "flag": True, "none": None},
+                [1, 22, 333],
+            ],
+            "describedBy": {"nested": [1, 2, {"a": "b"}]},
+        }
+        path = self._write(tmp_path, json.dumps(feed, indent=2))
+
+        items = list(iter_json_array(path, "dataset", chunk_size=chunk_size))
+
+        assert items == feed["dataset"]
+
+    def test_missing_key_yields_nothing(self, tmp_path):
+        """Test that a missing member yields no items."""
+        path = self._write(tmp_path, '{"other": [1, 2]}')
+        assert list(iter_json_array(path, "dataset")) == []
+
+    @pytest.mark.parametrize(
+        "data", ['{"dataset": [1, 2', '{"dataset": [1 2]}', "[1]", '{"a": 1} x']
+    )
+    def test_raises_on_invalid_json(self, tmp_path, data):
+        """Test that malformed JSON raises JSONDecodeError."""
+        path = self._write(tmp_path, data)
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array(path, "dataset", chunk_size=2))
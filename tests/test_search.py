@@ -0,0 +1,291 @@
+"""Tests for catalog.search module."""
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from catalog import cli as cli_module
+from catalog.bm25 import BM25Matrix
+from catalog.search import HybridSearch, fuse_result_lists
+
+
+class TestBM25Persistence:
+    """Tests for loading the persisted BM25 index."""
+
+    def test_uses_saved_index_after_build(self, chroma_db, monkeypatch):
+        """Test that a fresh saved index is loaded instead of rebuilt."""
+        chroma_db.batch_load_documents()
+
+        def fail():
+            raise AssertionError("index should not be rebuilt")
+
+        monkeypatch.setattr(chroma_db, "build_bm25_index", fail)
+        hs = HybridSearch(vector_db=chroma_db)
+
+        assert len(hs.bm25) == 5
+        assert hs._bm25_search("dataset 3", k=1)[0][0] == "doc3"
+
+    def test_sync_patches_saved_index(
+        self, chroma_db, catalog_file, make_catalog, monkeypatch
+    ):
+        """Test that a sync with changes re-stamps and patches the saved index."""
+        chroma_db.batch_load_documents()
+        version = chroma_db.version
+
+        def fail():
+            raise AssertionError("index should be patched, not rebuilt")
+
+        monkeypatch.setattr(chroma_db, "build_bm25_index", fail)
+
+        docs = make_catalog(5)[1:] + [
+            {"id": "new", "title": "Lidar survey", "src": "gdd"}
+        ]
+        catalog_file.write_text(json.dumps(docs))
+        chroma_db.documents = []
+        chroma_db.sync_documents()
+
+        assert chroma_db.version != version
+        index = chroma_db.load_bm25_index()
+        assert index is not None and len(index) == 5
+        assert index.search("lidar", 1)[0][0] == "new"
+        assert index.search("dataset 0", 10)[0][0] != "doc0"
+
+    def test_rebuilds_stale_index(self, chroma_db):
+        """Test that an index no longer matching the collection is rebuilt."""
+        chroma_db.batch_load_documents()
+        chroma_db.collection.add(ids=["extra"], documents=["Title: Extra elk data"])
+
+        assert chroma_db.load_bm25_index() is None
+        hs = HybridSearch(vector_db=chroma_db)
+
+        assert len(hs.bm25) == 6
+        assert chroma_db.load_bm25_index() is not None
+
+
+class TestBM25Backend:
+    """Tests for the bm25_backend option."""
+
+    def test_matrix_backend_matches_postings(self, chroma_db):
+        """Test that both backends return the same BM25 results."""
+        chroma_db.batch_load_documents()
+
+        postings = HybridSearch(vector_db=chroma_db)
+        matrix = HybridSearch(vector_db=chroma_db, bm25_backend="matrix")
+
+        assert isinstance(matrix.bm25, BM25Matrix)
+        for query in ["dataset 2", "forests kw4", "nothing"]:
+            assert matrix._bm25_search(query, k=3) == pytest.approx(
+                postings._bm25_search(query, k=3)
+            )
+
+    def test_unknown_backend_raises(self, chroma_db):
+        """Test that an unknown backend name is rejected."""
+        with pytest.raises(ValueError, match="Unknown BM25 backend"):
+            HybridSearch(vector_db=chroma_db, bm25_backend="dense")
+
+    def test_cli_backend_choices_match(self):
+        """Test that the serve command offers the backends HybridSearch accepts."""
+        assert cli_module.BM25_BACKENDS == HybridSearch.BM25_BACKENDS
+
+
+class TestHybridQuery:
+    """Tests for HybridSearch.query."""
+
+    def test_retrievers_run_concurrently(self, chroma_db, monkeypatch):
+        """Test that hybrid latency is close to the slower retriever, not the sum."""
+        chroma_db.batch_load_documents()
+        hs = HybridSearch(vector_db=chroma_db)
+        vector_query = chroma_db.query_many
+        bm25_search = hs._bm25_search_many
+
+        def slow_vector(*args, **kwargs):
+            time.sleep(0.3)
+            return vector_query(*args, **kwargs)
+
+        def slow_bm25(*args, **kwargs):
+            time.sleep(0.3)
+            return bm25_search(*args, **kwargs)
+
+        monkeypatch.setattr(chroma_db, "query_many", slow_vector)
+        monkeypatch.setattr(hs, "_bm25_search_many", slow_bm25)
+
+        started = time.perf_counter()
+        results = hs.query("dataset 2", nresults=3)
+
+        assert time.perf_counter() - started < 0.55
+        assert results[0][0].id == "doc2"
+
+    def test_slow_retriever_times_out(self, chroma_db, monkeypatch):
+        """Test that a timed-out vector search falls back to BM25 results."""
+        chroma_db.batch_load_documents()
+        hs = HybridSearch(vector_db=chroma_db, vector_timeout=0.05)
+        release = threading.Event()
+
+        def stuck_vector(*args, **kwargs):
+            release.wait(5)
+            return []
+
+        monkeypatch.setattr(chroma_db, "query_many", stuck_vector)
+        try:
+            results = hs.query("dataset 4", nresults=2)
+        finally:
+            release.set()
+
+        assert next(doc.id for doc, _score in results) == "doc4"
+        assert results[0][0].title == "Dataset 4"
+
+    def test_concurrent_queries_dont_time_out_while_queued(
+        self, chroma_db, monkeypatch
+    ):
+        """Test that time queued behind other searches isn't counted as timeout."""
+        chroma_db.batch_load_documents()
+        hs = HybridSearch(vector_db=chroma_db, vector_timeout=0.3, bm25_timeout=0.3)
+        questions = [f"dataset {i}" for i in range(5)]
+        expected = hs.query_many(questions, nresults=2)
+        hs.vector_db.query_cache.clear()
+        vector_query = chroma_db.query_many
+
+        def slow_vector(*args, **kwargs):
+            time.sleep(0.15)
+            return vector_query(*args, **kwargs)
+
+        monkeypatch.setattr(chroma_db, "query_many", slow_vector)
+        # Eight searches need sixteen tasks on the four-worker pool, so the
+        # later ones queue for longer than the timeout before they start
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [
+                pool.submit(hs.query_many, questions, nresults=2) for _ in range(8)
+            ]
+            results = [future.result() for future in futures]
+
+        assert results == [expected] * 8
+
+    def test_hydrates_without_fetching_metadata(self, chroma_db, monkeypatch):
+        """Test that results are built from retriever output, not another get()."""
+        chroma_db.batch_load_documents()
+        hs = HybridSearch(vector_db=chroma_db)
+        expected_keywords = ["forest", "kw1"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("metadata should come from the retrievers")
+
+        monkeypatch.setattr(type(chroma_db.collection), "get", fail)
+        results = hs.query("dataset 1 kw1", nresults=3)
+
+        assert results[0][0].id == "doc1"
+        assert results[0][0].keywords == expected_keywords
+        assert len(results) == 3
+
+    @pytest.mark.parametrize("bm25_backend", ["postings", "matrix"])
+    def test_query_many_matches_single_queries(self, chroma_db, bm25_backend):
+        """Test that batched queries return what one-at-a-time queries do."""
+        chroma_db.batch_load_documents()
+        hs = HybridSearch(vector_db=chroma_db, bm25_backend=bm25_backend)
+        questions = ["dataset 1", "", "forests kw3", "dataset 0 kw4"]
+
+        batched = hs.query_many(questions, nresults=2, batch_size=2)
+
+        assert batched[1] == []
+        assert batched == [hs.query(q, nresults=2) for q in questions]
+
+    def test_async_queries_run_concurrently(self, chroma_db):
+        """Test that many in-flight aquery calls match the sync results."""
+        chroma_db.batch_load_documents()
+        hs = HybridSearch(vector_db=chroma_db)
+        questions = [f"dataset {i} kw{i}" for i in range(5)]
+
+        async def run():
+            return await asyncio.gather(
+                *(hs.aquery(q, nresults=2) for q in questions),
+                hs.aquery_many(questions, nresults=2),
+                chroma_db.aquery("forest data", nresults=2),
+            )
+
+        *singles, batched, vector = asyncio.run(run())
+
+        assert singles == batched == hs.query_many(questions, nresults=2)
+        assert vector == chroma_db.query("forest data", nresults=2)
+
+
+class TestMultiQuery:
+    """Tests for speculative multi-query expansion."""
+
+    def test_raw_retrieval_overlaps_expansion(self, chroma_db):
+        """Test that the raw query is searched while the expansion is running."""
+        chroma_db.batch_load_documents()
+        hs = HybridSearch(vector_db=chroma_db)
+        searched = threading.Event()
+        calls = []
+        search_many = hs.query_many
+
+        def recording_search(questions, nresults):
+            calls.append(list(questions))
+            searched.set()
+            return search_many(questions, nresults=nresults)
+
+        def expand(qstn):
+            assert searched.wait(5), "raw retrieval waited for the expansion"
+            return ["dataset 3 kw3", "Dataset 2"]
+
+        hs.query_many = recording_search
+        results, alternatives = hs.query_expanded("dataset 2", expand, nresults=4)
+
+        assert calls == [["dataset 2"], ["dataset 3 kw3", "Dataset 2"]]
+        assert alternatives == ["dataset 3 kw3", "Dataset 2"]
+        expected = fuse_result_lists(
+            [search_many([q], nresults=8)[0] for q in calls[0] + calls[1]],
+            nresults=4,
+        )
+        assert results == expected
+        assert "doc3" in [doc.id for doc, _score in results]
+
+    def test_slow_expansion_falls_back_to_raw(self, chroma_db):
+        """Test that a timed-out expansion still returns the raw query's results."""
+        chroma_db.batch_load_documents()
+        hs = HybridSearch(vector_db=chroma_db)
+        release = threading.Event()
+
+        def stuck_expand(qstn):
+            release.wait(5)
+            return ["dataset 1"]
+
+        started = time.perf_counter()
+        try:
+            results, alternatives = hs.query_expanded(
+                "dataset 4", stuck_expand, nresults=2, expansion_timeout=0.05
+            )
+        finally:
+            release.set()
+
+        assert time.perf_counter() - started < 1.0
+        assert results == hs.query_many(["dataset 4"], nresults=4)[0][:2]
+        assert alternatives == []
+
+    def test_failed_expansion_falls_back_to_raw(self, chroma_db):
+        """Test that an expansion error is not raised to the caller."""
+        chroma_db.batch_load_documents()
+        hs = HybridSearch(vector_db=chroma_db)
+
+        def broken_expand(qstn):
+            raise ConnectionError("LLM down")
+
+        results, alternatives = hs.query_expanded(
+            "dataset 4", broken_expand, nresults=2
+        )
+
+        assert results == hs.query_many(["dataset 4"], nresults=4)[0][:2]
+        assert alternatives == []
+
+    def test_fuse_result_lists_rewards_agreement(self, chroma_db):
+        """Test that documents found by several phrasings rank first."""
+        chroma_db.batch_load_documents()
+        docs = {doc.id: doc for doc, _score in chroma_db.query("dataset", 5)}
+        a, b, c = docs["doc1"], docs["doc2"], docs["doc3"]
+
+        fused = fuse_result_lists([[(a, 0.1), (b, 0.2)], [(c, 0.1), (b, 0.3)]], 3)
+
+        assert [doc.id for doc, _score in fused] == ["doc2", "doc1", "doc3"]
@@ -0,0 +1,113 @@
+"""Tests for catalog.server module."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from click.testing import CliRunner
+
+from catalog import cli as cli_module
+from catalog.search import HybridSearch
+from catalog.server import CatalogClient, CatalogServer, ServerError
+
+
+@pytest.fixture
+def server(chroma_db):
+    """Fixture providing a running CatalogServer on a free port."""
+    chroma_db.batch_load_documents()
+    server = CatalogServer(chroma_db, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestCatalogServer:
+    """Tests for the query server and its client."""
+
+    def test_health(self, server):
+        """Test that health reports the collection version."""
+        health = CatalogClient(server.url).health()
+
+        assert health["status"] == "ok"
+        assert health["version"] == server.vector_db.version
+
+    def test_queries_match_in_process_search(self, server, chroma_db):
+        """Test that served results match searching in-process."""
+        client = CatalogClient(server.url)
+        hybrid = HybridSearch(vector_db=chroma_db)
+
+        assert client.query("dataset 2", nresults=3) == hybrid.query("dataset 2", 3)
+        assert client.query("forest", 3, mode="vector") == chroma_db.query("forest", 3)
+        assert client.query_many(["dataset 1", "forest"], 2) == hybrid.query_many(
+            ["dataset 1", "forest"], 2
+        )
+
+    def test_filtered_query_and_document(self, server):
+        """Test the source filter and document detail routes."""
+        client = CatalogClient(server.url)
+
+        assert len(client.query("forest", 5, source="fsgeodata")) == 5
+        assert client.query("forest", 5, source="none") == []
+        assert client.document("doc3").id == "doc3"
+        assert client.document("missing") is None
+
+    def test_handles_concurrent_requests(self, server, chroma_db):
+        """Test that parallel requests are all answered."""
+        client = CatalogClient(server.url)
+        queries = [f"dataset {i % 5}" for i in range(20)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda q: client.query(q, 2), queries))
+
+        assert results == HybridSearch(vector_db=chroma_db).query_many(queries, 2)
+
+    def test_reload_closes_previous_search(self, server):
+        """Test that reloading shuts down the replaced search's thread pool."""
+        client = CatalogClient(server.url)
+        previous = server.hybrid
+
+        client.reload()
+
+        assert server.hybrid is not previous
+        with pytest.raises(RuntimeError, match="shutdown"):
+            previous._executor.submit(sum, [1, 2])
+        assert client.query("dataset 2", nresults=1)[0][0].id == "doc2"
+
+    def test_rejects_bad_requests(self, server):
+        """Test that invalid requests get a 4xx with a JSON error."""
+        response = requests.post(
+            f"{server.url}/query", json={"query": "x", "mode": "?"}
+        )
+        assert response.status_code == 400
+        assert "mode" in response.json()["error"]
+
+        with pytest.raises(ServerError, match="400"):
+            CatalogClient(server.url).query_many(["x"], nresults=0)
+
+    def test_cli_uses_server(self, server, chroma_db, monkeypatch):
+        """Test that query commands given --server don't open the store."""
+        expected = chroma_db.query(qstn="dataset 4", nresults=1)[0][0]
+
+        def fail():
+            raise AssertionError("should query the server")
+
+        monkeypatch.setattr("catalog.core.ChromaVectorDB", fail)
+        result = CliRunner().invoke(
+            cli_module.cli,
+            ["query-fs-chromadb", "-q", "dataset 4", "-n", "1", "--server", server.url],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert f"**ID:** {expected.id}" in result.output
+
+    def test_cli_reports_unreachable_server(self):
+        """Test that an unreachable server is a clean CLI error."""
+        result = CliRunner().invoke(
+            cli_module.cli,
+            ["hybrid-search", "-q", "x", "--server", "http://127.0.0.1:9"],
+        )
+
+        assert result.exit_code == 1
+        assert "Could not reach catalog server" in result.output
@@ -0,0 +1,69 @@
+"""Startup budget tests for the catalog CLI."""
+
+import subprocess
+import sys
+
+import pytest
+
+# Packages that take from tens of milliseconds to seconds to import and are
+# only needed by the commands that search, build or call an LLM
+HEAVY_MODULES = {
+    "bs4",
+    "chromadb",
+    "langchain_litellm",
+    "litellm",
+    "numpy",
+    "ollama",
+    "requests",
+    "rich",
+}
+
+# Cumulative -X importtime microseconds allowed for catalog.cli. It takes
+# about 40 ms with lazy imports; importing any search or LLM dependency at
+# module level took several seconds.
+IMPORT_BUDGET_US = 250_000
+
+# catalog modules that import the packages above at module level
+HEAVY_CATALOG_MODULES = {
+    "catalog.bots",
+    "catalog.core",
+    "catalog.embeddings",
+    "catalog.search",
+    "catalog.server",
+    "catalog.usfs",
+}
+
+
+def import_profile(*args: str) -> dict[str, int]:
+    """Run the CLI with ``-X importtime``; return cumulative microseconds by module."""
+    code = (
+        "import sys; sys.argv = ['catalog', *sys.argv[1:]]; "
+        "from catalog.cli import main; main()"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=False,
+    )
+    assert proc.returncode == 0, proc.stderr
+
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _self, cumulative, module = line.removeprefix("import time:").split("|")
+        profile[module.strip()] = int(cumulative)
+    return profile
+
+
+@pytest.mark.parametrize("args", [["--help"], ["health"]])
+def test_cli_startup_skips_heavy_imports(args):
+    """Test that help and quick commands don't import search or LLM packages."""
+    profile = import_profile(*args)
+    loaded = {module.split(".")[0] for module in profile}
+
+    assert loaded & HEAVY_MODULES == set()
+    assert profile.keys() & HEAVY_CATALOG_MODULES == set()
+    assert profile["catalog.cli"] < IMPORT_BUDGET_US
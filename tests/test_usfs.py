@@ -1,6 +1,23 @@
 """Tests for catalog.usfs data loaders."""
 
+import json
+import shutil
 import warnings
+from pathlib import Path
+
+import pytest
+
+from catalog.harvest import UNCHANGED, UPDATED
+from catalog.lib import load_json
+from catalog.usfs import (
+    CatalogBuildCache,
+    FSGeodataLoader,
+    GeospatialDataDiscovery,
+    parse_fgdc_xml,
+    parse_fgdc_xml_bs4,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "fsgeodata"
 
 
 class TestUSFS:
@@ -35,9 +52,268 @@ class TestFSGeodataLoader:
         warnings.warn("TODO: Implement test for file download", UserWarning)
 
 
+class TestFSGeodataDownloadAll:
+    """Tests for FSGeodataLoader.download_all against a local stand-in server."""
+
+    def _loader(self, server, tmp_path, names):
+        links = "".join(
+            f'<p><a href="/meta/{name}.xml">{name}</a>'
+            f'<a href="{server.url}/services/{name}/MapServer">service</a></p>'
+            for name in names
+        )
+        server.routes["/datasets.php"] = (200, f"<html><body>{links}</body></html>")
+        for name in names:
+            server.routes[f"/meta/{name}.xml"] = (200, f"<metadata>{name}</metadata>")
+            server.routes[f"/services/{name}/MapServer"] = (
+                200,
+                f'{{"name": "{name}"}}',
+            )
+
+        loader = FSGeodataLoader(
+            data_dir=tmp_path, max_workers=4, requests_per_second=1000
+        )
+        loader.DATASETS_URL = f"{server.url}/datasets.php"
+        loader.METADATA_BASE_URL = f"{server.url}/meta/"
+        return loader
+
+    def test_download_all_fetches_every_dataset(self, stand_in_server, tmp_path):
+        """Test that download_all saves metadata and service info for all datasets."""
+        names = [f"ds{i}" for i in range(12)]
+        loader = self._loader(stand_in_server, tmp_path, names)
+
+        stats = loader.download_all()
+
+        assert stats["total"] == 12
+        assert stats["metadata_success"] == 12
+        assert stats["service_success"] == 12
+        for name in names:
+            assert (loader.metadata_dir / f"{name}.xml").read_text() == (
+                f"<metadata>{name}</metadata>"
+            )
+            assert (loader.services_dir / f"{name}_service.json").exists()
+
+    def test_download_all_counts_failures(self, stand_in_server, tmp_path):
+        """Test that failed downloads are counted and not written to disk."""
+        loader = self._loader(stand_in_server, tmp_path, ["good", "bad"])
+        stand_in_server.routes["/meta/bad.xml"] = (404, "missing")
+
+        stats = loader.download_all()
+
+        assert stats["metadata_success"] == 1
+        assert stats["metadata_failed"] == 1
+        assert not (loader.metadata_dir / "bad.xml").exists()
+
+    def test_download_all_revalidates_existing_files(self, stand_in_server, tmp_path):
+        """Test that a second run revalidates with a 304 instead of re-downloading."""
+        loader = self._loader(stand_in_server, tmp_path, ["ds0"])
+        stand_in_server.serve_with_etag("/meta/ds0.xml", b"<metadata/>")
+
+        first = loader.download_all()
+        second = loader.download_all()
+
+        assert first["metadata_updated"] == 1
+        assert second["metadata_success"] == 1
+        assert second["metadata_updated"] == 0
+        assert (tmp_path / "manifest.json").exists()
+
+
+class TestFSGeodataParseMetadata:
+    """Tests for FSGeodataLoader.parse_metadata against the FGDC fixtures."""
+
+    def _loader(self, tmp_path):
+        loader = FSGeodataLoader(data_dir=tmp_path)
+        for xml_file in FIXTURES_DIR.glob("*.xml"):
+            shutil.copy(xml_file, loader.metadata_dir)
+        return loader
+
+    def test_parse_metadata_orders_by_file_name(self, tmp_path):
+        """Test that documents are returned in file name order."""
+        docs = self._loader(tmp_path).parse_metadata()
+
+        assert [d["title"] for d in docs] == [
+            "National USFS Fire Occurrence Point (Feature Layer)",
+            "",
+            "National Forest System Trails",
+        ]
+
+    def test_parse_fgdc_xml_extracts_fields(self):
+        """Test that title, abstract, purpose, lineage and keywords are extracted."""
+        doc = parse_fgdc_xml(FIXTURES_DIR / "S_USA.FireOccurrence.xml")
+
+        assert doc["abstract"].startswith("The Fire Occurrence point layer depicts")
+        assert doc["purpose"] == "Used to analyze historic fire patterns."
+        assert doc["keywords"] == ["environment", "fire", "wildfire ignition"]
+        assert doc["lineage"][0] == {
+            "description": "Data compiled from FIRESTAT.",
+            "date": "20230101",
+        }
+        assert doc["src"] == "fsgeodata"
+
+    @pytest.mark.parametrize(
+        "xml_file", sorted(FIXTURES_DIR.glob("*.xml")), ids=lambda p: p.name
+    )
+    def test_lxml_engine_matches_bs4(self, xml_file):
+        """Test that the lxml engine produces the same document as BeautifulSoup."""
+        assert parse_fgdc_xml(xml_file) == parse_fgdc_xml_bs4(xml_file)
+
+    def test_parse_metadata_rejects_unknown_engine(self, tmp_path):
+        """Test that an unknown engine raises ValueError."""
+        with pytest.raises(ValueError, match="engine"):
+            FSGeodataLoader(data_dir=tmp_path).parse_metadata(engine="sax")
+
+    def test_parse_metadata_with_workers_matches_serial(self, tmp_path):
+        """Test that the process pool returns the same documents in order."""
+        loader = self._loader(tmp_path)
+
+        assert loader.parse_metadata(workers=2) == loader.parse_metadata()
+
+
+class TestCatalogBuildCache:
+    """Tests for incremental parsing with CatalogBuildCache."""
+
+    def test_unchanged_xml_files_are_reused(self, tmp_path):
+        """Test that only modified XML files are re-parsed on the next build."""
+        loader = FSGeodataLoader(data_dir=tmp_path / "fsgeodata")
+        for xml_file in FIXTURES_DIR.glob("*.xml"):
+            shutil.copy(xml_file, loader.metadata_dir)
+        cache_path = tmp_path / "build_cache.json"
+
+        cache = CatalogBuildCache(cache_path)
+        first = loader.parse_metadata(cache=cache)
+        cache.save()
+        assert cache.stats == {"reused": 0, "parsed": 3}
+
+        trails = loader.metadata_dir / "S_USA.TrailNFS_Publish.xml"
+        trails.write_text(trails.read_text().replace("Trails</title>", "Paths</title>"))
+        cache = CatalogBuildCache(cache_path)
+        second = loader.parse_metadata(cache=cache)
+
+        assert cache.stats == {"reused": 2, "parsed": 1}
+        assert second[:2] == first[:2]
+        assert second[2]["title"] == "National Forest System Paths"
+
+    def test_removed_files_are_dropped(self, tmp_path):
+        """Test that documents of deleted files disappear from the next build."""
+        loader = FSGeodataLoader(data_dir=tmp_path / "fsgeodata")
+        for xml_file in FIXTURES_DIR.glob("*.xml"):
+            shutil.copy(xml_file, loader.metadata_dir)
+        cache_path = tmp_path / "build_cache.json"
+        cache = CatalogBuildCache(cache_path)
+        loader.parse_metadata(cache=cache)
+        cache.save()
+
+        (loader.metadata_dir / "S_USA.Minimal.xml").unlink()
+        cache = CatalogBuildCache(cache_path)
+        docs = loader.parse_metadata(cache=cache)
+        cache.save()
+
+        assert len(docs) == 2
+        assert len(load_json(cache_path)["files"]) == 2
+
+    def test_changed_feed_reparses_only_changed_records(self, tmp_path):
+        """Test that a modified feed reuses documents of unchanged entries."""
+        gdd = GeospatialDataDiscovery()
+        gdd.dest_output_dir = str(tmp_path)
+        feed_path = tmp_path / gdd.dest_output_file
+        items = [{"title": f"Dataset {i}", "description": "d"} for i in range(5)]
+        feed_path.write_text(json.dumps({"dataset": items}))
+        cache_path = tmp_path / "build_cache.json"
+
+        cache = CatalogBuildCache(cache_path)
+        gdd.parse_metadata(cache=cache)
+        cache.save()
+
+        items[3]["description"] = "changed"
+        feed_path.write_text(json.dumps({"dataset": items}))
+        cache = CatalogBuildCache(cache_path)
+        docs = gdd.parse_metadata(cache=cache)
+
+        assert cache.stats == {"reused": 4, "parsed": 1}
+        assert docs[3]["description"] == "changed"
+        assert docs == gdd.parse_metadata()
+
+    def test_full_build_ignores_existing_cache(self, tmp_path):
+        """Test that reuse=False starts from an empty cache."""
+        gdd = GeospatialDataDiscovery()
+        gdd.dest_output_dir = str(tmp_path)
+        (tmp_path / gdd.dest_output_file).write_text('{"dataset": [{"title": "A"}]}')
+        cache_path = tmp_path / "build_cache.json"
+        cache = CatalogBuildCache(cache_path)
+        gdd.parse_metadata(cache=cache)
+        cache.save()
+
+        cache = CatalogBuildCache(cache_path, reuse=False)
+        gdd.parse_metadata(cache=cache)
+
+        assert cache.stats == {"reused": 0, "parsed": 1}
+
+    def test_full_build_skips_hashing(self, tmp_path, monkeypatch):
+        """Test that a non-incremental build doesn't hash the source files."""
+        loader = FSGeodataLoader(data_dir=tmp_path / "fsgeodata")
+        for xml_file in FIXTURES_DIR.glob("*.xml"):
+            shutil.copy(xml_file, loader.metadata_dir)
+        cache_path = tmp_path / "build_cache.json"
+
+        def fail(path):
+            raise AssertionError(f"{path} should not be hashed")
+
+        monkeypatch.setattr("catalog.usfs.hash_file", fail)
+        cache = CatalogBuildCache(cache_path, reuse=False)
+        first = loader.parse_metadata(cache=cache)
+        cache.save()
+        monkeypatch.undo()
+
+        cache = CatalogBuildCache(cache_path)
+        assert loader.parse_metadata(cache=cache) == first
+        assert cache.stats == {"reused": 3, "parsed": 0}
+
+    def test_feed_documents_are_stored_once(self, tmp_path):
+        """Test that an unchanged feed is rebuilt from its cached records."""
+        gdd = GeospatialDataDiscovery()
+        gdd.dest_output_dir = str(tmp_path)
+        items = [{"title": f"Dataset {i}", "description": "d"} for i in range(3)]
+        (tmp_path / gdd.dest_output_file).write_text(json.dumps({"dataset": items}))
+        cache_path = tmp_path / "build_cache.json"
+        cache = CatalogBuildCache(cache_path)
+        first = gdd.parse_metadata(cache=cache)
+        cache.save()
+
+        saved = load_json(cache_path)
+        entry = saved["files"][str(tmp_path / gdd.dest_output_file)]
+        assert "documents" not in entry
+        assert len(entry["record_keys"]) == len(saved["records"]) == 3
+
+        cache = CatalogBuildCache(cache_path)
+        assert gdd.parse_metadata(cache=cache) == first
+        assert cache.stats == {"reused": 3, "parsed": 0}
+
+
 class TestGeospatialDataDiscovery:
     """Tests for GeospatialDataDiscovery class."""
 
+    def test_download_gdd_metadata_revalidates(self, stand_in_server, tmp_path):
+        """Test that an unchanged feed is not downloaded again."""
+        stand_in_server.serve_with_etag("/dcat.json", b'{"dataset": []}')
+        gdd = GeospatialDataDiscovery()
+        gdd.metadata_source_url = f"{stand_in_server.url}/dcat.json"
+        gdd.dest_output_dir = str(tmp_path)
+
+        assert gdd.download_gdd_metadata() == UPDATED
+        assert gdd.download_gdd_metadata() == UNCHANGED
+        assert (tmp_path / gdd.dest_output_file).read_text() == '{"dataset": []}'
+
+    def test_download_gdd_metadata_rejects_invalid_json(
+        self, stand_in_server, tmp_path
+    ):
+        """Test that an invalid feed is not written."""
+        stand_in_server.routes["/dcat.json"] = (200, "<html>oops</html>")
+        gdd = GeospatialDataDiscovery()
+        gdd.metadata_source_url = f"{stand_in_server.url}/dcat.json"
+        gdd.dest_output_dir = str(tmp_path)
+
+        assert gdd.download_gdd_metadata() is None
+        assert not (tmp_path / gdd.dest_output_file).exists()
+
     def test_download_gdd_metadata_fetches_json(self):
         """Test that download_gdd_metadata fetches DCAT JSON."""
         warnings.warn("TODO: Implement test for GDD metadata fetch", UserWarning)
@@ -46,6 +322,32 @@ class TestGeospatialDataDiscovery:
         """Test that parse_metadata extracts dataset information."""
         warnings.warn("TODO: Implement test for GDD parsing", UserWarning)
 
+    def test_parse_metadata_streams_feed(self, tmp_path):
+        """Test that parse_metadata builds documents from the feed file."""
+        feed = {
+            "dataset": [
+                {
+                    "title": "Fire <b>Perimeters</b>",
+                    "description": "  Burned  areas ",
+                    "keyword": ["fire"],
+                    "theme": ["Hazards"],
+                },
+                {"description": "No title"},
+            ]
+        }
+        gdd = GeospatialDataDiscovery()
+        gdd.dest_output_dir = str(tmp_path)
+        (tmp_path / gdd.dest_output_file).write_text(json.dumps(feed))
+
+        docs = gdd.parse_metadata()
+
+        assert [d["title"] for d in docs] == ["Fire Perimeters", ""]
+        assert docs[0]["description"] == "Burned areas"
+        assert docs[0]["keywords"] == ["fire"]
+        assert docs[0]["themes"] == ["Hazards"]
+        assert docs[1]["keywords"] == []
+        assert all(d["src"] == "gdd" for d in docs)
+
 
 class TestRDALoader:
     """Tests for RDALoader class."""